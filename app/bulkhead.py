@@ -0,0 +1,126 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from config import config
+
+
+class BulkheadFull(Exception):
+    """Raised when a platform's bulkhead has no free slot and no queue room"""
+
+    pass
+
+
+class Bulkhead:
+    """
+    Concurrency limit for one platform's resolutions.
+
+    At most ``limit`` resolutions of the platform run at once and at most
+    ``max_queue`` more wait for a slot; anything beyond that is rejected
+    right away. A platform that turns slow therefore fills its own slots
+    and queue instead of the resolver threads and processes every other
+    platform needs.
+    """
+
+    def __init__(self, limit: int, max_queue: Optional[int] = None):
+        self.limit = max(1, limit)
+        self.max_queue = max(
+            0, config.BULKHEAD_MAX_QUEUE if max_queue is None else max_queue
+        )
+        self._semaphore = asyncio.Semaphore(self.limit)
+        self._active = 0
+        self._queued = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None):
+        """
+        Hold one of the platform's slots for an ``async with`` block.
+
+        Raises BulkheadFull if the queue is full or if no slot frees up
+        within ``timeout`` seconds: either way the wait was for our own
+        capacity, not for the platform.
+        """
+        if self._semaphore.locked():
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise BulkheadFull(
+                    f"{self._active} resolutions running, {self._queued} queued"
+                )
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout)
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                raise BulkheadFull(
+                    f"No slot free within {timeout:g}s, {self._active} running"
+                )
+            finally:
+                self._queued -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._completed += 1
+            self._semaphore.release()
+
+    def get_stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self._active,
+            "queue_depth": self._queued,
+            "peak_queue_depth": self._peak_queued,
+            "max_queue": self.max_queue,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "timeouts": self._timeouts,
+        }
+
+
+class Bulkheads:
+    """One Bulkhead per platform, created on first use"""
+
+    def __init__(
+        self,
+        limits: Optional[dict] = None,
+        default_limit: Optional[int] = None,
+        max_queue: Optional[int] = None,
+    ):
+        self.limits = config.BULKHEAD_LIMITS if limits is None else limits
+        self.default_limit = (
+            config.BULKHEAD_LIMIT if default_limit is None else default_limit
+        )
+        self.max_queue = max_queue
+        self._bulkheads: dict[str, Bulkhead] = {}
+
+    def _limit_for(self, platform: str) -> int:
+        try:
+            return int(self.limits.get(platform, self.default_limit))
+        except ValueError:
+            return self.default_limit
+
+    def get(self, platform: str) -> Bulkhead:
+        bulkhead = self._bulkheads.get(platform)
+        if bulkhead is None:
+            bulkhead = self._bulkheads[platform] = Bulkhead(
+                self._limit_for(platform), self.max_queue
+            )
+        return bulkhead
+
+    def get_stats(self) -> dict:
+        return {
+            platform: bulkhead.get_stats()
+            for platform, bulkhead in sorted(self._bulkheads.items())
+        }
+
+
+# Global bulkheads, used from the event loop by stream_service
+bulkheads = Bulkheads()
@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 
-def _serialize(value: Any) -> str:
+def _serialize(value: Any, fresh_until: Optional[float] = None) -> str:
     """Serialize a value for Redis storage with a type envelope."""
     from app.models import StreamStatus
 
@@ -23,27 +23,35 @@ def _serialize(value: Any) -> str:
         envelope = {"__type__": "dict", "data": value}
     else:
         envelope = {"__type__": "raw", "data": value}
+    if fresh_until is not None:
+        envelope["fresh_until"] = fresh_until
     return json.dumps(envelope)
 
 
-def _deserialize(raw: str) -> Any:
-    """Deserialize a Redis-stored value, reconstructing original types."""
+def _deserialize_entry(raw: str) -> tuple[Any, Optional[float]]:
+    """Deserialize a Redis-stored value and the time it stays fresh until."""
     from app.models import StreamStatus
 
     try:
         envelope = json.loads(raw)
     except (json.JSONDecodeError, TypeError):
-        return raw
+        return raw, None
 
     if not isinstance(envelope, dict) or "__type__" not in envelope:
-        return envelope
+        return envelope, None
 
     type_tag = envelope["__type__"]
     data = envelope["data"]
+    fresh_until = envelope.get("fresh_until")
 
     if type_tag == "StreamStatus":
-        return StreamStatus.model_validate(data)
-    return data
+        return StreamStatus.model_validate(data), fresh_until
+    return data, fresh_until
+
+
+def _deserialize(raw: str) -> Any:
+    """Deserialize a Redis-stored value, reconstructing original types."""
+    return _deserialize_entry(raw)[0]
 
 
 # ---------------------------------------------------------------------------
@@ -100,22 +108,40 @@ class RedisCache:
         self._client.ping()
 
     def get(self, key: str) -> Optional[Any]:
+        data, stale = self.get_entry(key)
+        return None if stale else data
+
+    def get_entry(self, key: str) -> tuple[Optional[Any], bool]:
+        """Return ``(value, stale)``; stale values are past ttl but within stale_ttl"""
         try:
             raw = self._client.get(key)
             if raw is None:
-                return None
-            return _deserialize(raw)
+                return None, False
+            data, fresh_until = _deserialize_entry(raw)
+            return data, fresh_until is not None and time.time() > fresh_until
         except Exception as exc:
             logger.warning("Redis GET failed for key %s: %s", key, exc)
-            return None
+            return None, False
 
-    def set(self, key: str, data: Any, ttl: float = 300) -> None:
+    def set(self, key: str, data: Any, ttl: float = 300, stale_ttl: float = 0) -> None:
         try:
-            serialized = _serialize(data)
-            self._client.setex(key, int(ttl), serialized)
+            if stale_ttl:
+                serialized = _serialize(data, fresh_until=time.time() + ttl)
+            else:
+                serialized = _serialize(data)
+            self._client.setex(key, int(ttl + stale_ttl), serialized)
         except Exception as exc:
             logger.warning("Redis SET failed for key %s: %s", key, exc)
 
+    def add(self, key: str, data: Any, ttl: float = 300) -> bool:
+        """Store a value only if the key is absent; True if it was stored"""
+        try:
+            serialized = _serialize(data)
+            return bool(self._client.set(key, serialized, nx=True, ex=max(1, int(ttl))))
+        except Exception as exc:
+            logger.warning("Redis SET NX failed for key %s: %s", key, exc)
+            return False
+
     def delete(self, key: str) -> None:
         try:
             self._client.delete(key)
@@ -155,31 +181,47 @@ class RedisCache:
 
 
 class CacheEntry:
-    __slots__ = ("data", "timestamp", "ttl")
+    __slots__ = ("data", "timestamp", "ttl", "stale_ttl")
 
-    def __init__(self, data: Any, timestamp: float, ttl: float):
+    def __init__(self, data: Any, timestamp: float, ttl: float, stale_ttl: float = 0):
         self.data = data
         self.timestamp = timestamp
         self.ttl = ttl
+        self.stale_ttl = stale_ttl
 
-    def is_expired(self) -> bool:
+    def is_stale(self) -> bool:
         return time.time() - self.timestamp > self.ttl
 
+    def is_expired(self) -> bool:
+        return time.time() - self.timestamp > self.ttl + self.stale_ttl
+
 
 class SimpleCache:
     def __init__(self):
         self._cache: dict[str, CacheEntry] = {}
 
     def get(self, key: str) -> Optional[Any]:
+        data, stale = self.get_entry(key)
+        return None if stale else data
+
+    def get_entry(self, key: str) -> tuple[Optional[Any], bool]:
+        """Return ``(value, stale)``; stale values are past ttl but within stale_ttl"""
         if key in self._cache:
             entry = self._cache[key]
             if not entry.is_expired():
-                return entry.data
+                return entry.data, entry.is_stale()
             del self._cache[key]
-        return None
+        return None, False
+
+    def set(self, key: str, data: Any, ttl: float = 300, stale_ttl: float = 0) -> None:
+        self._cache[key] = CacheEntry(data, time.time(), ttl, stale_ttl)
 
-    def set(self, key: str, data: Any, ttl: float = 300) -> None:
-        self._cache[key] = CacheEntry(data, time.time(), ttl)
+    def add(self, key: str, data: Any, ttl: float = 300) -> bool:
+        """Store a value only if the key is absent; True if it was stored"""
+        if self.get(key) is not None:
+            return False
+        self.set(key, data, ttl)
+        return True
 
     def delete(self, key: str) -> None:
         self._cache.pop(key, None)
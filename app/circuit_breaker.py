@@ -0,0 +1,123 @@
+import time
+from typing import Optional
+
+from app.models import StreamStatus
+from config import config
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Failure breaker for one platform's resolutions.
+
+    After ``failure_threshold`` consecutive platform failures the breaker
+    opens: requests are answered as "platform unavailable" instead of taking
+    a session and a resolver thread. After ``reset_timeout`` seconds one trial
+    request is let through (half-open); its success closes the breaker, its
+    failure opens it for another ``reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+    ):
+        self.failure_threshold = max(
+            1,
+            config.CIRCUIT_FAILURE_THRESHOLD
+            if failure_threshold is None
+            else failure_threshold,
+        )
+        self.reset_timeout = (
+            config.CIRCUIT_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        )
+        self.state = CLOSED
+        self.last_failure: Optional[StreamStatus] = None
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._opened = 0
+        self._rejected = 0
+
+    def allow(self) -> bool:
+        """Whether a resolution may run now; False means fail fast"""
+        if self.state == CLOSED:
+            return True
+        if (
+            self.state == OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self._rejected += 1
+        return False
+
+    def record_success(self):
+        self._failures = 0
+        self._trial_in_flight = False
+        self.state = CLOSED
+
+    def record_failure(self, failure: StreamStatus):
+        self.last_failure = failure
+        self._failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self._opened += 1
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets its next trial request through"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def release(self):
+        """End a trial that said nothing about the platform (e.g. pool exhausted)"""
+        self._trial_in_flight = False
+
+    def get_stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self._opened,
+            "rejected": self._rejected,
+            "last_error": self.last_failure.error if self.last_failure else None,
+        }
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per platform, created on first use"""
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, platform: str) -> CircuitBreaker:
+        breaker = self._breakers.get(platform)
+        if breaker is None:
+            breaker = self._breakers[platform] = CircuitBreaker(
+                self.failure_threshold, self.reset_timeout
+            )
+        return breaker
+
+    def get_stats(self) -> dict:
+        return {
+            platform: breaker.get_stats()
+            for platform, breaker in sorted(self._breakers.items())
+        }
+
+
+# Global breakers, used from the event loop by stream_service
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,36 @@
+import time
+
+from config import config
+
+# Never hand Streamlink an HTTP timeout shorter than this
+MIN_HTTP_TIMEOUT = 0.5
+
+
+class Deadline:
+    """A request's time budget, measured on the monotonic clock"""
+
+    __slots__ = ("seconds", "expires_at")
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def for_request(cls, endpoint: str, platform: str) -> "Deadline":
+        """Budget for an endpoint ("status" or "resolve"), overridable per platform"""
+        if endpoint == "resolve":
+            default, overrides = config.RESOLVE_DEADLINE, config.RESOLVE_DEADLINES
+        else:
+            default, overrides = config.STATUS_DEADLINE, config.STATUS_DEADLINES
+        try:
+            seconds = float(overrides.get(platform, default))
+        except ValueError:
+            seconds = default
+        return cls(seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def http_timeout(self) -> float:
+        """Remaining budget as a Streamlink http-timeout/stream-timeout value"""
+        return max(MIN_HTTP_TIMEOUT, self.remaining())
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import HTTPException
 from app.utils import extract_platform_from_url
 
@@ -15,23 +17,109 @@ def is_browser_error(error_msg: str) -> bool:
     return any(keyword in error_lower for keyword in BROWSER_ERROR_KEYWORDS)
 
 
+# HTTP-level and connection failures: the platform (or the path to it) is
+# failing, whichever URL was asked for
+PLATFORM_ERROR_KEYWORDS = (
+    "500 server error",
+    "502 server error",
+    "503 server error",
+    "504 server error",
+    "429 client error",
+    "connection",
+    "timed out",
+    "max retries exceeded",
+    "name or service not known",
+    "temporary failure in name resolution",
+)
+
+
+def is_platform_error(error_msg: str) -> bool:
+    error_lower = error_msg.lower()
+    return any(keyword in error_lower for keyword in PLATFORM_ERROR_KEYWORDS)
+
+
 class StreamlinkAPIException(HTTPException):
     """Base exception for Streamlink API errors"""
 
-    pass
+    # Error class used to decide how long a failure is cached
+    error_type = "error"
+
+    def __init__(
+        self,
+        status_code: int,
+        detail=None,
+        headers: Optional[dict] = None,
+        error_type: Optional[str] = None,
+    ):
+        super().__init__(status_code=status_code, detail=detail, headers=headers)
+        if error_type:
+            self.error_type = error_type
 
 
 class NoPluginException(StreamlinkAPIException):
+    error_type = "no_plugin"
+
     def __init__(self, url: str):
         super().__init__(status_code=400, detail=f"No plugin available for URL: {url}")
 
 
 class NoStreamsException(StreamlinkAPIException):
+    error_type = "no_streams"
+
     def __init__(self, url: str):
         super().__init__(status_code=404, detail=f"No streams found for URL: {url}")
 
 
+class ServiceBusyException(StreamlinkAPIException):
+    error_type = "service_busy"
+
+    def __init__(self, url: str):
+        super().__init__(
+            status_code=503,
+            detail={
+                "error": "Service busy",
+                "message": "All stream resolvers are busy. Please try again shortly.",
+                "url": url,
+            },
+            headers={"Retry-After": "5"},
+        )
+
+
+class ResolutionTimeoutException(StreamlinkAPIException):
+    error_type = "timeout"
+
+    def __init__(self, url: str, deadline: float):
+        super().__init__(
+            status_code=504,
+            detail={
+                "error": "Resolution timed out",
+                "message": f"Stream resolution did not finish within {deadline:g}s.",
+                "url": url,
+                "deadline_seconds": deadline,
+            },
+        )
+
+
+class PlatformUnavailableException(StreamlinkAPIException):
+    error_type = "platform_unavailable"
+
+    def __init__(self, url: str, retry_after: float):
+        platform = extract_platform_from_url(url)
+        super().__init__(
+            status_code=503,
+            detail={
+                "error": "Platform unavailable",
+                "message": f"{platform.title()} is failing; requests are paused.",
+                "platform": platform,
+                "url": url,
+            },
+            headers={"Retry-After": str(max(1, int(retry_after)))},
+        )
+
+
 class BrowserRequiredException(StreamlinkAPIException):
+    error_type = "browser_required"
+
     def __init__(self, url: str):
         platform = extract_platform_from_url(url)
         platform_info = {
@@ -70,6 +158,8 @@ class BrowserRequiredException(StreamlinkAPIException):
 
 
 class PluginException(StreamlinkAPIException):
+    error_type = "plugin_error"
+
     def __init__(self, url: str, error: str):
         if is_browser_error(error):
             raise BrowserRequiredException(url)
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from config import config
+
+
+class ResolutionExecutor:
+    """
+    Dedicated thread pool for blocking Streamlink resolutions.
+
+    asyncio.to_thread() uses the loop's default executor, which is shared
+    with everything else and sized from the CPU count. Resolutions are
+    outbound-I/O bound, so they get their own pool sized by RESOLVER_THREADS
+    and instrumented with queue depth, active workers and queue wait time.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max(
+            1, config.RESOLVER_THREADS if max_workers is None else max_workers
+        )
+        self.lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._peak_queued = 0
+        self._avg_wait = 0.0
+        self._max_wait = 0.0
+
+    def _call(self, submitted: float, func, args, kwargs):
+        waited = time.monotonic() - submitted
+        with self.lock:
+            self._queued -= 1
+            self._active += 1
+            # Exponentially weighted, so the average tracks current load
+            self._avg_wait = 0.9 * self._avg_wait + 0.1 * waited
+            self._max_wait = max(self._max_wait, waited)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self.lock:
+                self._active -= 1
+                self._completed += 1
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking callable on the resolver pool and await its result"""
+        with self.lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        future = self._get_executor().submit(
+            self._call, time.monotonic(), func, args, kwargs
+        )
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future):
+        # A call cancelled before it started never reaches _call()
+        if future.cancelled():
+            with self.lock:
+                self._queued -= 1
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="resolver"
+                )
+            return self._executor
+
+    def shutdown(self):
+        with self.lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "max_workers": self.max_workers,
+                "active_workers": self._active,
+                "queue_depth": self._queued,
+                "peak_queue_depth": self._peak_queued,
+                "completed": self._completed,
+                "avg_wait_seconds": round(self._avg_wait, 4),
+                "max_wait_seconds": round(self._max_wait, 4),
+                "saturated": self._active >= self.max_workers,
+            }
+
+
+# Global executor for Streamlink resolutions
+resolution_executor = ResolutionExecutor()
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Hedge tokens a quiet period can save up, so bursts can't hedge freely
+MAX_HEDGE_TOKENS = 10.0
+
+
+class _Latencies:
+    """Durations of the most recent resolutions of one endpoint and platform"""
+
+    def __init__(self, window: int):
+        self.samples: deque = deque(maxlen=window)
+
+    def percentile(self, percentile: float) -> float:
+        ordered = sorted(self.samples)
+        index = round(percentile / 100 * (len(ordered) - 1))
+        return ordered[min(len(ordered) - 1, max(0, index))]
+
+
+class Hedger:
+    """
+    Hedged resolutions to cut tail latency.
+
+    Most resolutions of a platform finish quickly, but some hang on a slow
+    CDN edge or upstream node. A resolution still running after the
+    platform's observed HEDGE_PERCENTILE latency gets a second attempt
+    (which takes its own pooled session); the first attempt to succeed
+    wins and the other is abandoned. Every request earns HEDGE_BUDGET of a
+    hedge token and every hedge spends one, so hedging adds at most that
+    fraction of extra load, however slow a platform gets.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        percentile: Optional[float] = None,
+        budget: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        window: Optional[int] = None,
+    ):
+        self.enabled = config.HEDGING if enabled is None else enabled
+        self.percentile = config.HEDGE_PERCENTILE if percentile is None else percentile
+        self.budget = config.HEDGE_BUDGET if budget is None else budget
+        self.min_samples = max(
+            1, config.HEDGE_MIN_SAMPLES if min_samples is None else min_samples
+        )
+        self.window = max(
+            self.min_samples, config.HEDGE_WINDOW if window is None else window
+        )
+        self._latencies: dict[str, _Latencies] = {}
+        self._tokens = 0.0
+        self._hedged: dict[str, int] = {}
+        self._hedge_wins: dict[str, int] = {}
+        self._over_budget = 0
+
+    def delay(self, key: str) -> Optional[float]:
+        """How long to wait before hedging, or None while too few samples exist"""
+        latencies = self._latencies.get(key)
+        if latencies is None or len(latencies.samples) < self.min_samples:
+            return None
+        return latencies.percentile(self.percentile)
+
+    def _record(self, key: str, seconds: float):
+        latencies = self._latencies.get(key)
+        if latencies is None:
+            latencies = self._latencies[key] = _Latencies(self.window)
+        latencies.samples.append(seconds)
+
+    def _take_token(self) -> bool:
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        self._over_budget += 1
+        return False
+
+    async def _timed(self, key: str, attempt):
+        started = time.monotonic()
+        result = await attempt()
+        self._record(key, time.monotonic() - started)
+        return result
+
+    async def run(self, endpoint: str, platform: str, attempt):
+        """
+        Await ``attempt()``, hedging it with a second call if it runs long.
+
+        ``attempt`` is a zero-argument coroutine function; each call must
+        take its own session. If every attempt fails, the first attempt's
+        exception is raised.
+        """
+        key = f"{endpoint}:{platform}"
+        if not self.enabled:
+            return await attempt()
+
+        self._tokens = min(MAX_HEDGE_TOKENS, self._tokens + self.budget)
+        primary = asyncio.ensure_future(self._timed(key, attempt))
+        delay = self.delay(key)
+        try:
+            if delay is not None:
+                await asyncio.wait({primary}, timeout=delay)
+            if primary.done() or delay is None or not self._take_token():
+                return await primary
+
+            logger.debug("Hedging %s resolution after %.2fs", platform, delay)
+            self._hedged[key] = self._hedged.get(key, 0) + 1
+            hedge = asyncio.ensure_future(self._timed(key, attempt))
+            return await self._first_success(key, primary, hedge)
+        finally:
+            primary.cancel()
+
+    async def _first_success(self, key: str, primary, hedge):
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        if task is hedge:
+                            self._hedge_wins[key] = self._hedge_wins.get(key, 0) + 1
+                        return task.result()
+            if not hedge.cancelled():
+                # Retrieved so a losing hedge's failure isn't logged as unhandled
+                hedge.exception()
+            return primary.result()
+        finally:
+            hedge.cancel()
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "budget": self.budget,
+            "tokens": round(self._tokens, 2),
+            "over_budget": self._over_budget,
+            "endpoints": {
+                key: {
+                    "samples": len(latencies.samples),
+                    "hedge_delay_seconds": (
+                        None if self.delay(key) is None else round(self.delay(key), 4)
+                    ),
+                    "hedged": self._hedged.get(key, 0),
+                    "hedge_wins": self._hedge_wins.get(key, 0),
+                }
+                for key, latencies in sorted(self._latencies.items())
+            },
+        }
+
+
+# Global hedger, used from the event loop by stream_service
+hedger = Hedger()
@@ -0,0 +1,118 @@
+import socket
+import threading
+from typing import Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from config import config
+
+
+def _keepalive_socket_options(idle: int) -> list:
+    """Default socket options plus TCP keep-alive probes after ``idle`` seconds"""
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # Not every platform exposes the tuning knobs
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, idle // 4)))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 4))
+    return options
+
+
+class SharedHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter mounted on every pooled Streamlink session.
+
+    Each Streamlink() session normally gets its own requests adapters, so a
+    TLS connection opened to gql.twitch.tv by one session can't be reused by
+    another. Mounting a single adapter instance on all of them shares one
+    urllib3 PoolManager (thread-safe, bounded per host) across the pool.
+
+    Closing a session must not tear the shared connections down, so close()
+    is a no-op; reset() drops every connection for real.
+    """
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: Optional[bool] = None,
+        keepalive_idle: Optional[int] = None,
+    ):
+        self.keepalive_idle = (
+            config.HTTP_KEEPALIVE_IDLE if keepalive_idle is None else keepalive_idle
+        )
+        self.stats_lock = threading.Lock()
+        # Counters of host pools evicted from (or reset out of) the PoolManager
+        self._retired_connections = 0
+        self._retired_requests = 0
+        super().__init__(
+            pool_connections=(
+                config.HTTP_POOL_CONNECTIONS
+                if pool_connections is None
+                else pool_connections
+            ),
+            pool_maxsize=(
+                config.HTTP_POOL_MAXSIZE if pool_maxsize is None else pool_maxsize
+            ),
+            pool_block=config.HTTP_POOL_BLOCK if pool_block is None else pool_block,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault(
+            "socket_options", _keepalive_socket_options(self.keepalive_idle)
+        )
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        # Keep the counters of host pools the LRU container evicts
+        self.poolmanager.pools.dispose_func = self._dispose_pool
+
+    def _dispose_pool(self, pool):
+        with self.stats_lock:
+            self._retired_connections += pool.num_connections
+            self._retired_requests += pool.num_requests
+        pool.close()
+
+    def close(self):
+        """Sessions closing must leave the shared connections alone"""
+        pass
+
+    def reset(self):
+        """Drop every pooled connection, e.g. the ones inherited across a fork"""
+        self.poolmanager.clear()
+        for proxy_manager in self.proxy_manager.values():
+            proxy_manager.clear()
+
+    def mount_on(self, http_session):
+        """Route a requests session's http:// and https:// traffic through this adapter"""
+        http_session.mount("https://", self)
+        http_session.mount("http://", self)
+
+    def get_stats(self) -> dict:
+        with self.poolmanager.pools.lock:
+            pools = list(self.poolmanager.pools._container.values())
+        with self.stats_lock:
+            connections = self._retired_connections
+            requests = self._retired_requests
+        for pool in pools:
+            connections += pool.num_connections
+            requests += pool.num_requests
+        return {
+            "hosts": len(pools),
+            "pool_connections": self._pool_connections,
+            "pool_maxsize": self._pool_maxsize,
+            "pool_block": self._pool_block,
+            "keepalive_idle": self.keepalive_idle,
+            "new_connections": connections,
+            "requests": requests,
+            "reused_connections": max(0, requests - connections),
+            "reuse_ratio": round((requests - connections) / requests, 4)
+            if requests
+            else 0.0,
+        }
+
+
+# Global adapter shared by all pooled sessions
+http_adapter = SharedHTTPAdapter()
@@ -1,4 +1,4 @@
-from fastapi import Request
+from fastapi import Request, WebSocket
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 import logging
@@ -50,6 +50,29 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 
+def websocket_api_key_valid(websocket: WebSocket) -> bool:
+    """
+    API key check for WebSocket endpoints, which BaseHTTPMiddleware never
+    sees. Browsers can't set headers on a WebSocket handshake, so the key
+    may also be passed as the ``api_key`` query parameter.
+    """
+    provided_key = websocket.headers.get("X-API-Key") or websocket.query_params.get(
+        "api_key"
+    )
+    if provided_key and provided_key == os.getenv("API_KEY", ""):
+        return True
+
+    logger.warning(
+        "Auth failure — %s API key | path=%s ip=%s",
+        "invalid" if provided_key else "missing",
+        websocket.url.path,
+        websocket.headers.get(
+            "X-Forwarded-For", getattr(websocket.client, "host", "unknown")
+        ),
+    )
+    return False
+
+
 class CustomRateLimitMiddleware(BaseHTTPMiddleware):
     """Custom rate limiting middleware with per-endpoint limits"""
 
@@ -18,6 +18,8 @@ class StreamStatus(BaseModel):
     stream_id: str = ""
     platform: str = ""
     error_details: Optional[Dict[str, Any]] = None
+    # Served from a cache entry past its TTL while a refresh runs
+    stale: bool = False
 
 
 class StreamResolution(BaseModel):
@@ -0,0 +1,147 @@
+import importlib
+import json
+import logging
+import os
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+
+from streamlink.plugin import Plugin
+from streamlink.utils.url import update_scheme
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+def _host(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+class PluginIndex:
+    """
+    Persisted host -> Streamlink plugin index.
+
+    Streamlink matches every URL against the matchers of all of its plugins.
+    We only serve a handful of hosts, so once a host has been resolved the
+    plugin name is remembered (and written to ``path``), and later URLs for
+    that host import just that plugin module and check its own matchers.
+    Unknown hosts, or URLs the indexed plugin doesn't match, fall back to
+    the full ``session.resolve_url()``.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.lock = threading.Lock()
+        self._hosts: dict[str, str] = {}
+        self._hits = 0
+        self._misses = 0
+        self._load()
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path) as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable plugin index %s: %s", self.path, exc)
+            return
+        if isinstance(data, dict):
+            self._hosts = {str(host): str(name) for host, name in data.items()}
+
+    def _save(self, hosts: dict):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as fh:
+                json.dump(hosts, fh, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            logger.warning("Failed to persist plugin index %s: %s", self.path, exc)
+
+    def record(self, url: str, plugin_name: str):
+        """Remember which plugin serves the URL's host"""
+        host = _host(url)
+        with self.lock:
+            if self._hosts.get(host) == plugin_name:
+                return
+            self._hosts[host] = plugin_name
+            hosts = dict(self._hosts)
+        self._save(hosts)
+
+    def lookup(self, url: str) -> Optional[str]:
+        return self._hosts.get(_host(url))
+
+    @staticmethod
+    def _load_plugin(session, name: str) -> Optional[type[Plugin]]:
+        """Load a single plugin into the session by name"""
+        if name in session.plugins:
+            return session.plugins[name]
+        try:
+            module = importlib.import_module(f"streamlink.plugins.{name}")
+        except ImportError as exc:
+            logger.warning("Failed to import plugin %s: %s", name, exc)
+            return None
+        plugin_class = getattr(module, "__plugin__", None)
+        if not (isinstance(plugin_class, type) and issubclass(plugin_class, Plugin)):
+            return None
+        session.plugins[name] = plugin_class
+        return plugin_class
+
+    def _match_indexed(self, session, url: str) -> Optional[tuple]:
+        name = self.lookup(url)
+        if not name:
+            return None
+        plugin_class = self._load_plugin(session, name)
+        if plugin_class is None:
+            return None
+        if not any(m.pattern.match(url) for m in plugin_class.matchers or ()):
+            return None
+        return name, plugin_class
+
+    def resolve_url(self, session, url: str) -> tuple:
+        """Drop-in replacement for ``session.resolve_url(url)``"""
+        url = update_scheme("https://", url, force=False)
+        match = self._match_indexed(session, url)
+        if match:
+            self._hits += 1
+            return match[0], match[1], url
+
+        self._misses += 1
+        plugin_name, plugin_class, resolved_url = session.resolve_url(url)
+        # Only index direct matches; redirected URLs must keep taking the slow path
+        if (
+            resolved_url == url
+            and isinstance(plugin_class, type)
+            and issubclass(plugin_class, Plugin)
+        ):
+            self.record(url, plugin_name)
+        return plugin_name, plugin_class, resolved_url
+
+    def preload(self, session, url: str) -> bool:
+        """Load the plugin serving ``url`` into a session ahead of the first request"""
+        if self._match_indexed(session, url):
+            return True
+        match = session.plugins.match_url(url)
+        if not match:
+            return False
+        self.record(url, match[0])
+        return True
+
+    def get_stats(self) -> dict:
+        return {
+            "hosts": len(self._hosts),
+            "hits": self._hits,
+            "misses": self._misses,
+            "path": self.path or None,
+        }
+
+
+plugin_index = PluginIndex(config.PLUGIN_INDEX_PATH)
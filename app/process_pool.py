@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from app.exceptions import StreamlinkAPIException
+from app.models import StreamStatus
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# How often worker processes run their session pool's maintenance
+WORKER_MAINTENANCE_INTERVAL = 30
+
+
+def _maintain_worker_pool():
+    from app.session_pool import session_pool
+
+    while True:
+        time.sleep(WORKER_MAINTENANCE_INTERVAL)
+        try:
+            session_pool.refresh_stale()
+            session_pool.shrink_idle()
+        except Exception:
+            logger.exception("Session pool maintenance failed in resolver process")
+
+
+def _init_worker():
+    """
+    Warm a resolver process: importing the stream service builds the
+    process-local session pool, so the first resolution doesn't pay for it.
+    """
+    import app.services.stream_service  # noqa: F401
+
+    threading.Thread(
+        target=_maintain_worker_pool, name="session-pool-maintenance", daemon=True
+    ).start()
+
+
+def _check_status(url: str, timeout: Optional[float] = None) -> dict:
+    from app.services.stream_service import _resolve_stream_sync
+
+    return _resolve_stream_sync(url, timeout=timeout).model_dump()
+
+
+def _resolve_details(url: str, timeout: Optional[float] = None) -> dict:
+    from app.services.stream_service import _resolve_details_sync
+
+    # API exceptions don't survive pickling, so send their fields back instead
+    try:
+        return {"result": _resolve_details_sync(url, timeout=timeout)}
+    except StreamlinkAPIException as e:
+        return {
+            "error": {
+                "status_code": e.status_code,
+                "detail": e.detail,
+                "headers": e.headers,
+                "error_type": e.error_type,
+            }
+        }
+
+
+class ResolverProcessPool:
+    """
+    Optional process-pool backend for stream resolution.
+
+    Streamlink plugins do their HLS parsing, JSON decoding and regex work in
+    Python, so with the thread backend they compete for the GIL with the
+    event loop. With RESOLVER_BACKEND=process, resolutions run in worker
+    processes (each with its own warm session pool) and come back as plain
+    dicts. The executor is created lazily, and rebuilt if a worker dies.
+    """
+
+    def __init__(self, processes: Optional[int] = None, backend: Optional[str] = None):
+        self.processes = max(
+            1, config.RESOLVER_PROCESSES if processes is None else processes
+        )
+        self.backend = config.RESOLVER_BACKEND if backend is None else backend
+        self.lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._restarts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend == "process"
+
+    def start(self):
+        """Create the executor up front so workers spawn before the first request"""
+        self._get_executor()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    # Never fork: the parent holds locks, sockets and an event loop
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        with self.lock:
+            if self._executor is executor:
+                self._executor = None
+                self._restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, func, url: str, timeout: Optional[float] = None) -> dict:
+        executor = self._get_executor()
+        self._in_flight += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                executor, func, url, timeout
+            )
+        except BrokenProcessPool:
+            logger.error("Resolver process died; restarting the process pool")
+            self._failed += 1
+            self._discard(executor)
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+        self._completed += 1
+        return result
+
+    async def check_status(
+        self, url: str, timeout: Optional[float] = None
+    ) -> StreamStatus:
+        """Resolve a stream's status in a worker process"""
+        return StreamStatus(**await self._run(_check_status, url, timeout))
+
+    async def resolve_details(self, url: str, timeout: Optional[float] = None) -> dict:
+        """Resolve full stream details in a worker process"""
+        response = await self._run(_resolve_details, url, timeout)
+        if "error" in response:
+            raise StreamlinkAPIException(**response["error"])
+        return response["result"]
+
+    def shutdown(self):
+        with self.lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "processes": self.processes if self.enabled else 0,
+            "running": self._executor is not None,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "restarts": self._restarts,
+        }
+
+
+# Global resolver process pool (idle unless RESOLVER_BACKEND=process)
+resolver_processes = ResolverProcessPool()
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi import status as http_status
+from fastapi.responses import StreamingResponse
 import asyncio
+import json
 from app.models import BatchRequest, StreamStatus
-from app.services import stream_service
+from app.middleware import websocket_api_key_valid
+from app.services import status_jobs, stream_service
+from app.services.subscriptions import status_subscriptions
 from app.exceptions import StreamlinkAPIException
 from app.cache import cache
+from app.utils import canonical_url
 from app.validators import validate_url, validate_batch_request
+from config import config
 
 router = APIRouter()
 
@@ -13,14 +20,17 @@ router = APIRouter()
 async def get_stream_url(url: str, bypass_cache: bool = False):
     validated_url = validate_url(url)
 
-    # Clear cache if bypass requested
+    # Clear cache if bypass requested (including the status and failure
+    # entries that can short-circuit the resolution; platform-wide failures
+    # are only skipped for this request)
     if bypass_cache:
-        cache.delete(f"resolve:{validated_url}")
+        key_url = canonical_url(validated_url)
+        cache.delete(f"resolve:{key_url}")
+        cache.delete(f"status:{key_url}")
+        cache.delete(f"failure:{key_url}")
 
     try:
-        return await asyncio.to_thread(
-            stream_service.resolve_stream_details, validated_url
-        )
+        return await stream_service.resolve_stream(validated_url, bypass_cache)
     except StreamlinkAPIException:
         raise  # Re-raise our custom exceptions with proper HTTP codes
     except Exception as e:
@@ -33,11 +43,12 @@ async def get_batch_status(request_data: BatchRequest, bypass_cache: bool = Fals
 
     # Clear cache if bypass requested
     if bypass_cache:
-        for url in validated_urls:
-            cache.delete(f"status:{url}")
+        _bypass_status_cache(validated_urls)
 
     # Process all URLs concurrently
-    tasks = [stream_service.check_single_stream(url) for url in validated_urls]
+    tasks = [
+        stream_service.check_single_stream(url, bypass_cache) for url in validated_urls
+    ]
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
     # Handle any exceptions from gather
@@ -51,3 +62,211 @@ async def get_batch_status(request_data: BatchRequest, bypass_cache: bool = Fals
             statuses.append(result)
 
     return {"results": statuses}
+
+
+@router.post("/status-batch/stream")
+async def stream_batch_status(
+    request: Request, request_data: BatchRequest, bypass_cache: bool = False
+):
+    """
+    Streaming variant of /status-batch: each StreamStatus is sent as soon as
+    its check completes, so cache hits arrive first. Responds with NDJSON,
+    or Server-Sent Events if the client accepts text/event-stream.
+    """
+    validated_urls = validate_batch_request(request_data.urls)
+
+    if bypass_cache:
+        _bypass_status_cache(validated_urls)
+
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _sse_events(validated_urls, bypass_cache),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+    return StreamingResponse(
+        _ndjson_lines(validated_urls, bypass_cache), media_type="application/x-ndjson"
+    )
+
+
+def _bypass_status_cache(urls):
+    for url in map(canonical_url, urls):
+        cache.delete(f"status:{url}")
+        cache.delete(f"failure:{url}")
+
+
+async def _check_or_error(url: str, bypass_cache: bool = False) -> StreamStatus:
+    try:
+        return await stream_service.check_single_stream(url, bypass_cache)
+    except Exception as e:
+        return StreamStatus(url=url, status="error", error=str(e))
+
+
+async def _statuses_as_completed(urls, bypass_cache: bool = False):
+    """Yield each URL's status as its check completes"""
+    tasks = [asyncio.ensure_future(_check_or_error(url, bypass_cache)) for url in urls]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The client went away: stop waiting (the shielded single-flight
+        # work still finishes and caches its result)
+        for task in tasks:
+            task.cancel()
+
+
+async def _ndjson_lines(urls, bypass_cache: bool = False):
+    async for status in _statuses_as_completed(urls, bypass_cache):
+        yield status.model_dump_json() + "\n"
+
+
+async def _sse_events(urls, bypass_cache: bool = False):
+    async for status in _statuses_as_completed(urls, bypass_cache):
+        yield f"event: status\ndata: {status.model_dump_json()}\n\n"
+    yield "event: done\ndata: {}\n\n"
+
+
+@router.post("/status-jobs", status_code=202)
+async def create_status_job(request_data: BatchRequest):
+    """
+    Check a large set of URLs in the background. Returns the job's id and
+    progress; poll GET /status-jobs/{job_id} or stream its /stream results.
+    """
+    validated_urls = validate_batch_request(
+        request_data.urls, max_urls=config.STATUS_JOB_MAX_URLS
+    )
+    try:
+        job = status_jobs.submit(validated_urls)
+    except status_jobs.TooManyJobs as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "30"}
+        )
+    return {**job, "skipped": len(request_data.urls) - len(validated_urls)}
+
+
+@router.get("/status-jobs/{job_id}")
+async def get_status_job(job_id: str, offset: int = 0):
+    """A job's progress and the results finished so far, from ``offset`` on"""
+    job = _get_job_or_404(job_id)
+    results = status_jobs.get_results(job, offset)
+    return {**job, "results": results, "next_offset": max(0, offset) + len(results)}
+
+
+@router.get("/status-jobs/{job_id}/stream")
+async def stream_status_job(job_id: str, offset: int = 0):
+    """A job's results as NDJSON, one status per line, until the job ends"""
+    job = _get_job_or_404(job_id)
+    return StreamingResponse(
+        _job_result_lines(job, max(0, offset)), media_type="application/x-ndjson"
+    )
+
+
+def _get_job_or_404(job_id: str) -> dict:
+    job = status_jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Status job not found")
+    return job
+
+
+async def _job_result_lines(job: dict, offset: int):
+    while True:
+        for result in status_jobs.get_results(job, offset):
+            offset += 1
+            yield json.dumps(result) + "\n"
+        if job["state"] != "running":
+            return
+        await asyncio.sleep(config.STATUS_JOB_POLL_INTERVAL)
+        job = status_jobs.get_job(job["job_id"])
+        if job is None:
+            return
+
+
+@router.websocket("/status-subscriptions")
+async def status_subscription_socket(websocket: WebSocket):
+    """
+    Real-time status transitions. Clients send
+    {"action": "subscribe" | "unsubscribe", "urls": [...]} and receive
+    {"type": "status", "status": {...}} whenever a subscribed URL's status
+    changes, starting with its current status.
+    """
+    if not websocket_api_key_valid(websocket):
+        await websocket.close(code=http_status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+
+    queue: asyncio.Queue = asyncio.Queue()
+    # Canonical URL -> the URL the client subscribed with
+    subscribed: dict = {}
+    sender = asyncio.ensure_future(_send_transitions(websocket, queue))
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                action, urls = message["action"], list(message["urls"])
+            except (ValueError, KeyError, TypeError):
+                await websocket.send_json(
+                    {"type": "error", "detail": "Expected {action, urls}"}
+                )
+                continue
+
+            if action == "subscribe":
+                await _subscribe(websocket, queue, subscribed, urls)
+            elif action == "unsubscribe":
+                for url in _valid_urls(urls):
+                    if subscribed.pop(canonical_url(url), None) is not None:
+                        status_subscriptions.unsubscribe(url, queue)
+            else:
+                await websocket.send_json(
+                    {"type": "error", "detail": f"Unknown action: {action}"}
+                )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        for url in subscribed.values():
+            status_subscriptions.unsubscribe(url, queue)
+
+
+def _valid_urls(urls) -> list:
+    valid = []
+    for url in urls:
+        try:
+            valid.append(validate_url(url))
+        except HTTPException:
+            continue
+    return valid
+
+
+async def _subscribe(websocket: WebSocket, queue, subscribed: dict, urls):
+    # One subscription per stream, however many spellings of it are sent
+    new = {}
+    for url in _valid_urls(urls):
+        key = canonical_url(url)
+        if key not in subscribed:
+            new.setdefault(key, url)
+    valid = list(new.values())
+    room = config.SUBSCRIPTION_MAX_URLS - len(subscribed)
+    if len(valid) > room:
+        await websocket.send_json(
+            {
+                "type": "error",
+                "detail": f"Maximum {config.SUBSCRIPTION_MAX_URLS} URLs per connection",
+            }
+        )
+        return
+    for key, url in new.items():
+        subscribed[key] = url
+        status_subscriptions.subscribe(url, queue)
+    await websocket.send_json(
+        {"type": "subscribed", "urls": valid, "skipped": len(urls) - len(valid)}
+    )
+
+
+async def _send_transitions(websocket: WebSocket, queue: asyncio.Queue):
+    try:
+        while True:
+            status = await queue.get()
+            await websocket.send_json({"type": "status", "status": status.model_dump()})
+    except (WebSocketDisconnect, RuntimeError):
+        # The client went away; the receive loop cleans up the subscriptions
+        pass
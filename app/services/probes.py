@@ -0,0 +1,284 @@
+import json
+import logging
+import re
+import threading
+import time
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from app.models import StreamStatus
+from app.utils import extract_platform_from_url, generate_fallback_thumbnail
+from config import config
+
+logger = logging.getLogger(__name__)
+
+TWITCH_GQL_URL = "https://gql.twitch.tv/gql"
+# Public client ID of the Twitch web player, as used by Streamlink's plugin
+TWITCH_CLIENT_ID = "kimne78kx3ncx6brgo4mv6wki5h1ko"
+TWITCH_LIVENESS_QUERY = """
+query($login: String!) {
+  user(login: $login) {
+    login
+    displayName
+    stream { id title game { name } }
+  }
+}
+"""
+KICK_LIVESTREAM_URL = "https://kick.com/api/v2/channels/{channel}/livestream"
+
+_re_twitch_channel = re.compile(r"^/(?P<login>\w+)/?$")
+_re_kick_channel = re.compile(r"^/(?P<channel>[\w-]+)/?$")
+_re_yt_player_response = re.compile(r"ytInitialPlayerResponse\s*=\s*")
+_re_yt_video_id = re.compile(r"^[\w-]{11}$")
+
+# Path segments on Twitch/Kick that aren't channel names
+_RESERVED_PATHS = {"videos", "directory", "search", "settings", "clips", "categories"}
+# Probe responses that say something about the URL, not about the probe
+_URL_STATUS_CODES = {404, 410}
+
+
+def _twitch_login(url: str) -> Optional[str]:
+    match = _re_twitch_channel.match(urlparse(url).path)
+    if not match or match["login"].lower() in _RESERVED_PATHS:
+        return None
+    return match["login"].lower()
+
+
+def _kick_channel(url: str) -> Optional[str]:
+    match = _re_kick_channel.match(urlparse(url).path)
+    if not match or match["channel"].lower() in _RESERVED_PATHS:
+        return None
+    return match["channel"]
+
+
+def _youtube_video_id(url: str) -> Optional[str]:
+    parsed = urlparse(url)
+    if parsed.netloc.lower().endswith("youtu.be"):
+        video_id = parsed.path.strip("/")
+    elif parsed.path == "/watch":
+        video_id = parse_qs(parsed.query).get("v", [""])[0]
+    else:
+        return None
+    return video_id if _re_yt_video_id.match(video_id) else None
+
+
+def probe_twitch(http, url: str, timeout: float) -> Optional[StreamStatus]:
+    """One GQL query for the channel's current stream, no playlists"""
+    login = _twitch_login(url)
+    if not login:
+        return None
+    res = http.post(
+        TWITCH_GQL_URL,
+        json={"query": TWITCH_LIVENESS_QUERY, "variables": {"login": login}},
+        headers={"Client-ID": TWITCH_CLIENT_ID},
+        timeout=timeout,
+    )
+    data = res.json()
+    user = (data.get("data") or {}).get("user") if isinstance(data, dict) else None
+    if not isinstance(user, dict):
+        return None
+
+    stream = user.get("stream")
+    if not stream:
+        return StreamStatus(url=url, status="offline", platform="twitch")
+    author = user.get("displayName") or user.get("login") or login
+    return StreamStatus(
+        url=url,
+        status="online",
+        title=stream.get("title") or "Live Stream",
+        author=author,
+        thumbnail=generate_fallback_thumbnail("twitch", author),
+        category=(stream.get("game") or {}).get("name") or "",
+        stream_id=str(stream.get("id") or ""),
+        platform="twitch",
+    )
+
+
+def probe_youtube(http, url: str, timeout: float) -> Optional[StreamStatus]:
+    """Read the live status from the watch page's player response, no manifests"""
+    video_id = _youtube_video_id(url)
+    if not video_id:
+        return None
+    res = http.get(
+        "https://www.youtube.com/watch",
+        params={"v": video_id},
+        # Skip the EU consent interstitial
+        cookies={"CONSENT": "YES+"},
+        timeout=timeout,
+    )
+    match = _re_yt_player_response.search(res.text)
+    if not match:
+        return None
+    player_response, _ = json.JSONDecoder().raw_decode(res.text, match.end())
+    details = player_response.get("videoDetails") or {}
+    playability = (player_response.get("playabilityStatus") or {}).get("status")
+
+    if details.get("isLive"):
+        author = details.get("author") or ""
+        return StreamStatus(
+            url=url,
+            status="online",
+            title=details.get("title") or "Live Stream",
+            author=author,
+            thumbnail=generate_fallback_thumbnail("youtube", author),
+            stream_id=details.get("videoId") or video_id,
+            platform="youtube",
+        )
+    if details.get("isUpcoming") or playability == "LIVE_STREAM_OFFLINE":
+        return StreamStatus(url=url, status="offline", platform="youtube")
+    # VODs, premieres, errors: let Streamlink decide
+    return None
+
+
+def probe_kick(http, url: str, timeout: float) -> Optional[StreamStatus]:
+    """Fetch the channel's livestream JSON, no playlists"""
+    channel = _kick_channel(url)
+    if not channel:
+        return None
+    res = http.get(
+        KICK_LIVESTREAM_URL.format(channel=channel),
+        headers={"Accept": "application/json", "Referer": url},
+        timeout=timeout,
+    )
+    res.raise_for_status()
+    data = res.json()
+    if not isinstance(data, dict) or "data" not in data:
+        return None
+
+    livestream = data["data"]
+    if not livestream:
+        return StreamStatus(url=url, status="offline", platform="kick")
+    return StreamStatus(
+        url=url,
+        status="online",
+        title=livestream.get("session_title") or "Live Stream",
+        author=channel,
+        thumbnail=generate_fallback_thumbnail("kick", channel),
+        category=(livestream.get("category") or {}).get("name") or "",
+        stream_id=str(livestream.get("id") or ""),
+        platform="kick",
+    )
+
+
+def _is_probe_miss(exc: Exception) -> bool:
+    """
+    Whether a probe error concerns this one request rather than the probe.
+
+    A missing channel (404) or a request that timed out says nothing about
+    whether the platform's probe still works; a 403 (challenge page) or a
+    response the probe can't parse (schema change) does. Streamlink's
+    HTTPSession wraps requests errors in a PluginError with the original
+    kept as ``err``.
+    """
+    exc = getattr(exc, "err", None) or exc
+    if isinstance(exc, requests.Timeout):
+        return True
+    response = getattr(exc, "response", None)
+    return isinstance(exc, requests.HTTPError) and (
+        getattr(response, "status_code", None) in _URL_STATUS_CODES
+    )
+
+
+PLATFORM_PROBES = {
+    "twitch": probe_twitch,
+    "youtube": probe_youtube,
+    "kick": probe_kick,
+}
+
+
+class LivenessProber:
+    """
+    Fast online/offline checks for status requests.
+
+    A full Streamlink resolution fetches and parses the master playlist for
+    every quality (plus metadata) just to learn whether a channel is live.
+    The probes answer that with one metadata request per platform. They
+    return None whenever they can't decide -- unknown platform, unsupported
+    URL shape, unexpected response, missing channel, timed-out request -- so
+    the caller falls back to the full Streamlink path. A platform whose
+    probe errors error_threshold times in a row is skipped for
+    PROBE_COOLDOWN seconds (e.g. Kick behind a Cloudflare challenge).
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        cooldown: Optional[float] = None,
+        error_threshold: Optional[int] = None,
+    ):
+        self.enabled = config.STATUS_PROBES if enabled is None else enabled
+        self.cooldown = config.PROBE_COOLDOWN if cooldown is None else cooldown
+        self.error_threshold = max(
+            1,
+            config.PROBE_ERROR_THRESHOLD
+            if error_threshold is None
+            else error_threshold,
+        )
+        self.lock = threading.Lock()
+        self._disabled_until: dict[str, float] = {}
+        self._consecutive_errors: dict[str, int] = {}
+        self._answered: dict[str, int] = {}
+        self._fallbacks: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+
+    def _count(self, counter: dict, platform: str):
+        with self.lock:
+            counter[platform] = counter.get(platform, 0) + 1
+
+    def probe(
+        self, session, url: str, timeout: Optional[float] = None
+    ) -> Optional[StreamStatus]:
+        """Return the stream's status, or None if the full resolution must decide"""
+        platform = extract_platform_from_url(url)
+        probe = PLATFORM_PROBES.get(platform)
+        if not self.enabled or probe is None:
+            return None
+        if time.monotonic() < self._disabled_until.get(platform, 0):
+            self._count(self._fallbacks, platform)
+            return None
+
+        try:
+            status = probe(
+                session.http,
+                url,
+                min(config.PROBE_TIMEOUT, timeout or config.PROBE_TIMEOUT),
+            )
+        except Exception as exc:
+            if _is_probe_miss(exc):
+                self._count(self._fallbacks, platform)
+                return None
+            logger.info(
+                "%s probe failed, falling back to Streamlink: %s", platform, exc
+            )
+            self._count(self._errors, platform)
+            with self.lock:
+                errors = self._consecutive_errors.get(platform, 0) + 1
+                self._consecutive_errors[platform] = errors
+                if errors >= self.error_threshold:
+                    self._consecutive_errors[platform] = 0
+                    self._disabled_until[platform] = time.monotonic() + self.cooldown
+            return None
+
+        with self.lock:
+            self._consecutive_errors.pop(platform, None)
+        self._count(self._fallbacks if status is None else self._answered, platform)
+        return status
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+        with self.lock:
+            return {
+                "enabled": self.enabled,
+                "answered": dict(self._answered),
+                "fallbacks": dict(self._fallbacks),
+                "errors": dict(self._errors),
+                "cooling_down": sorted(
+                    p for p, until in self._disabled_until.items() if until > now
+                ),
+            }
+
+
+# Global prober used by status checks
+liveness_prober = LivenessProber()
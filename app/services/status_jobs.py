@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Optional
+
+from app.cache import cache
+from app.models import StreamStatus
+from app.services import stream_service
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Running jobs, referenced until done so they aren't collected
+_jobs: set = set()
+
+
+class TooManyJobs(Exception):
+    """Raised when this worker already runs STATUS_JOB_MAX_RUNNING jobs"""
+
+    pass
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def _chunk_key(job_id: str, chunk: int) -> str:
+    return f"job:{job_id}:chunk:{chunk}"
+
+
+def submit(urls: list) -> dict:
+    """
+    Start a bulk status job over validated URLs and return its initial state.
+
+    The job runs in the background in chunks of STATUS_JOB_CHUNK_SIZE
+    URLs, each checked with check_single_stream() so cached and in-flight
+    results are shared. Progress and each finished chunk's results are
+    kept in the cache backend for STATUS_JOB_TTL, so any worker can serve
+    them while the job runs. The job's lease is renewed while it runs, so
+    a job whose worker went away is reported as failed once it lapses.
+
+    Raises TooManyJobs if this worker already runs STATUS_JOB_MAX_RUNNING.
+    """
+    if len(_jobs) >= config.STATUS_JOB_MAX_RUNNING:
+        raise TooManyJobs(f"{len(_jobs)} status jobs already running")
+
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    job = {
+        "job_id": job_id,
+        "state": "running",
+        "total": len(urls),
+        "completed": 0,
+        "chunk_size": config.STATUS_JOB_CHUNK_SIZE,
+        "chunks_done": 0,
+        "created_at": now,
+        "updated_at": now,
+        "lease_expires_at": now + config.STATUS_JOB_LEASE,
+    }
+    cache.set(_job_key(job_id), job, ttl=config.STATUS_JOB_TTL)
+
+    task = asyncio.ensure_future(_run_job(dict(job), urls))
+    _jobs.add(task)
+    task.add_done_callback(_jobs.discard)
+    return job
+
+
+def _save(job: dict):
+    job["lease_expires_at"] = time.time() + config.STATUS_JOB_LEASE
+    cache.set(_job_key(job["job_id"]), job, ttl=config.STATUS_JOB_TTL)
+
+
+async def _renew_lease(job: dict):
+    """Keep a running job's lease alive while a slow chunk is being checked"""
+    while True:
+        await asyncio.sleep(config.STATUS_JOB_LEASE / 3)
+        _save(job)
+
+
+async def _run_job(job: dict, urls: list):
+    job_id, size = job["job_id"], job["chunk_size"]
+    lease = asyncio.ensure_future(_renew_lease(job))
+    try:
+        for start in range(0, len(urls), size):
+            statuses = await asyncio.gather(
+                *(_check_or_error(url) for url in urls[start : start + size])
+            )
+            cache.set(
+                _chunk_key(job_id, job["chunks_done"]),
+                [status.model_dump() for status in statuses],
+                ttl=config.STATUS_JOB_TTL,
+            )
+            job["chunks_done"] += 1
+            job["completed"] += len(statuses)
+            job["updated_at"] = time.time()
+            _save(job)
+    except Exception as e:
+        logger.error("Status job %s failed: %s", job_id, e)
+        job["state"] = "failed"
+        job["error"] = str(e)
+    else:
+        job["state"] = "done"
+    finally:
+        lease.cancel()
+    job["updated_at"] = time.time()
+    _save(job)
+
+
+async def _check_or_error(url: str) -> StreamStatus:
+    try:
+        return await stream_service.check_single_stream(url)
+    except Exception as e:
+        return StreamStatus(url=url, status="error", error=str(e))
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    """
+    The job's progress, or None if it doesn't exist or has expired.
+
+    A running job whose lease lapsed lost its worker (e.g. to a restart)
+    and is marked failed, keeping the results it finished.
+    """
+    job = cache.get(_job_key(job_id))
+    if not isinstance(job, dict):
+        return None
+    if job["state"] == "running" and job.get("lease_expires_at", 0) < time.time():
+        logger.warning("Status job %s lost its worker, marking it failed", job_id)
+        job = {
+            **job,
+            "state": "failed",
+            "error": "Job stopped before finishing",
+            "updated_at": time.time(),
+        }
+        cache.set(_job_key(job_id), job, ttl=config.STATUS_JOB_TTL)
+    return job
+
+
+def get_results(job: dict, offset: int = 0) -> list:
+    """Results of the job's finished chunks, from the ``offset``-th URL on"""
+    size = job["chunk_size"]
+    offset = max(0, offset)
+    results = []
+    for chunk in range(offset // size, job["chunks_done"]):
+        statuses = cache.get(_chunk_key(job["job_id"], chunk)) or []
+        skip = offset - chunk * size if chunk * size < offset else 0
+        results.extend(statuses[skip:])
+    return results
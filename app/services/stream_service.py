@@ -1,22 +1,42 @@
 import asyncio
 import logging
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
 from streamlink.exceptions import NoPluginError, NoStreamsError, PluginError
-from config import config
 from app.models import StreamStatus
 from app.exceptions import (
     NoPluginException,
     NoStreamsException,
+    PlatformUnavailableException,
     PluginException,
     BrowserRequiredException,
+    ResolutionTimeoutException,
+    ServiceBusyException,
+    StreamlinkAPIException,
     is_browser_error,
+    is_platform_error,
 )
+from app.bulkhead import BulkheadFull, bulkheads
 from app.cache import cache
+from app.circuit_breaker import CircuitBreaker, circuit_breakers
+from app.deadline import Deadline
 from app.utils import (
+    canonical_url,
     extract_platform_from_url,
     generate_fallback_thumbnail,
+    get_manifest_urls_from_streams,
     get_stream_types_from_streams,
 )
-from app.session_pool import session_pool
+from app.executor import resolution_executor
+from app.hedging import hedger
+from app.plugin_index import plugin_index
+from app.process_pool import resolver_processes
+from app.services.probes import liveness_prober
+from app.session_pool import SessionPoolTimeout, session_pool
+from app.single_flight import single_flight
+from app.ttl import playback_ttl, record_status, status_ttl
+from config import config
 
 # Suppress Streamlink plugin loading warnings more aggressively
 logging.getLogger("streamlink.session.plugins").setLevel(logging.CRITICAL)
@@ -24,60 +44,390 @@ logging.getLogger("streamlink.plugins").setLevel(logging.CRITICAL)
 logging.getLogger("streamlink").setLevel(logging.ERROR)
 
 
-def _configure_twitch_session(session):
-    """Apply Twitch-specific session options if platform is Twitch."""
-    try:
-        session.set_option("twitch-supported-codecs", "h264,h265,av1")
-        session.set_option("twitch-low-latency", True)
-        if config.TWITCH_OAUTH_TOKEN:
-            session.set_option(
-                "twitch-api-header",
-                f"Authorization=OAuth {config.TWITCH_OAUTH_TOKEN}",
-            )
-    except Exception:
-        pass
+logger = logging.getLogger(__name__)
+
+# Session options a request deadline is applied to
+SESSION_TIMEOUT_OPTIONS = ("http-timeout", "stream-timeout")
 
+# Failure classes that retrying won't fix, cached for NEGATIVE_CACHE_PERMANENT_TTL
+PERMANENT_ERRORS = {"no_plugin", "browser_required"}
+# Failures negative-cached by status checks: the URL's or platform's fault,
+# never our own saturation (service_busy)
+STATUS_CACHED_ERRORS = {
+    "no_plugin",
+    "browser_required",
+    "plugin_error",
+    "timeout",
+    "unexpected",
+}
+# Cached failures that may answer /resolve; status timeouts and unexpected
+# errors say nothing about a resolution with its own deadline
+RESOLVE_CACHED_ERRORS = {"no_plugin", "browser_required", "plugin_error"}
+# Failure classes that count against a platform's circuit breaker; plugin
+# and unexpected errors only count when they are HTTP-level or connection
+# failures, as otherwise they are about one URL (private video, banned channel)
+PLATFORM_ERRORS = {"browser_required", "timeout"}
 
-def _set_cached_flag(result):
-    """Add a '_cached' indicator to a result, handling both dicts and Pydantic models."""
+# Background revalidations, referenced until done so they aren't collected
+_revalidations: set = set()
+
+
+def _set_cached_flag(result, stale: bool = False):
+    """
+    A copy of a cached result carrying a '_cached' indicator and its
+    staleness, handling both dicts and Pydantic models. The cached object
+    itself is left untouched.
+    """
     if isinstance(result, dict):
-        result["_cached"] = True
-    elif hasattr(result, "model_dump"):
+        return {**result, "_cached": True, "_stale": stale}
+    if hasattr(result, "model_copy"):
+        result = result.model_copy(update={"stale": stale})
         result.__dict__["_cached"] = True
     return result
 
 
-async def check_single_stream(url: str) -> StreamStatus:
-    """Check status of a single stream URL asynchronously"""
-    # Check cache first (shorter TTL for status checks)
+def _as_requested(result, url: str):
+    """A result reported under the URL the caller passed in, not its cache key"""
+    if isinstance(result, dict):
+        if result.get("original_url", url) != url:
+            return {**result, "original_url": url}
+        return result
+    if result.url != url:
+        return result.model_copy(update={"url": url})
+    return result
+
+
+def _revalidate(cache_key: str, refresh):
+    """Refresh a stale cache entry in the background, once per key"""
+    if single_flight.in_flight(cache_key):
+        return
+    task = asyncio.ensure_future(_run_revalidation(cache_key, refresh))
+    _revalidations.add(task)
+    task.add_done_callback(_revalidations.discard)
+
+
+async def _run_revalidation(cache_key: str, refresh):
+    try:
+        await single_flight.do(cache_key, refresh)
+    except Exception as e:
+        # The stale entry keeps being served until its hard TTL
+        logger.warning("Background refresh of %s failed: %s", cache_key, e)
+
+
+async def check_single_stream(url: str, bypass_cache: bool = False) -> StreamStatus:
+    """
+    Check status of a single stream URL asynchronously.
+    Equivalent URLs are checked, cached and coalesced in their canonical
+    form; the result reports the URL as passed in.
+    With bypass_cache, cached statuses and failures (including platform-wide
+    ones) are ignored for this call; the fresh result is still cached.
+    """
+    result = await _check_canonical(canonical_url(url), bypass_cache)
+    return _as_requested(result, url)
+
+
+async def _check_canonical(url: str, bypass_cache: bool) -> StreamStatus:
     cache_key = f"status:{url}"
-    cached_result = cache.get(cache_key)
-    if cached_result:
-        return _set_cached_flag(cached_result)
+    if not bypass_cache:
+        # Check cache first (shorter TTL for status checks)
+        cached_result, stale = cache.get_entry(cache_key)
+        if cached_result:
+            # A failing URL isn't re-resolved on every hit of its stale entry
+            if stale and not _cached_failure(url):
+                _revalidate(cache_key, lambda: _check_and_cache(url, cache_key))
+            return _set_cached_flag(cached_result, stale)
 
+        failure = _cached_failure(url)
+        if failure:
+            return _set_cached_flag(failure)
+
+    # Concurrent checks of the same URL share one resolution
+    return await single_flight.do(cache_key, lambda: _check_and_cache(url, cache_key))
+
+
+async def _run_with_session(func, url: str, platform: str, deadline: Deadline):
+    """
+    Run a blocking resolution with a pooled session, within the deadline.
+
+    The session is awaited on the event loop, so callers only occupy an
+    executor thread once they hold one. Running out of time while waiting
+    for a session raises SessionPoolTimeout (our capacity, not the
+    platform's). If the deadline passes during the resolution itself, the
+    caller gets asyncio.TimeoutError right away; the thread can't be
+    interrupted, but the session's http-timeout bounds it, and the session
+    goes back to the pool only once the thread is done with it.
+    """
+    session = await session_pool.get_session_async(
+        platform, timeout=deadline.remaining()
+    )
+
+    work = asyncio.ensure_future(
+        resolution_executor.run(func, url, session, deadline.http_timeout())
+    )
     try:
-        result = await asyncio.to_thread(_resolve_stream_sync, url)
-        # Cache status for 2 minutes
-        cache.set(cache_key, result, ttl=120)
-        return result
+        return await asyncio.wait_for(asyncio.shield(work), deadline.remaining())
+    finally:
+        if work.done():
+            session_pool.return_session(session)
+        else:
+            work.add_done_callback(lambda _: _release_abandoned(session, work))
+
+
+def _release_abandoned(session, work: asyncio.Future):
+    # Retrieve the outcome so an abandoned failure isn't logged as unhandled
+    if not work.cancelled():
+        work.exception()
+    session_pool.return_session(session)
+
+
+async def _check_and_cache(url: str, cache_key: str) -> StreamStatus:
+    platform = extract_platform_from_url(url)
+    breaker = circuit_breakers.get(platform)
+    if not breaker.allow():
+        return _circuit_open_status(url, breaker)
+
+    deadline = Deadline.for_request("status", platform)
+    try:
+        async with bulkheads.get(platform).slot(deadline.remaining()):
+            result = await hedger.run(
+                "status", platform, lambda: _check_attempt(url, platform, deadline)
+            )
+    except asyncio.TimeoutError:
+        logger.warning(
+            "Status check of %s exceeded %gs deadline", url, deadline.seconds
+        )
+        result = _error_status(
+            url,
+            platform,
+            "timeout",
+            f"Timed out after {deadline.seconds:g}s",
+            deadline_seconds=deadline.seconds,
+        )
+    except (SessionPoolTimeout, BulkheadFull, BrokenProcessPool) as e:
+        # Our capacity (incl. a crashed resolver process), not the platform
+        result = _error_status(url, platform, "service_busy", str(e))
     except Exception as e:
-        error_result = StreamStatus(url=url, status="error", error=str(e))
-        # Cache errors for shorter time (30 seconds)
-        cache.set(cache_key, error_result, ttl=30)
-        return error_result
+        result = _error_status(url, platform, "unexpected", str(e))
+
+    _record_outcome(breaker, result)
+    if result.status != "error":
+        _cache_status(cache_key, result)
+    elif result.error_details["type"] in STATUS_CACHED_ERRORS:
+        _cache_failure(url, result)
+    return result
+
+
+async def _check_attempt(url: str, platform: str, deadline: Deadline) -> StreamStatus:
+    if resolver_processes.enabled:
+        return await asyncio.wait_for(
+            resolver_processes.check_status(url, deadline.http_timeout()),
+            deadline.remaining(),
+        )
+    return await _run_with_session(_resolve_stream_sync, url, platform, deadline)
+
+
+def _is_platform_failure(result: StreamStatus) -> bool:
+    if result.status != "error":
+        return False
+    error_type = (result.error_details or {}).get("type")
+    if error_type in PLATFORM_ERRORS:
+        return True
+    return error_type in ("plugin_error", "unexpected") and is_platform_error(
+        result.error or ""
+    )
+
+
+def _record_outcome(breaker: CircuitBreaker, result: StreamStatus):
+    error_type = (result.error_details or {}).get("type")
+    if _is_platform_failure(result):
+        breaker.record_failure(result)
+    elif error_type == "service_busy":
+        # Our capacity, not the platform's health
+        breaker.release()
+    else:
+        breaker.record_success()
+
+
+def _circuit_open_status(url: str, breaker: CircuitBreaker) -> StreamStatus:
+    """A generic "platform unavailable" answer, given without resolving"""
+    platform = extract_platform_from_url(url)
+    cause = (breaker.last_failure.error_details or {}).get("type")
+    return _error_status(
+        url,
+        platform,
+        "platform_unavailable",
+        f"{platform.title()} is temporarily unavailable",
+        circuit="open",
+        cause=cause,
+        retry_after=round(breaker.retry_after()),
+    )
+
+
+def _cache_status(cache_key: str, result: StreamStatus):
+    """Cache a status for as long as the channel's history suggests it holds"""
+    history_key = f"history:{result.url}"
+    now = time.time()
+    previous = cache.get(history_key)
+    if not isinstance(previous, dict):
+        previous = None
+    history = record_status(previous, result.status, now)
+    if history is not previous:
+        cache.set(history_key, history, ttl=config.STATUS_HISTORY_TTL)
+
+    ttl = config.STATUS_TTL if previous is None else status_ttl(history, now)
+    # Then serve it stale while refreshing
+    cache.set(cache_key, result, ttl=ttl, stale_ttl=config.STATUS_STALE_TTL)
+
+
+def _error_status(
+    url: str, platform: str, error_type: str, error: str, **details
+) -> StreamStatus:
+    return StreamStatus(
+        url=url,
+        status="error",
+        error=error,
+        platform=platform,
+        error_details={"type": error_type, **details},
+    )
+
+
+def _no_plugin_status(url: str, platform: str) -> StreamStatus:
+    return _error_status(url, platform, "no_plugin", "No plugin available for this URL")
+
+
+def _browser_required_status(url: str, platform: str) -> StreamStatus:
+    return _error_status(
+        url,
+        platform,
+        "browser_required",
+        "Browser dependency required",
+        message=f"{platform.title()} requires browser automation",
+        reason="Platform uses anti-bot protection",
+    )
+
+
+def _plugin_error_status(url: str, platform: str, message: str) -> StreamStatus:
+    return _error_status(
+        url, platform, "plugin_error", f"Plugin error: {message}", message=message
+    )
+
+
+def _failure_key(url: str, platform: str, error_type: str) -> str:
+    if (
+        error_type == "browser_required"
+        and platform in config.NEGATIVE_CACHE_PLATFORM_WIDE
+    ):
+        return f"failure:platform:{platform}"
+    return f"failure:{url}"
 
 
-def _resolve_stream_sync(url: str) -> StreamStatus:
-    """Synchronous streamlink resolution using session pool"""
-    session = session_pool.get_session()
+def _cache_failure(url: str, result: StreamStatus):
+    """Negative-cache an error status for as long as its error class warrants"""
+    error_type = result.error_details["type"]
+    if error_type in PERMANENT_ERRORS:
+        ttl = config.NEGATIVE_CACHE_PERMANENT_TTL
+    else:
+        ttl = config.NEGATIVE_CACHE_TRANSIENT_TTL
+    cache.set(_failure_key(url, result.platform, error_type), result, ttl=ttl)
 
+
+def _cached_failure(url: str, error_types=None) -> Optional[StreamStatus]:
+    """A cached failure for the URL, or for its whole platform"""
+    platform = extract_platform_from_url(url)
+    for key in (f"failure:{url}", f"failure:platform:{platform}"):
+        failure = cache.get(key)
+        if not isinstance(failure, StreamStatus):
+            continue
+        if error_types is None or failure.error_details["type"] in error_types:
+            return failure.model_copy(update={"url": url})
+    return None
+
+
+def _status_from_exception(url: str, exc: StreamlinkAPIException) -> StreamStatus:
+    """A /resolve error in the form of a status check's result"""
+    platform = extract_platform_from_url(url)
+    if exc.error_type == "no_streams":
+        return StreamStatus(url=url, status="offline", platform=platform)
+    if exc.error_type == "no_plugin":
+        return _no_plugin_status(url, platform)
+    if exc.error_type == "browser_required":
+        return _browser_required_status(url, platform)
+    if exc.error_type == "plugin_error":
+        return _plugin_error_status(url, platform, exc.detail["message"])
+    if exc.error_type == "timeout":
+        deadline = exc.detail["deadline_seconds"]
+        return _error_status(
+            url,
+            platform,
+            "timeout",
+            f"Timed out after {deadline:g}s",
+            deadline_seconds=deadline,
+        )
+    return _error_status(url, platform, exc.error_type, str(exc.detail))
+
+
+def _cache_resolve_failure(url: str, exc: StreamlinkAPIException):
+    """Negative-cache a /resolve error in the same form as a status failure"""
+    failure = _status_from_exception(url, exc)
+    if failure.status == "offline":
+        # An offline status short-circuits /resolve as well
+        _cache_status(f"status:{url}", failure)
+    elif failure.error_details["type"] in RESOLVE_CACHED_ERRORS:
+        _cache_failure(url, failure)
+
+
+def _failure_exception(url: str, failure: StreamStatus) -> StreamlinkAPIException:
+    """The /resolve error for a cached failure"""
+    details = failure.error_details
+    if details["type"] == "no_plugin":
+        return NoPluginException(url)
+    if details["type"] == "browser_required":
+        return BrowserRequiredException(url)
+    if details["type"] == "timeout":
+        return ResolutionTimeoutException(url, details["deadline_seconds"])
+    return PluginException(url, details.get("message", failure.error))
+
+
+def _set_session_timeouts(session, timeout: Optional[float]) -> dict:
+    """Cap a session's HTTP requests and stream reads; returns the old values"""
+    if timeout is None:
+        return {}
+    previous = {name: session.get_option(name) for name in SESSION_TIMEOUT_OPTIONS}
+    for name in SESSION_TIMEOUT_OPTIONS:
+        session.set_option(name, timeout)
+    return previous
+
+
+def _restore_session_timeouts(session, previous: dict):
+    for name, value in previous.items():
+        session.set_option(name, value)
+
+
+def _resolve_stream_sync(
+    url: str, session=None, timeout: Optional[float] = None
+) -> StreamStatus:
+    """
+    Synchronous streamlink resolution using session pool.
+    If no session is passed in, one is borrowed from the pool for the call.
+    A timeout caps every HTTP request made on the session.
+    """
+    platform = extract_platform_from_url(url)
+    owned = session is None
+    if owned:
+        session = session_pool.get_session(platform)
+
+    error = None
+    previous_timeouts = _set_session_timeouts(session, timeout)
     try:
-        platform = extract_platform_from_url(url)
-        if platform == "twitch":
-            _configure_twitch_session(session)
+        # A cheap platform check first; enumerate streams only if it can't decide
+        probed = liveness_prober.probe(session, url, timeout)
+        if probed is not None:
+            return probed
 
-        plugin_name, plugin_class, resolved_url = session.resolve_url(url)
-        plugin_instance = plugin_class(session, resolved_url)
+        plugin_name, plugin_class, resolved_url = plugin_index.resolve_url(session, url)
+        plugin_instance = plugin_class(
+            session, resolved_url, session_pool.plugin_options(platform)
+        )
         streams = plugin_instance.streams()
 
         if not streams:
@@ -97,58 +447,128 @@ def _resolve_stream_sync(url: str) -> StreamStatus:
             platform=platform,
         )
     except NoPluginError:
-        return StreamStatus(
-            url=url,
-            status="error",
-            error="No plugin available for this URL",
-            platform=extract_platform_from_url(url),
-        )
+        return _no_plugin_status(url, platform)
     except NoStreamsError:
         return StreamStatus(
             url=url,
             status="offline",
             error="No streams available",
-            platform=extract_platform_from_url(url),
+            platform=platform,
         )
     except PluginError as e:
+        error = e
         error_msg = str(e)
-        platform = extract_platform_from_url(url)
 
         if is_browser_error(error_msg):
-            return StreamStatus(
-                url=url,
-                status="error",
-                error="Browser dependency required",
-                platform=platform,
-                error_details={
-                    "type": "browser_required",
-                    "message": f"{platform.title()} requires browser automation",
-                    "reason": "Platform uses anti-bot protection",
-                },
-            )
+            return _browser_required_status(url, platform)
 
-        return StreamStatus(
-            url=url,
-            status="error",
-            error=f"Plugin error: {error_msg}",
-            platform=platform,
-        )
+        return _plugin_error_status(url, platform, error_msg)
     except Exception as e:
-        return StreamStatus(
-            url=url,
-            status="error",
-            error=f"Unexpected error: {str(e)}",
-            platform=extract_platform_from_url(url),
-        )
+        error = e
+        return _error_status(url, platform, "unexpected", f"Unexpected error: {str(e)}")
     finally:
+        _restore_session_timeouts(session, previous_timeouts)
+        session_pool.record_result(session, error)
         # Return session to pool
-        session_pool.return_session(session)
+        if owned:
+            session_pool.return_session(session)
+
+
+async def resolve_stream(url: str, bypass_cache: bool = False):
+    """
+    Async entry point for the /resolve endpoint.
+    Waits for a pooled session on the event loop before handing the
+    blocking resolution to a worker thread, or hands it to a resolver
+    process when the process backend is enabled. With bypass_cache, cached
+    results and failures are ignored for this call. As with status checks,
+    the canonical URL is resolved and keys the cache, and the caller's URL
+    is reported.
+    """
+    result = await _resolve_canonical(canonical_url(url), bypass_cache)
+    return _as_requested(result, url)
 
 
-def resolve_stream_details(url: str):
+async def _resolve_canonical(url: str, bypass_cache: bool):
+    cache_key = f"resolve:{url}"
+    if not bypass_cache:
+        cached_result, stale = cache.get_entry(cache_key)
+        if cached_result:
+            if stale and not _cached_failure(url, RESOLVE_CACHED_ERRORS):
+                _revalidate(cache_key, lambda: _resolve_and_cache(url, cache_key))
+            return _set_cached_flag(cached_result, stale)
+
+        # A fresh offline status from a status check answers /resolve as well
+        cached_status = cache.get(f"status:{url}")
+        if getattr(cached_status, "status", None) == "offline":
+            raise NoStreamsException(url)
+
+        failure = _cached_failure(url, RESOLVE_CACHED_ERRORS)
+        if failure:
+            raise _failure_exception(url, failure)
+
+    # Concurrent requests for the same URL share one resolution
+    return await single_flight.do(cache_key, lambda: _resolve_and_cache(url, cache_key))
+
+
+async def _resolve_and_cache(url: str, cache_key: str):
+    platform = extract_platform_from_url(url)
+    breaker = circuit_breakers.get(platform)
+    if not breaker.allow():
+        raise PlatformUnavailableException(url, breaker.retry_after())
+
+    try:
+        result = await _resolve_within_deadline(url, platform)
+    except StreamlinkAPIException as e:
+        _record_outcome(breaker, _status_from_exception(url, e))
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+    return result
+
+
+async def _resolve_within_deadline(url: str, platform: str):
+    deadline = Deadline.for_request("resolve", platform)
+    try:
+        async with bulkheads.get(platform).slot(deadline.remaining()):
+            return await hedger.run(
+                "resolve", platform, lambda: _resolve_attempt(url, platform, deadline)
+            )
+    except BulkheadFull:
+        raise ServiceBusyException(url)
+    except asyncio.TimeoutError:
+        logger.warning("Resolution of %s exceeded %gs deadline", url, deadline.seconds)
+        raise ResolutionTimeoutException(url, deadline.seconds)
+
+
+async def _resolve_attempt(url: str, platform: str, deadline: Deadline):
+    if resolver_processes.enabled:
+        try:
+            result = await asyncio.wait_for(
+                resolver_processes.resolve_details(url, deadline.http_timeout()),
+                deadline.remaining(),
+            )
+        except BrokenProcessPool:
+            raise ServiceBusyException(url)
+        except StreamlinkAPIException as e:
+            _cache_resolve_failure(url, e)
+            raise
+        _cache_resolution(url, result)
+        return result
+
+    try:
+        return await _run_with_session(resolve_stream_details, url, platform, deadline)
+    except SessionPoolTimeout:
+        raise ServiceBusyException(url)
+
+
+def resolve_stream_details(url: str, session=None, timeout: Optional[float] = None):
     """
     Get full stream details including playback URLs.
     This was previously embedded in the /resolve endpoint.
+    If no session is passed in, one is borrowed from the pool for the call.
+    A timeout caps every HTTP request made on the session.
     """
     # Check cache first (longer TTL for full resolution)
     cache_key = f"resolve:{url}"
@@ -156,26 +576,73 @@ def resolve_stream_details(url: str):
     if cached_result:
         return _set_cached_flag(cached_result)
 
-    session = session_pool.get_session()
-
     try:
-        platform = extract_platform_from_url(url)
-        if platform == "twitch":
-            _configure_twitch_session(session)
+        result = _resolve_details_sync(url, session, timeout)
+    except StreamlinkAPIException as e:
+        _cache_resolve_failure(url, e)
+        raise
+    _cache_resolution(url, result)
+    return result
+
+
+def _cache_resolution(url: str, result: dict):
+    manifest_urls = result.pop("_manifest_urls", None) or []
+    if result["status"] == "online":
+        # Keep playback URLs only while their signatures (and those of the
+        # playlists they came from) are still valid
+        ttl, stale_ttl = playback_ttl(
+            [*(result.get("all_qualities") or {}).values(), *manifest_urls]
+        )
+    else:
+        # Cache offline for 1 minute
+        ttl, stale_ttl = 60, config.RESOLVE_STALE_TTL
+    if ttl:
+        cache.set(f"resolve:{url}", result, ttl=ttl, stale_ttl=stale_ttl)
+    # A resolution carries everything a status check would fetch
+    _cache_status(f"status:{url}", _status_from_resolution(url, result))
 
-        plugin_name, plugin_class, resolved_url = session.resolve_url(url)
-        plugin_instance = plugin_class(session, resolved_url)
+
+def _status_from_resolution(url: str, result: dict) -> StreamStatus:
+    return StreamStatus(
+        url=url,
+        status=result["status"],
+        title=result.get("title") or "",
+        author=result.get("author") or "",
+        thumbnail=result.get("thumbnail") or "",
+        category=result.get("category") or "",
+        stream_id=result.get("stream_id") or "",
+        platform=result.get("platform") or "",
+    )
+
+
+def _resolve_details_sync(
+    url: str, session=None, timeout: Optional[float] = None
+) -> dict:
+    """Uncached resolution behind resolve_stream_details()"""
+    platform = extract_platform_from_url(url)
+    owned = session is None
+    if owned:
+        try:
+            session = session_pool.get_session(platform)
+        except SessionPoolTimeout:
+            raise ServiceBusyException(url)
+
+    error = None
+    previous_timeouts = _set_session_timeouts(session, timeout)
+    try:
+        plugin_name, plugin_class, resolved_url = plugin_index.resolve_url(session, url)
+        plugin_instance = plugin_class(
+            session, resolved_url, session_pool.plugin_options(platform)
+        )
         streams = plugin_instance.streams()
 
         if not streams:
-            result = {"status": "offline", "original_url": url, "platform": platform}
-            cache.set(cache_key, result, ttl=60)  # Cache offline for 1 minute
-            return result
+            return {"status": "offline", "original_url": url, "platform": platform}
 
         metadata = plugin_instance.get_metadata()
         author = metadata.get("author") or plugin_name
 
-        result = {
+        return {
             "status": "online",
             "title": metadata.get("title") or "Live Stream",
             "author": author,
@@ -186,17 +653,16 @@ def resolve_stream_details(url: str):
             "stream_id": metadata.get("id") or "",
             "platform": platform,
             "stream_types": get_stream_types_from_streams(streams),
+            # Only used to time the cache entry; removed before caching
+            "_manifest_urls": get_manifest_urls_from_streams(streams),
         }
 
-        # Cache successful resolution for 5 minutes
-        cache.set(cache_key, result, ttl=300)
-        return result
-
     except NoPluginError:
         raise NoPluginException(url)
     except NoStreamsError:
         raise NoStreamsException(url)
     except PluginError as e:
+        error = e
         error_msg = str(e)
 
         if is_browser_error(error_msg):
@@ -204,7 +670,11 @@ def resolve_stream_details(url: str):
 
         raise PluginException(url, error_msg)
     except Exception as e:
+        error = e
         raise PluginException(url, f"Unexpected error: {str(e)}")
     finally:
+        _restore_session_timeouts(session, previous_timeouts)
+        session_pool.record_result(session, error)
         # Return session to pool
-        session_pool.return_session(session)
+        if owned:
+            session_pool.return_session(session)
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Optional
+
+from app.models import StreamStatus
+from app.services import stream_service
+from app.utils import canonical_url
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class StatusSubscriptions:
+    """
+    Shared status watchers for WebSocket subscribers.
+
+    Each subscribed URL gets one background watcher, however many clients
+    subscribe to it. The watcher re-checks the URL every ``interval``
+    seconds through check_single_stream(), so the cache, negative caching
+    and coalescing all apply, and publishes a status to the subscribers'
+    queues only when it differs from the last one. New subscribers get the
+    last known status right away. A URL's watcher stops with its last
+    subscriber. Equivalent URLs share a watcher under their canonical form,
+    and each subscriber gets the statuses under the URL it subscribed with.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = (
+            config.SUBSCRIPTION_CHECK_INTERVAL if interval is None else interval
+        )
+        # Keyed by canonical URL; each queue maps to the URL it subscribed with
+        self._subscribers: dict[str, dict[asyncio.Queue, str]] = {}
+        self._watchers: dict[str, asyncio.Task] = {}
+        self._last: dict[str, StreamStatus] = {}
+        self._checks = 0
+        self._transitions = 0
+
+    def subscribe(self, url: str, queue: asyncio.Queue):
+        """Deliver the URL's status transitions to the queue"""
+        key = canonical_url(url)
+        subscribers = self._subscribers.setdefault(key, {})
+        if queue in subscribers:
+            return
+        subscribers[queue] = url
+        if key in self._last:
+            queue.put_nowait(_as_subscribed(self._last[key], url))
+        if key not in self._watchers:
+            self._watchers[key] = asyncio.ensure_future(self._watch(key))
+
+    def unsubscribe(self, url: str, queue: asyncio.Queue):
+        key = canonical_url(url)
+        subscribers = self._subscribers.get(key)
+        if subscribers is None:
+            return
+        subscribers.pop(queue, None)
+        if not subscribers:
+            del self._subscribers[key]
+            self._last.pop(key, None)
+            watcher = self._watchers.pop(key, None)
+            if watcher is not None:
+                watcher.cancel()
+
+    async def _watch(self, key: str):
+        while True:
+            try:
+                status = await stream_service.check_single_stream(key)
+            except Exception as e:
+                status = StreamStatus(url=key, status="error", error=str(e))
+            self._checks += 1
+
+            previous = self._last.get(key)
+            if previous is None or previous.status != status.status:
+                self._last[key] = status
+                self._transitions += 1
+                for queue, url in self._subscribers.get(key, {}).items():
+                    queue.put_nowait(_as_subscribed(status, url))
+            await asyncio.sleep(self.interval)
+
+    def get_stats(self) -> dict:
+        return {
+            "watched_urls": len(self._watchers),
+            "subscriptions": sum(len(s) for s in self._subscribers.values()),
+            "checks": self._checks,
+            "transitions": self._transitions,
+            "interval_seconds": self.interval,
+        }
+
+
+def _as_subscribed(status: StreamStatus, url: str) -> StreamStatus:
+    if status.url == url:
+        return status
+    return status.model_copy(update={"url": url})
+
+
+# Global subscriptions, shared by every WebSocket connection in the process
+status_subscriptions = StatusSubscriptions()
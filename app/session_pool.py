@@ -1,22 +1,205 @@
-import queue
+import asyncio
+import logging
 import threading
 import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from streamlink.session import Streamlink
 
+from app.http_pool import http_adapter
+from app.plugin_index import plugin_index
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Partition used for platforms without a dedicated sub-pool
+DEFAULT_PARTITION = "default"
+
+
+def _twitch_plugin_options() -> dict:
+    options = {
+        "supported-codecs": ["h264", "h265", "av1"],
+        "low-latency": True,
+    }
+    if config.TWITCH_OAUTH_TOKEN:
+        options["api-header"] = [
+            ("Authorization", f"OAuth {config.TWITCH_OAUTH_TOKEN}")
+        ]
+    return options
+
+
+# Plugin options handed to each platform's plugin, built once per partition
+PLATFORM_PLUGIN_OPTIONS = {
+    "twitch": _twitch_plugin_options,
+}
+
+# Representative URLs used to load a partition's plugin when a session is built
+PLATFORM_WARMUP_URLS = {
+    "twitch": "https://www.twitch.tv/twitch",
+    "youtube": "https://www.youtube.com/watch?v=aqz-KE-bpKQ",
+    "kick": "https://kick.com/kick",
+}
+
+
+class SessionPoolTimeout(Exception):
+    """Raised when no session becomes available within the acquire timeout"""
+
+    pass
+
+
+def _cookie_bytes(session: Streamlink) -> int:
+    """Approximate memory held by a session's cookie jar"""
+    try:
+        return sum(
+            len(cookie.name) + len(cookie.value or "") + len(cookie.domain or "")
+            for cookie in session.http.cookies
+        )
+    except Exception:
+        return 0
+
+
+class _PooledSession:
+    """Bookkeeping wrapper around a pooled Streamlink session"""
+
+    __slots__ = (
+        "session",
+        "created_at",
+        "last_used",
+        "uses",
+        "failures",
+        "consecutive_failures",
+        "last_error",
+    )
+
+    def __init__(self, session: Streamlink):
+        self.session = session
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.uses = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+
+    def get_stats(self, state: str) -> dict:
+        now = time.time()
+        return {
+            "state": state,
+            "age_seconds": round(now - self.created_at, 1),
+            "idle_seconds": round(now - self.last_used, 1) if state == "idle" else 0,
+            "requests_served": self.uses,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "cookies": len(self.session.http.cookies),
+            "approx_memory_bytes": _cookie_bytes(self.session),
+        }
+
+
+class _Waiter:
+    """A blocked get_session() caller waiting for a session to be handed over"""
+
+    __slots__ = ("event", "entry")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.entry: Optional[_PooledSession] = None
+
+    def deliver(self, entry: _PooledSession) -> None:
+        self.entry = entry
+        self.event.set()
+
+
+class _AsyncWaiter:
+    """An acquire() caller waiting on the event loop for a session"""
+
+    __slots__ = ("loop", "future", "entry")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.entry: Optional[_PooledSession] = None
+
+    def deliver(self, entry: _PooledSession) -> None:
+        # Sessions are returned from worker threads, so wake the loop safely
+        self.entry = entry
+        self.loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
 
 class StreamlinkSessionPool:
-    """Simple session pool with 3 pre-configured Streamlink sessions"""
+    """
+    Elastic pool of pre-configured Streamlink sessions.
+
+    Keeps at least ``min_size`` sessions alive and grows in the background
+    while callers are queued, up to a hard cap of ``max_size``. Once the cap
+    is reached callers wait for the next returned session instead of building
+    throwaway ones. Sessions idle for longer than ``idle_timeout`` are closed
+    by shrink_idle() until the pool is back at ``min_size``, and sessions older
+    than ``refresh_interval`` or used ``max_uses`` times are replaced one at a
+    time by refresh_stale(). Sessions that keep failing or whose cookie jar
+    grows too large are recycled as soon as they are returned.
+    """
 
-    def __init__(self, pool_size: int = 3):
-        self.pool_size = pool_size
-        self.sessions = queue.Queue(maxsize=pool_size)
+    def __init__(
+        self,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        acquire_timeout: Optional[float] = None,
+        refresh_interval: Optional[float] = None,
+        max_uses: Optional[int] = None,
+        platform: str = DEFAULT_PARTITION,
+    ):
+        self.platform = platform
+        build_options = PLATFORM_PLUGIN_OPTIONS.get(platform)
+        self.plugin_options = build_options() if build_options else {}
+        self.min_size = config.SESSION_POOL_MIN_SIZE if min_size is None else min_size
+        self.max_size = max(
+            self.min_size,
+            config.SESSION_POOL_MAX_SIZE if max_size is None else max_size,
+        )
+        self.idle_timeout = (
+            config.SESSION_POOL_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        )
+        self.acquire_timeout = (
+            config.SESSION_POOL_ACQUIRE_TIMEOUT
+            if acquire_timeout is None
+            else acquire_timeout
+        )
         self.lock = threading.Lock()
         self.created_at = time.time()
-        self.refresh_interval = 3600  # Refresh sessions every hour
+        self.refresh_interval = (
+            config.SESSION_REFRESH_INTERVAL
+            if refresh_interval is None
+            else refresh_interval
+        )
+        self.max_uses = config.SESSION_MAX_USES if max_uses is None else max_uses
+        self.max_failures = config.SESSION_MAX_FAILURES
+        self.max_cookie_bytes = config.SESSION_MAX_COOKIE_BYTES
+
+        self._idle: deque[_PooledSession] = deque()
+        self._in_use: dict[int, _PooledSession] = {}
+        self._waiters: deque[_Waiter] = deque()
+        self._total = 0  # live sessions plus sessions being created
+        self._growing = 0
+        self._timeouts = 0
+        self._refreshed = 0
+        self._recycled = 0
+        self._avg_wait = 0.0
 
         # Create initial sessions
         self._create_sessions()
 
+    @property
+    def pool_size(self) -> int:
+        """Number of sessions currently owned by the pool"""
+        return self._total
+
     def _create_session(self) -> Streamlink:
         """Create a pre-configured Streamlink session"""
         session = Streamlink()
@@ -24,57 +207,405 @@ class StreamlinkSessionPool:
             "http-headers",
             "User-Agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
         )
+        # Share keep-alive connections with every other pooled session
+        http_adapter.mount_on(session.http)
+        warmup_url = PLATFORM_WARMUP_URLS.get(self.platform)
+        if warmup_url:
+            # Import the platform's plugin now instead of on the first request
+            plugin_index.preload(session, warmup_url)
         return session
 
     def _create_sessions(self):
-        """Fill the pool with sessions"""
-        for _ in range(self.pool_size):
-            session = self._create_session()
-            self.sessions.put(session)
+        """Fill the pool up to min_size"""
+        for _ in range(max(0, self.min_size - self._total)):
+            entry = _PooledSession(self._create_session())
+            with self.lock:
+                self._total += 1
+                self._idle.append(entry)
 
-    def get_session(self) -> Streamlink:
-        """Get a session from the pool"""
+    def get_session(self, timeout: Optional[float] = None) -> Streamlink:
+        """Get a session from the pool, waiting up to ``timeout`` seconds"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+
+        with self.lock:
+            entry = self._checkout_idle()
+            if entry is None:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+                self._maybe_grow()
+
+        if entry is None:
+            if not waiter.event.wait(timeout):
+                with self.lock:
+                    if waiter.entry is None:
+                        self._waiters.remove(waiter)
+                        self._timeouts += 1
+                        raise SessionPoolTimeout(
+                            f"No Streamlink session available after {timeout:.1f}s"
+                        )
+            entry = waiter.entry
+
+        self._record_wait(time.monotonic() - started)
+        return entry.session
+
+    async def get_session_async(self, timeout: Optional[float] = None) -> Streamlink:
+        """Get a session from the pool, waiting on the event loop instead of a thread"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+
+        with self.lock:
+            entry = self._checkout_idle()
+            if entry is None:
+                waiter = _AsyncWaiter(asyncio.get_running_loop())
+                self._waiters.append(waiter)
+                self._maybe_grow()
+
+        if entry is None:
+            try:
+                await asyncio.wait_for(waiter.future, timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+                with self.lock:
+                    delivered = waiter.entry is not None
+                    if not delivered:
+                        self._waiters.remove(waiter)
+                        if isinstance(exc, asyncio.TimeoutError):
+                            self._timeouts += 1
+                if not delivered:
+                    if isinstance(exc, asyncio.TimeoutError):
+                        raise SessionPoolTimeout(
+                            f"No Streamlink session available after {timeout:.1f}s"
+                        ) from None
+                    raise
+                if isinstance(exc, asyncio.CancelledError):
+                    # Handed over just as we were cancelled: give it back
+                    self.return_session(waiter.entry.session)
+                    raise
+            entry = waiter.entry
+
+        self._record_wait(time.monotonic() - started)
+        return entry.session
+
+    @asynccontextmanager
+    async def acquire(self, timeout: Optional[float] = None):
+        """
+        Borrow a session for the duration of an ``async with`` block.
+
+        Waiting happens on the event loop, so callers only occupy an executor
+        thread once they actually hold a session.
+        """
+        session = await self.get_session_async(timeout)
         try:
-            # Check if sessions need refresh
-            if time.time() - self.created_at > self.refresh_interval:
-                self._refresh_pool()
+            yield session
+        finally:
+            self.return_session(session)
+
+    def owns(self, session: Streamlink) -> bool:
+        """Whether the session is currently checked out from this pool"""
+        return id(session) in self._in_use
 
-            # Get session with timeout
-            return self.sessions.get(timeout=5)
-        except queue.Empty:
-            # Fallback: create new session if pool is empty
-            return self._create_session()
+    def record_result(self, session: Streamlink, error: Optional[BaseException] = None):
+        """Record the outcome of a request served by a checked-out session"""
+        with self.lock:
+            entry = self._in_use.get(id(session))
+            if entry is None:
+                return
+            if error is None:
+                entry.consecutive_failures = 0
+            else:
+                entry.failures += 1
+                entry.consecutive_failures += 1
+                entry.last_error = type(error).__name__
 
     def return_session(self, session: Streamlink):
-        """Return a session to the pool"""
+        """Return a session to the pool, handing it to a waiter if any"""
+        with self.lock:
+            entry = self._in_use.pop(id(session), None)
+            if entry is None:
+                # Not checked out from this pool (or already retired)
+                return
+            poisoned = self._is_poisoned(entry)
+            if poisoned:
+                self._total -= 1
+                self._recycled += 1
+                self._replace_retired()
+            else:
+                self._release(entry)
+
+        if poisoned:
+            logger.info(
+                "Recycling %s session after %d consecutive failure(s) (last: %s)",
+                self.platform,
+                entry.consecutive_failures,
+                entry.last_error,
+            )
+            self._close(entry)
+
+    def _is_poisoned(self, entry: _PooledSession) -> bool:
+        return (
+            entry.consecutive_failures >= self.max_failures
+            or _cookie_bytes(entry.session) > self.max_cookie_bytes
+        )
+
+    def shrink_idle(self) -> int:
+        """Close sessions idle for longer than idle_timeout, down to min_size"""
+        cutoff = time.time() - self.idle_timeout
+        retired = []
+        with self.lock:
+            # The left end of the idle deque holds the least recently used sessions
+            while (
+                self._idle
+                and self._total > self.min_size
+                and self._idle[0].last_used < cutoff
+            ):
+                retired.append(self._idle.popleft())
+                self._total -= 1
+
+        for entry in retired:
+            self._close(entry)
+        if retired:
+            logger.info("Session pool shrunk by %d idle session(s)", len(retired))
+        return len(retired)
+
+    def _checkout_idle(self) -> Optional[_PooledSession]:
+        """Pop the most recently used idle session (caller holds the lock)"""
+        if not self._idle:
+            return None
+        entry = self._idle.pop()
+        entry.uses += 1
+        self._in_use[id(entry.session)] = entry
+        return entry
+
+    def _release(self, entry: _PooledSession):
+        """Hand a session to the oldest waiter or park it (caller holds the lock)"""
+        entry.last_used = time.time()
+        if self._waiters:
+            entry.uses += 1
+            self._in_use[id(entry.session)] = entry
+            self._waiters.popleft().deliver(entry)
+        else:
+            self._idle.append(entry)
+
+    def _maybe_grow(self):
+        """Start a background session build if callers outnumber pending builds"""
+        if self._total >= self.max_size or self._growing >= len(self._waiters):
+            return
+        self._start_grow()
+
+    def _replace_retired(self):
+        """Rebuild after a retirement if callers are waiting or we fell below min_size"""
+        if self._waiters:
+            self._maybe_grow()
+        elif self._total < self.min_size:
+            self._start_grow()
+
+    def _start_grow(self):
+        """Reserve a slot and build a session in the background (caller holds the lock)"""
+        self._total += 1
+        self._growing += 1
+        threading.Thread(
+            target=self._grow, name="session-pool-grow", daemon=True
+        ).start()
+
+    def _grow(self):
+        """Build one session off the request path and add it to the pool"""
         try:
-            self.sessions.put_nowait(session)
-        except queue.Full:
-            # Pool is full, discard the session
+            entry = _PooledSession(self._create_session())
+        except Exception as exc:
+            logger.warning("Failed to create Streamlink session: %s", exc)
+            with self.lock:
+                self._total -= 1
+                self._growing -= 1
+            return
+
+        with self.lock:
+            self._growing -= 1
+            self._release(entry)
+
+    def _record_wait(self, waited: float):
+        """Track an exponentially weighted average of acquire wait times"""
+        self._avg_wait = self._avg_wait * 0.9 + waited * 0.1
+
+    @staticmethod
+    def _close(entry: _PooledSession):
+        try:
+            entry.session.http.close()
+        except Exception:
             pass
 
-    def _refresh_pool(self):
-        """Refresh all sessions in the pool"""
+    def _is_worn(self, entry: _PooledSession, now: float) -> bool:
+        return (
+            now - entry.created_at > self.refresh_interval
+            or entry.uses >= self.max_uses
+        )
+
+    def refresh_stale(self) -> bool:
+        """
+        Replace the most worn idle session with a freshly built one.
+        Meant to run periodically off the request path: only one session is
+        out of rotation while its replacement is built, the rest keep serving.
+        """
+        now = time.time()
         with self.lock:
-            # Only refresh if we haven't refreshed recently
-            if time.time() - self.created_at < self.refresh_interval:
+            worn = [e for e in self._idle if self._is_worn(e, now)]
+            if not worn:
+                return False
+            stale = min(worn, key=lambda e: e.created_at)
+            # Still counted in _total, so growth can't overshoot max_size meanwhile
+            self._idle.remove(stale)
+
+        try:
+            fresh = _PooledSession(self._create_session())
+        except Exception as exc:
+            logger.warning("Failed to refresh Streamlink session: %s", exc)
+            with self.lock:
+                self._release(stale)
+            return False
+
+        with self.lock:
+            self._refreshed += 1
+            self._release(fresh)
+        self._close(stale)
+        return True
+
+    def after_fork(self):
+        """
+        Re-initialise process-local state in a freshly forked worker.
+        The worker keeps copy-on-write copies of the sessions built in the
+        master, but must not share its locks or any inherited sockets.
+        """
+        self.lock = threading.Lock()
+        self._waiters.clear()
+        self._growing = 0
+        self._timeouts = 0
+        self._avg_wait = 0.0
+        for entry in self._idle:
+            self._close(entry)
+
+    def size(self) -> int:
+        """Get number of idle sessions"""
+        return len(self._idle)
+
+    def get_stats(self) -> dict:
+        """Get pool statistics"""
+        with self.lock:
+            return {
+                "platform": self.platform,
+                "available_sessions": len(self._idle),
+                "in_use": len(self._in_use),
+                "waiting": len(self._waiters),
+                "pool_size": self._total,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "avg_wait_seconds": round(self._avg_wait, 4),
+                "acquire_timeouts": self._timeouts,
+                "refreshed_sessions": self._refreshed,
+                "recycled_sessions": self._recycled,
+                "created_at": self.created_at,
+                "refresh_interval": self.refresh_interval,
+                "max_uses": self.max_uses,
+                "max_failures": self.max_failures,
+                "sessions": [e.get_stats("idle") for e in self._idle]
+                + [e.get_stats("in_use") for e in self._in_use.values()],
+            }
+
+
+def _parse_bounds(bounds: str) -> tuple[int, int]:
+    """Parse a "min:max" (or bare "max") partition size"""
+    low, sep, high = bounds.partition(":")
+    if not sep:
+        return 0, int(low)
+    return int(low), int(high)
+
+
+class PartitionedSessionPool:
+    """
+    Per-platform session pools.
+
+    Each configured platform gets its own StreamlinkSessionPool with its own
+    bounds and plugin options, so a slow platform can only exhaust its own
+    sessions. Every other platform shares the ``default`` partition.
+    """
+
+    def __init__(self, platform_sizes: Optional[dict] = None):
+        sizes = (
+            config.SESSION_POOL_PLATFORM_SIZES
+            if platform_sizes is None
+            else platform_sizes
+        )
+        self.pools: dict[str, StreamlinkSessionPool] = {}
+        for platform, bounds in sizes.items():
+            min_size, max_size = _parse_bounds(bounds)
+            self.pools[platform] = StreamlinkSessionPool(
+                min_size=min_size, max_size=max_size, platform=platform
+            )
+        self.pools[DEFAULT_PARTITION] = StreamlinkSessionPool()
+
+    def pool_for(self, platform: str) -> StreamlinkSessionPool:
+        """Get the sub-pool serving a platform"""
+        return self.pools.get(platform) or self.pools[DEFAULT_PARTITION]
+
+    def get_session(
+        self, platform: str = DEFAULT_PARTITION, timeout: Optional[float] = None
+    ) -> Streamlink:
+        return self.pool_for(platform).get_session(timeout)
+
+    async def get_session_async(
+        self, platform: str = DEFAULT_PARTITION, timeout: Optional[float] = None
+    ) -> Streamlink:
+        return await self.pool_for(platform).get_session_async(timeout)
+
+    def acquire(
+        self, platform: str = DEFAULT_PARTITION, timeout: Optional[float] = None
+    ):
+        """Borrow a session from the platform's partition (``async with``)"""
+        return self.pool_for(platform).acquire(timeout)
+
+    def plugin_options(self, platform: str) -> dict:
+        """Plugin options pre-built for the platform's partition"""
+        return self.pool_for(platform).plugin_options
+
+    def record_result(self, session: Streamlink, error: Optional[BaseException] = None):
+        """Record a request outcome on whichever partition owns the session"""
+        for pool in self.pools.values():
+            if pool.owns(session):
+                pool.record_result(session, error)
+                return
+
+    def return_session(self, session: Streamlink):
+        """Return a session to whichever partition handed it out"""
+        for pool in self.pools.values():
+            if pool.owns(session):
+                pool.return_session(session)
                 return
 
-            # Clear old sessions
-            while not self.sessions.empty():
-                try:
-                    self.sessions.get_nowait()
-                except queue.Empty:
-                    break
+    def shrink_idle(self) -> int:
+        return sum(pool.shrink_idle() for pool in self.pools.values())
+
+    def refresh_stale(self) -> bool:
+        """Replace at most one worn session per partition"""
+        return any([pool.refresh_stale() for pool in self.pools.values()])
 
-            # Create fresh sessions
-            self._create_sessions()
-            self.created_at = time.time()
+    def after_fork(self):
+        for pool in self.pools.values():
+            pool.after_fork()
+        http_adapter.reset()
 
     def size(self) -> int:
-        """Get current pool size"""
-        return self.sessions.qsize()
+        """Get number of idle sessions across partitions"""
+        return sum(pool.size() for pool in self.pools.values())
+
+    def get_stats(self) -> dict:
+        partitions = {name: pool.get_stats() for name, pool in self.pools.items()}
+        return {
+            "available_sessions": sum(
+                p["available_sessions"] for p in partitions.values()
+            ),
+            "in_use": sum(p["in_use"] for p in partitions.values()),
+            "pool_size": sum(p["pool_size"] for p in partitions.values()),
+            "partitions": partitions,
+        }
 
 
 # Global session pool instance
-session_pool = StreamlinkSessionPool()
+session_pool = PartitionedSessionPool()
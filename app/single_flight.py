@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from app.cache import cache
+from app.exceptions import StreamlinkAPIException
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# How long a leader's outcome stays readable for workers polling for it
+OUTCOME_TTL = 5
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent work for the same key.
+
+    The first caller for a key starts the work; callers arriving while it is
+    in flight await the same task instead of resolving the URL again. Keys
+    are the cache keys the work populates ("status:<url>", "resolve:<url>").
+
+    With ``distributed`` enabled, the leader also takes a "lock:<key>" entry
+    in the cache backend, and before releasing it publishes its outcome --
+    the result, or the API error it raised -- as "flight:<key>". A worker
+    process that finds the lock held polls the cache for the key's result
+    or that outcome (so errors and results too short-lived to cache are
+    shared as well), and only runs the work itself if the lock goes away
+    without either or isn't released within ``lock_ttl``.
+    """
+
+    def __init__(
+        self,
+        distributed: Optional[bool] = None,
+        lock_ttl: Optional[float] = None,
+        poll_interval: float = 0.1,
+    ):
+        self.distributed = (
+            config.SINGLE_FLIGHT_DISTRIBUTED if distributed is None else distributed
+        )
+        self.lock_ttl = config.SINGLE_FLIGHT_LOCK_TTL if lock_ttl is None else lock_ttl
+        self.poll_interval = poll_interval
+        self._calls: dict[str, asyncio.Task] = {}
+        self._leaders = 0
+        self._coalesced = 0
+        self._remote_waits = 0
+        self._remote_hits = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``func()``, sharing one in-flight call among concurrent callers"""
+        task = self._calls.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._lead(key, func))
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self._leaders += 1
+        else:
+            self._coalesced += 1
+        # A cancelled caller must not cancel the work the others are awaiting
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: str) -> bool:
+        """Whether work for the key is currently running in this process"""
+        return key in self._calls
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            task.exception()
+
+    async def _lead(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.distributed:
+            return await func()
+
+        lock_key = f"lock:{key}"
+        owned = cache.add(lock_key, os.getpid(), ttl=self.lock_ttl)
+        if not owned:
+            result = await self._wait_for_remote(key, lock_key)
+            if result is not None:
+                return result
+            owned = cache.add(lock_key, os.getpid(), ttl=self.lock_ttl)
+        try:
+            result = await func()
+        except StreamlinkAPIException as e:
+            if owned:
+                cache.set(
+                    f"flight:{key}",
+                    {
+                        "__error__": {
+                            "status_code": e.status_code,
+                            "detail": e.detail,
+                            "headers": e.headers,
+                            "error_type": e.error_type,
+                        }
+                    },
+                    ttl=OUTCOME_TTL,
+                )
+            raise
+        else:
+            if owned and result is not None:
+                cache.set(f"flight:{key}", result, ttl=OUTCOME_TTL)
+            return result
+        finally:
+            if owned:
+                cache.delete(lock_key)
+
+    async def _wait_for_remote(self, key: str, lock_key: str) -> Any:
+        """Wait for another worker holding the lock to cache or publish its outcome"""
+        self._remote_waits += 1
+        deadline = time.monotonic() + self.lock_ttl
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            result = cache.get(key)
+            if result is None:
+                result = cache.get(f"flight:{key}")
+            if result is not None:
+                self._remote_hits += 1
+                error = result.get("__error__") if isinstance(result, dict) else None
+                if error:
+                    raise StreamlinkAPIException(**error)
+                return result
+            if cache.get(lock_key) is None:
+                break
+        logger.debug("No result from lock holder for %s, resolving locally", key)
+        return None
+
+    def get_stats(self) -> dict:
+        return {
+            "distributed": self.distributed,
+            "in_flight": len(self._calls),
+            "leaders": self._leaders,
+            "coalesced": self._coalesced,
+            "remote_waits": self._remote_waits,
+            "remote_hits": self._remote_hits,
+        }
+
+
+# Global coalescer for status and resolve work
+single_flight = SingleFlight()
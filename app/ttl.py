@@ -0,0 +1,116 @@
+import json
+import re
+import time
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlparse
+
+from config import config
+
+# Query parameters carrying a Unix expiry timestamp (YouTube/Google, CDNs)
+EXPIRY_PARAMS = ("expire", "expires", "exp")
+
+# Google video hosts put parameters in the path: /expire/1700000000/
+_re_path_expiry = re.compile(r"/expires?/(\d{9,11})(?:/|$)")
+
+
+def _timestamp(value) -> Optional[float]:
+    try:
+        ts = float(value)
+    except (TypeError, ValueError):
+        return None
+    # Only plausible Unix timestamps, not durations or millisecond values
+    return ts if 1e9 <= ts < 1e11 else None
+
+
+def url_expiry(url: str) -> Optional[float]:
+    """The Unix time at which a signed playback URL stops working, if it says"""
+    parsed = urlparse(url)
+    expiries = []
+
+    match = _re_path_expiry.search(parsed.path)
+    if match:
+        expiries.append(_timestamp(match[1]))
+
+    for key, value in parse_qsl(parsed.query):
+        key = key.lower()
+        if key in EXPIRY_PARAMS:
+            expiries.append(_timestamp(value))
+        elif key == "token" and value.startswith("{"):
+            # Twitch usher playlists carry the access token's JSON, incl. expires
+            try:
+                token = json.loads(value)
+            except ValueError:
+                continue
+            if isinstance(token, dict):
+                expiries.append(_timestamp(token.get("expires")))
+
+    expiries = [ts for ts in expiries if ts is not None]
+    return min(expiries) if expiries else None
+
+
+def playback_ttl(urls: Iterable[str], now: Optional[float] = None) -> tuple[int, int]:
+    """
+    Cache TTL and stale TTL for a resolution returning these playback URLs.
+
+    Without any embedded expiry this is RESOLVE_TTL with RESOLVE_STALE_TTL.
+    Otherwise the entry lives until PLAYBACK_EXPIRY_MARGIN seconds before
+    the earliest expiry, capped at RESOLVE_MAX_TTL, and is never served
+    stale past that point. (0, 0) means the URLs are too close to expiry to
+    be cached at all.
+    """
+    now = time.time() if now is None else now
+    expiries = [ts for ts in map(url_expiry, urls) if ts is not None]
+    if not expiries:
+        return config.RESOLVE_TTL, int(config.RESOLVE_STALE_TTL)
+
+    lifetime = int(min(expiries) - now - config.PLAYBACK_EXPIRY_MARGIN)
+    if lifetime < 1:
+        return 0, 0
+    ttl = min(lifetime, config.RESOLVE_MAX_TTL)
+    stale_ttl = min(int(config.RESOLVE_STALE_TTL), lifetime - ttl)
+    return ttl, stale_ttl
+
+
+def record_status(history: Optional[dict], state: str, now: float) -> dict:
+    """
+    Fold a fresh online/offline observation into a channel's history.
+
+    The history keeps the current state, when it started, when the channel
+    was first seen, and an exponentially weighted average of how long the
+    channel stays in one state, so recent behaviour counts the most.
+    """
+    if not history:
+        return {"state": state, "since": now, "first_seen": now, "avg_interval": None}
+    if history["state"] == state:
+        return history
+
+    interval = now - history["since"]
+    avg = history["avg_interval"]
+    return {
+        **history,
+        "state": state,
+        "since": now,
+        "avg_interval": interval if avg is None else 0.7 * avg + 0.3 * interval,
+    }
+
+
+def status_ttl(history: dict, now: float) -> int:
+    """
+    Status TTL from a channel's observed stability.
+
+    A channel is expected to hold its state about as long as it usually
+    does (or, before its first flip, as long as it has been observed), and
+    a state it only just entered is the most likely to flip again soon
+    (streams that drop and restart, or go live right after ending). The
+    TTL is STATUS_TTL_SCALE of the smaller of the two, within
+    STATUS_TTL_MIN and STATUS_TTL_MAX. Until the channel has flipped at
+    least once there is no real history to go on, so the TTL never drops
+    below the default STATUS_TTL.
+    """
+    expected = history["avg_interval"]
+    floor = config.STATUS_TTL_MIN
+    if expected is None:
+        expected = now - history["first_seen"]
+        floor = max(floor, config.STATUS_TTL)
+    ttl = config.STATUS_TTL_SCALE * min(expected, now - history["since"])
+    return int(min(config.STATUS_TTL_MAX, max(floor, ttl)))
@@ -1,4 +1,13 @@
-from urllib.parse import urlparse
+import re
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from streamlink.utils.url import update_scheme
+
+# Query parameters that only track where a link was shared from
+TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "si", "feature", "ref", "ref_src"}
+
+_re_youtube_id = re.compile(r"^[\w-]{11}$")
+_re_single_segment = re.compile(r"^/[^/]+$")
 
 
 def extract_platform_from_url(url: str) -> str:
@@ -101,3 +110,102 @@ def get_stream_types_from_streams(streams: dict) -> list:
         else:
             stream_types.add(stream_type.upper())
     return sorted(list(stream_types))
+
+
+def get_manifest_urls_from_streams(streams: dict) -> list:
+    """
+    Multivariant playlist URLs behind streamlink streams.
+
+    These can carry a signed expiry of their own that the variant URLs
+    lack, e.g. the access token on Twitch's usher playlist.
+    """
+    manifest_urls = set()
+    for stream in streams.values():
+        # HLS streams keep the playlist they were parsed from
+        manifest_url = getattr(getattr(stream, "multivariant", None), "uri", None)
+        if isinstance(manifest_url, str):
+            manifest_urls.add(manifest_url)
+    return sorted(manifest_urls)
+
+
+def _strip_host_prefix(host: str) -> str:
+    for prefix in ("www.", "m.", "mobile."):
+        if host.startswith(prefix):
+            return host[len(prefix) :]
+    return host
+
+
+def _clean_query(query: str) -> str:
+    params = [
+        (key, value)
+        for key, value in parse_qsl(query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ]
+    return urlencode(sorted(params))
+
+
+def _canonical_twitch(host: str, path: str, query: str) -> tuple[str, str, str]:
+    if host in ("twitch.tv", "go.twitch.tv"):
+        host = "www.twitch.tv"
+    path = path.rstrip("/")
+    if host == "www.twitch.tv" and _re_single_segment.match(path):
+        # Channel names are case-insensitive, and channel pages take no query
+        return host, path.lower(), ""
+    return host, path, query
+
+
+def _canonical_youtube(host: str, path: str, query: str) -> tuple[str, str, str]:
+    video_id = None
+    if host == "youtu.be":
+        video_id = path.strip("/")
+    elif path == "/watch":
+        video_id = dict(parse_qsl(query)).get("v", "")
+    elif path.startswith("/live/"):
+        video_id = path[len("/live/") :].strip("/")
+
+    if video_id is not None and _re_youtube_id.match(video_id):
+        # Timestamps, playlists and share IDs don't change what's resolved
+        return "www.youtube.com", "/watch", urlencode({"v": video_id})
+    if host == "youtube.com":
+        host = "www.youtube.com"
+    return host, path.rstrip("/"), query
+
+
+def _canonical_kick(host: str, path: str, query: str) -> tuple[str, str, str]:
+    path = path.rstrip("/")
+    if host == "kick.com" and _re_single_segment.match(path):
+        return host, path.lower(), ""
+    return host, path, query
+
+
+# Per-platform rules on top of the generic normalization
+PLATFORM_CANONICALIZERS = {
+    "twitch": _canonical_twitch,
+    "youtube": _canonical_youtube,
+    "kick": _canonical_kick,
+}
+
+
+def canonical_url(url: str) -> str:
+    """
+    One form per stream URL, so equivalent URLs share a cache entry.
+
+    Lowercases the host, forces https (adding it to scheme-less URLs such
+    as raw stored ones), drops fragments and tracking parameters and sorts
+    the rest. Twitch, YouTube and Kick also get their mobile/short hosts
+    and channel-name casing folded into one form. Paths of other platforms
+    are left alone, as they may be case-sensitive. The result is still a
+    resolvable URL: it is what the services resolve.
+    """
+    url = update_scheme("https://", url, force=False)
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    path = parsed.path
+    query = _clean_query(parsed.query)
+
+    platform = extract_platform_from_url(url)
+    canonicalize = PLATFORM_CANONICALIZERS.get(platform)
+    if canonicalize:
+        host, path, query = canonicalize(_strip_host_prefix(host), path, query)
+
+    return urlunparse(("https", host, path, "", query, ""))
@@ -59,13 +59,15 @@ def validate_url(url: str) -> str:
     return url
 
 
-def validate_batch_request(urls: list) -> list:
+def validate_batch_request(urls: list, max_urls: int = 20) -> list:
     """Validate batch request URLs"""
     if not urls:
         raise HTTPException(status_code=400, detail="URLs list cannot be empty")
 
-    if len(urls) > 20:
-        raise HTTPException(status_code=400, detail="Maximum 20 URLs per batch")
+    if len(urls) > max_urls:
+        raise HTTPException(
+            status_code=400, detail=f"Maximum {max_urls} URLs per batch"
+        )
 
     validated_urls = []
     for i, url in enumerate(urls):
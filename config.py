@@ -1,10 +1,21 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 
+def _platform_map(name: str, default: str = "") -> dict:
+    """Read a "platform=value,platform=value" environment variable into a dict"""
+    result = {}
+    for item in os.getenv(name, default).split(","):
+        platform, sep, value = item.partition("=")
+        if sep and platform.strip():
+            result[platform.strip().lower()] = value.strip()
+    return result
+
+
 class Config:
     ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 
@@ -16,6 +27,142 @@ class Config:
         "TWITCH_OAUTH_TOKEN", ""
     )  # For ad-free streams (Twitch Turbo)
 
+    # Streamlink session pool sizing (shared partition for unlisted platforms)
+    SESSION_POOL_MIN_SIZE = int(os.getenv("SESSION_POOL_MIN_SIZE", 1))
+    SESSION_POOL_MAX_SIZE = int(os.getenv("SESSION_POOL_MAX_SIZE", 4))
+    # Dedicated per-platform partitions as "platform=min:max"
+    SESSION_POOL_PLATFORM_SIZES = _platform_map(
+        "SESSION_POOL_PLATFORM_SIZES", "twitch=1:6,youtube=1:4,kick=1:4"
+    )
+    SESSION_POOL_IDLE_TIMEOUT = float(os.getenv("SESSION_POOL_IDLE_TIMEOUT", 300))
+    SESSION_POOL_ACQUIRE_TIMEOUT = float(os.getenv("SESSION_POOL_ACQUIRE_TIMEOUT", 30))
+    # Pooled sessions are replaced in the background once this old or this used
+    SESSION_REFRESH_INTERVAL = float(os.getenv("SESSION_REFRESH_INTERVAL", 3600))
+    SESSION_MAX_USES = int(os.getenv("SESSION_MAX_USES", 500))
+    # Sessions are recycled on return after this many failures in a row,
+    # or once their cookie jar holds more than this many bytes
+    SESSION_MAX_FAILURES = int(os.getenv("SESSION_MAX_FAILURES", 3))
+    SESSION_MAX_COOKIE_BYTES = int(os.getenv("SESSION_MAX_COOKIE_BYTES", 65536))
+
+    # Outbound HTTP connection pool shared by all pooled Streamlink sessions
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 20))  # hosts
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 32))  # per host
+    HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+    HTTP_KEEPALIVE_IDLE = int(os.getenv("HTTP_KEEPALIVE_IDLE", 60))
+
+    # Threads dedicated to blocking Streamlink resolutions (I/O bound)
+    RESOLVER_THREADS = int(os.getenv("RESOLVER_THREADS", 32))
+    # Where blocking resolutions run: "thread" (default) or "process", which
+    # moves plugin parsing into worker processes with their own session pools
+    RESOLVER_BACKEND = os.getenv("RESOLVER_BACKEND", "thread").lower()
+    RESOLVER_PROCESSES = int(os.getenv("RESOLVER_PROCESSES", os.cpu_count() or 2))
+
+    # End-to-end deadlines (seconds) per endpoint, with per-platform overrides
+    # as "platform=seconds"; work past the deadline is abandoned
+    STATUS_DEADLINE = float(os.getenv("STATUS_DEADLINE", 10))
+    RESOLVE_DEADLINE = float(os.getenv("RESOLVE_DEADLINE", 20))
+    STATUS_DEADLINES = _platform_map("STATUS_DEADLINES")
+    RESOLVE_DEADLINES = _platform_map("RESOLVE_DEADLINES")
+
+    # Per-platform circuit breakers: after CIRCUIT_FAILURE_THRESHOLD
+    # consecutive failures a platform's requests fail fast with its last
+    # error, and one trial request is let through every CIRCUIT_RESET_TIMEOUT
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", 30))
+
+    # Per-platform bulkheads: at most BULKHEAD_LIMIT resolutions of one
+    # platform run at once (overridable as "platform=limit"), at most
+    # BULKHEAD_MAX_QUEUE more wait, and the rest are rejected as busy
+    BULKHEAD_LIMIT = int(os.getenv("BULKHEAD_LIMIT", 8))
+    BULKHEAD_LIMITS = _platform_map("BULKHEAD_LIMITS")
+    BULKHEAD_MAX_QUEUE = int(os.getenv("BULKHEAD_MAX_QUEUE", 32))
+
+    # Hedged resolutions: one still running after the platform's observed
+    # HEDGE_PERCENTILE latency gets a second attempt on another session, and
+    # the first success wins. Hedges stay within HEDGE_BUDGET of requests.
+    HEDGING = os.getenv("HEDGING", "false").lower() == "true"
+    HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", 95))
+    HEDGE_BUDGET = float(os.getenv("HEDGE_BUDGET", 0.05))
+    # Latencies kept per platform, and how many are needed before hedging
+    HEDGE_WINDOW = int(os.getenv("HEDGE_WINDOW", 200))
+    HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", 20))
+
+    # Status checks try a cheap per-platform liveness probe before a full
+    # Streamlink resolution; a platform's probe is skipped for PROBE_COOLDOWN
+    # after PROBE_ERROR_THRESHOLD errors in a row that suggest it is broken
+    # (not a missing channel or a single slow request)
+    STATUS_PROBES = os.getenv("STATUS_PROBES", "true").lower() == "true"
+    PROBE_TIMEOUT = float(os.getenv("PROBE_TIMEOUT", 10))
+    PROBE_COOLDOWN = float(os.getenv("PROBE_COOLDOWN", 600))
+    PROBE_ERROR_THRESHOLD = int(os.getenv("PROBE_ERROR_THRESHOLD", 3))
+
+    # Stale-while-revalidate: how long past their TTL cached results may still
+    # be served (marked stale) while one background refresh updates them
+    STATUS_STALE_TTL = float(os.getenv("STATUS_STALE_TTL", 180))
+    RESOLVE_STALE_TTL = float(os.getenv("RESOLVE_STALE_TTL", 120))
+
+    # Status TTLs adapt to each channel's observed state changes, within
+    # STATUS_TTL_MIN..STATUS_TTL_MAX; STATUS_TTL applies to unseen channels
+    # and is the minimum until a channel has changed state once.
+    # Per-channel histories expire after STATUS_HISTORY_TTL.
+    STATUS_TTL = int(os.getenv("STATUS_TTL", 120))
+    STATUS_TTL_MIN = int(os.getenv("STATUS_TTL_MIN", 30))
+    STATUS_TTL_MAX = int(os.getenv("STATUS_TTL_MAX", 600))
+    STATUS_TTL_SCALE = float(os.getenv("STATUS_TTL_SCALE", 0.05))
+    STATUS_HISTORY_TTL = int(os.getenv("STATUS_HISTORY_TTL", 7 * 24 * 3600))
+
+    # Online resolutions are cached until shortly before the earliest expiry
+    # embedded in their signed playback URLs, up to RESOLVE_MAX_TTL; URLs
+    # without an expiry are cached for RESOLVE_TTL
+    RESOLVE_TTL = int(os.getenv("RESOLVE_TTL", 300))
+    RESOLVE_MAX_TTL = int(os.getenv("RESOLVE_MAX_TTL", 3600))
+    PLAYBACK_EXPIRY_MARGIN = int(os.getenv("PLAYBACK_EXPIRY_MARGIN", 60))
+
+    # Failed resolutions are cached by error class: permanent failures (no
+    # plugin for the URL, browser required) for long, anything else briefly.
+    # Browser-required failures on NEGATIVE_CACHE_PLATFORM_WIDE platforms
+    # (anti-bot protection in front of the whole site) apply to every URL.
+    NEGATIVE_CACHE_PERMANENT_TTL = int(os.getenv("NEGATIVE_CACHE_PERMANENT_TTL", 3600))
+    NEGATIVE_CACHE_TRANSIENT_TTL = int(os.getenv("NEGATIVE_CACHE_TRANSIENT_TTL", 30))
+    NEGATIVE_CACHE_PLATFORM_WIDE = [
+        p.strip().lower()
+        for p in os.getenv("NEGATIVE_CACHE_PLATFORM_WIDE", "kick").split(",")
+        if p.strip()
+    ]
+
+    # Bulk status jobs: up to STATUS_JOB_MAX_URLS URLs per job, checked
+    # STATUS_JOB_CHUNK_SIZE at a time; progress and results are kept in the
+    # cache backend for STATUS_JOB_TTL seconds
+    STATUS_JOB_MAX_URLS = int(os.getenv("STATUS_JOB_MAX_URLS", 5000))
+    STATUS_JOB_CHUNK_SIZE = int(os.getenv("STATUS_JOB_CHUNK_SIZE", 20))
+    STATUS_JOB_TTL = int(os.getenv("STATUS_JOB_TTL", 3600))
+    # How often a job's result stream polls the cache for new chunks
+    STATUS_JOB_POLL_INTERVAL = float(os.getenv("STATUS_JOB_POLL_INTERVAL", 0.5))
+    # A running job renews its lease while it works; one whose lease lapsed
+    # (its worker died or restarted) is reported as failed. Each worker runs
+    # at most STATUS_JOB_MAX_RUNNING jobs at once and rejects more as busy.
+    STATUS_JOB_LEASE = float(os.getenv("STATUS_JOB_LEASE", 60))
+    STATUS_JOB_MAX_RUNNING = int(os.getenv("STATUS_JOB_MAX_RUNNING", 4))
+
+    # WebSocket status subscriptions: each subscribed URL is re-checked every
+    # SUBSCRIPTION_CHECK_INTERVAL seconds, once for all its subscribers; a
+    # connection may watch up to SUBSCRIPTION_MAX_URLS URLs
+    SUBSCRIPTION_CHECK_INTERVAL = float(os.getenv("SUBSCRIPTION_CHECK_INTERVAL", 60))
+    SUBSCRIPTION_MAX_URLS = int(os.getenv("SUBSCRIPTION_MAX_URLS", 500))
+
+    # Coalesce concurrent resolutions of the same URL across workers too,
+    # using a lock key in the (Redis) cache; in-process coalescing is always on
+    SINGLE_FLIGHT_DISTRIBUTED = (
+        os.getenv("SINGLE_FLIGHT_DISTRIBUTED", "false").lower() == "true"
+    )
+    SINGLE_FLIGHT_LOCK_TTL = float(os.getenv("SINGLE_FLIGHT_LOCK_TTL", 30))
+
+    # Persisted host -> Streamlink plugin index (empty to keep it in memory only)
+    PLUGIN_INDEX_PATH = os.getenv(
+        "PLUGIN_INDEX_PATH",
+        os.path.join(tempfile.gettempdir(), "streamlink-api-plugin-index.json"),
+    )
+
     # Redis configuration
     REDIS_URL = os.getenv("REDIS_URL", "")
     REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
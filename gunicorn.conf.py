@@ -0,0 +1,34 @@
+"""
+Gunicorn configuration for the Streamlink API.
+
+With preload enabled the master imports the app once -- streamlink, its
+plugin registry and the template session pool -- before forking, so each
+worker starts warm and shares those pages copy-on-write.
+"""
+
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+worker_class = "asgi"
+
+# Build Streamlink state in the master and fork it into the workers
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    # Move everything imported so far into the permanent generation, so the
+    # workers' garbage collector doesn't dirty (and un-share) those pages
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    from app.session_pool import session_pool
+
+    session_pool.after_fork()
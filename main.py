@@ -6,6 +6,9 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app.routers import streams
 from app.middleware import APIKeyMiddleware, CustomRateLimitMiddleware
 from app.services.liveness_worker import check_community_liveness
+from app.executor import resolution_executor
+from app.process_pool import resolver_processes
+from app.session_pool import session_pool
 from config import config
 
 # Configure logging
@@ -29,8 +32,21 @@ async def lifespan(app: FastAPI):
     scheduler.add_job(
         check_community_liveness, "interval", hours=1, id="community_liveness"
     )
+    scheduler.add_job(
+        session_pool.shrink_idle, "interval", minutes=1, id="session_pool_shrink"
+    )
+    scheduler.add_job(
+        session_pool.refresh_stale,
+        "interval",
+        seconds=30,
+        id="session_pool_refresh",
+    )
     scheduler.start()
 
+    if resolver_processes.enabled:
+        logging.info("Starting %d resolver processes...", resolver_processes.processes)
+        resolver_processes.start()
+
     # Optionally trigger an initial check on startup
     # scheduler.add_job(check_community_liveness, id="initial_check")
 
@@ -39,6 +55,8 @@ async def lifespan(app: FastAPI):
     # Shutdown: Stop the scheduler
     logging.info("Shutting down background scheduler...")
     scheduler.shutdown()
+    resolver_processes.shutdown()
+    resolution_executor.shutdown()
 
 
 app = FastAPI(title="Streamlink API", version="1.0.0", lifespan=lifespan)
@@ -105,14 +123,27 @@ def rate_limit_stats():
 @app.get("/session/stats")
 def session_stats():
     """Get session pool statistics"""
+    from app.bulkhead import bulkheads
+    from app.circuit_breaker import circuit_breakers
+    from app.hedging import hedger
+    from app.http_pool import http_adapter
+    from app.plugin_index import plugin_index
+    from app.services.probes import liveness_prober
+    from app.services.subscriptions import status_subscriptions
     from app.session_pool import session_pool
+    from app.single_flight import single_flight
 
     return {
-        "session_pool": {
-            "available_sessions": session_pool.size(),
-            "pool_size": session_pool.pool_size,
-            "created_at": session_pool.created_at,
-            "refresh_interval": session_pool.refresh_interval,
-        },
+        "session_pool": session_pool.get_stats(),
+        "plugin_index": plugin_index.get_stats(),
+        "http_pool": http_adapter.get_stats(),
+        "resolver_executor": resolution_executor.get_stats(),
+        "resolver_processes": resolver_processes.get_stats(),
+        "single_flight": single_flight.get_stats(),
+        "probes": liveness_prober.get_stats(),
+        "circuit_breakers": circuit_breakers.get_stats(),
+        "bulkheads": bulkheads.get_stats(),
+        "hedging": hedger.get_stats(),
+        "subscriptions": status_subscriptions.get_stats(),
         "service": "streamlink-api",
     }
@@ -22,6 +22,7 @@ TEST_API_KEY = "test-api-key-12345"
 os.environ.setdefault("API_KEY", TEST_API_KEY)
 os.environ.setdefault("REDIS_URL", "")
 os.environ.setdefault("REDIS_HOST", "localhost")
+os.environ.setdefault("PLUGIN_INDEX_PATH", "")
 
 
 # ---------------------------------------------------------------------------
@@ -40,6 +41,46 @@ def app():
         return _app
 
 
+@pytest.fixture(autouse=True)
+def plugin_index():
+    """Give every test a fresh, in-memory host -> plugin index."""
+    from app.plugin_index import PluginIndex
+
+    index = PluginIndex(path=None)
+    with patch("app.services.stream_service.plugin_index", index):
+        yield index
+
+
+@pytest.fixture(autouse=True)
+def liveness_prober():
+    """Disable liveness probes so status tests exercise the Streamlink path."""
+    from app.services.probes import LivenessProber
+
+    prober = LivenessProber(enabled=False)
+    with patch("app.services.stream_service.liveness_prober", prober):
+        yield prober
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers():
+    """Give every test closed circuit breakers, so failures don't leak between tests."""
+    from app.circuit_breaker import CircuitBreakers
+
+    breakers = CircuitBreakers()
+    with patch("app.services.stream_service.circuit_breakers", breakers):
+        yield breakers
+
+
+@pytest.fixture(autouse=True)
+def bulkheads():
+    """Give every test empty bulkheads, so slots don't leak between tests."""
+    from app.bulkhead import Bulkheads
+
+    heads = Bulkheads()
+    with patch("app.services.stream_service.bulkheads", heads):
+        yield heads
+
+
 @pytest.fixture()
 def client(app):
     """Return a synchronous TestClient for the FastAPI app."""
@@ -81,6 +122,12 @@ def mock_redis():
     def _setex(key, ttl, value):
         store[key] = (value, time.time() + ttl)
 
+    def _set(key, value, nx=False, ex=None):
+        if nx and _get(key) is not None:
+            return None
+        store[key] = (value, time.time() + ex if ex is not None else None)
+        return True
+
     def _delete(*keys):
         for k in keys:
             store.pop(k, None)
@@ -99,6 +146,7 @@ def mock_redis():
 
     redis_mock.get.side_effect = _get
     redis_mock.setex.side_effect = _setex
+    redis_mock.set.side_effect = _set
     redis_mock.delete.side_effect = _delete
     redis_mock.dbsize.side_effect = _dbsize
     redis_mock.flushdb.side_effect = _flushdb
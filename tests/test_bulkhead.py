@@ -0,0 +1,207 @@
+"""
+Tests for app/bulkhead.py
+
+Covers:
+- Bulkhead: concurrency limit, bounded queue, rejections, queue timeouts,
+  stats
+- Bulkheads: per-platform limits with a default
+- stream_service: full bulkheads answer as busy, a saturated platform
+  doesn't hold up another, waits for our own capacity that run out the
+  deadline are busy rather than platform timeouts
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from app.bulkhead import Bulkhead, BulkheadFull, Bulkheads
+from app.exceptions import ServiceBusyException
+
+
+async def _hold(bulkhead: Bulkhead, release: asyncio.Event, timeout=None):
+    async with bulkhead.slot(timeout):
+        await release.wait()
+
+
+class TestBulkhead:
+    """Tests for a single platform's bulkhead."""
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency_and_queues(self):
+        """Requests beyond the limit must wait for a slot."""
+        bulkhead = Bulkhead(limit=2, max_queue=5)
+
+        release = asyncio.Event()
+        tasks = [asyncio.ensure_future(_hold(bulkhead, release)) for _ in range(3)]
+        await asyncio.sleep(0)
+        stats = bulkhead.get_stats()
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert stats["active"] == 2
+        assert stats["queue_depth"] == 1
+        assert bulkhead.get_stats()["completed"] == 3
+        assert bulkhead.get_stats()["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self):
+        """A request finding the queue full must be rejected right away."""
+        bulkhead = Bulkhead(limit=1, max_queue=1)
+
+        release = asyncio.Event()
+        tasks = [asyncio.ensure_future(_hold(bulkhead, release)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(BulkheadFull):
+            async with bulkhead.slot():
+                pass
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert bulkhead.get_stats()["rejected"] == 1
+        assert bulkhead.get_stats()["peak_queue_depth"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_is_bounded(self):
+        """Waiting for a slot must give up after the timeout."""
+        bulkhead = Bulkhead(limit=1, max_queue=1)
+
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(_hold(bulkhead, release))
+        await asyncio.sleep(0)
+        with pytest.raises(BulkheadFull):
+            async with bulkhead.slot(timeout=0.01):
+                pass
+        release.set()
+        await holder
+
+        assert bulkhead.get_stats()["timeouts"] == 1
+        assert bulkhead.get_stats()["queue_depth"] == 0
+
+    def test_limits_per_platform(self):
+        """Configured platforms must get their own limit, others the default."""
+        heads = Bulkheads(limits={"youtube": "2"}, default_limit=6, max_queue=0)
+
+        assert heads.get("youtube").limit == 2
+        assert heads.get("twitch").limit == 6
+        assert heads.get("twitch") is heads.get("twitch")
+
+
+class TestStreamServiceBulkheads:
+    """Tests for the bulkheads around stream_service resolutions."""
+
+    @pytest_asyncio.fixture()
+    async def full_bulkheads(self, bulkheads):
+        """A twitch bulkhead with no slots and no queue room."""
+        bulkheads.max_queue = 0
+        bulkheads.limits = {"twitch": "1"}
+        bulkhead = bulkheads.get("twitch")
+        await bulkhead._semaphore.acquire()
+        return bulkheads
+
+    @pytest.mark.asyncio
+    async def test_full_bulkhead_status_is_busy(self, full_bulkheads):
+        """A status check finding the bulkhead full must report service_busy."""
+        from app.services import stream_service
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool") as pool,
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            result = await stream_service.check_single_stream(
+                "https://www.twitch.tv/foo"
+            )
+
+        assert result.status == "error"
+        assert result.error_details["type"] == "service_busy"
+        pool.get_session_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_full_bulkhead_resolve_is_busy(self, full_bulkheads):
+        """A resolution finding the bulkhead full must raise ServiceBusy."""
+        from app.services import stream_service
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool") as pool,
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            with pytest.raises(ServiceBusyException):
+                await stream_service.resolve_stream("https://www.twitch.tv/foo")
+
+        pool.get_session_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_saturated_platform_does_not_block_others(self, full_bulkheads):
+        """Another platform's checks must still run while twitch is full."""
+        from app.services import stream_service
+
+        session = MagicMock()
+        session.resolve_url.return_value = ("youtube", MagicMock(), "u")
+        pool = MagicMock()
+        pool.get_session_async = AsyncMock(return_value=session)
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool", pool),
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            await stream_service.check_single_stream(
+                "https://www.youtube.com/watch?v=abc"
+            )
+
+        pool.get_session_async.assert_called_once()
+        assert full_bulkheads.get("youtube").get_stats()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_is_busy_not_platform_failure(
+        self, bulkheads, circuit_breakers
+    ):
+        """Deadlines spent queueing for a slot must not open the breaker."""
+        from app.services import stream_service
+
+        bulkheads.limits = {"twitch": "1"}
+        await bulkheads.get("twitch")._semaphore.acquire()
+        circuit_breakers.failure_threshold = 1
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.dict(stream_service.config.STATUS_DEADLINES, {"twitch": "0.01"}),
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            results = [
+                await stream_service.check_single_stream(f"https://www.twitch.tv/c{i}")
+                for i in range(3)
+            ]
+
+        assert [r.error_details["type"] for r in results] == ["service_busy"] * 3
+        assert circuit_breakers.get("twitch").allow()
+        assert bulkheads.get("twitch").get_stats()["timeouts"] == 3
+
+    @pytest.mark.asyncio
+    async def test_session_wait_past_deadline_is_busy(self, circuit_breakers):
+        """Running out of time waiting for a pooled session must be service_busy."""
+        from app.services import stream_service
+        from app.session_pool import SessionPoolTimeout
+
+        pool = MagicMock()
+        pool.get_session_async = AsyncMock(side_effect=SessionPoolTimeout("empty"))
+        circuit_breakers.failure_threshold = 1
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool", pool),
+            patch.dict(stream_service.config.RESOLVE_DEADLINES, {"twitch": "0"}),
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            with pytest.raises(ServiceBusyException):
+                await stream_service.resolve_stream("https://www.twitch.tv/foo")
+
+        assert circuit_breakers.get("twitch").allow()
@@ -2,9 +2,9 @@
 Tests for app/cache.py
 
 Covers:
-- SimpleCache: get/set, TTL expiration, cache miss, delete, clear, size,
+- SimpleCache: get/set, add, stale-while-revalidate entries, TTL expiration, cache miss, delete, clear, size,
   get_stats
-- RedisCache: get/set, TTL, cache miss, delete, clear, size, get_stats,
+- RedisCache: get/set, add, stale entries, TTL, cache miss, delete, clear, size, get_stats,
   graceful error handling, serialization round-trips for dict and StreamStatus
 - _serialize / _deserialize helpers
 - _create_cache() factory: Redis path, fallback to SimpleCache
@@ -54,6 +54,36 @@ class TestSimpleCache:
         cache.set("fresh", "value", ttl=60)
         assert cache.get("fresh") == "value"
 
+    def test_stale_entry_served_by_get_entry_only(self, cache):
+        """Past ttl but within stale_ttl, get_entry() returns it as stale and get() misses."""
+        cache.set("key", "value", ttl=0.01, stale_ttl=60)
+        time.sleep(0.05)
+        assert cache.get("key") is None
+        assert cache.get_entry("key") == ("value", True)
+
+    def test_fresh_entry_is_not_stale(self, cache):
+        """get_entry() must report fresh entries as not stale."""
+        cache.set("key", "value", ttl=60, stale_ttl=60)
+        assert cache.get_entry("key") == ("value", False)
+
+    def test_entry_gone_after_stale_ttl(self, cache):
+        """Past ttl + stale_ttl the entry must be gone entirely."""
+        cache.set("key", "value", ttl=0.01, stale_ttl=0.01)
+        time.sleep(0.05)
+        assert cache.get_entry("key") == (None, False)
+
+    def test_add_only_stores_absent_keys(self, cache):
+        """add() must store a missing key and refuse an existing one."""
+        assert cache.add("lock", 1, ttl=60) is True
+        assert cache.add("lock", 2, ttl=60) is False
+        assert cache.get("lock") == 1
+
+    def test_add_replaces_expired_key(self, cache):
+        """add() must treat an expired entry as absent."""
+        cache.set("lock", 1, ttl=0.01)
+        time.sleep(0.05)
+        assert cache.add("lock", 2, ttl=60) is True
+
     def test_delete_removes_existing_key(self, cache):
         """delete() must remove a key so subsequent get() returns None."""
         cache.set("to_delete", "value")
@@ -220,6 +250,27 @@ class TestRedisCache:
         assert isinstance(result, StreamStatus)
         assert result.status == "online"
 
+    def test_stale_entry_kept_for_stale_ttl(self, redis_cache):
+        """Entries must live for ttl + stale_ttl and be reported stale after ttl."""
+        redis_cache.set("key", {"a": 1}, ttl=60, stale_ttl=120)
+        assert redis_cache._client.setex.call_args[0][1] == 180
+        assert redis_cache.get_entry("key") == ({"a": 1}, False)
+
+        with patch("app.cache.time.time", return_value=time.time() + 90):
+            assert redis_cache.get_entry("key") == ({"a": 1}, True)
+            assert redis_cache.get("key") is None
+
+    def test_add_only_stores_absent_keys(self, redis_cache):
+        """add() must use SET NX so an existing key is left untouched."""
+        assert redis_cache.add("lock", 1, ttl=30) is True
+        assert redis_cache.add("lock", 2, ttl=30) is False
+        assert redis_cache.get("lock") == 1
+
+    def test_add_handles_redis_exception_gracefully(self, redis_cache):
+        """If Redis raises during add(), False must be returned (no crash)."""
+        redis_cache._client.set.side_effect = Exception("connection lost")
+        assert redis_cache.add("lock", 1) is False
+
     def test_delete_removes_key(self, redis_cache):
         """delete() must remove the key so get() returns None."""
         redis_cache.set("to_delete", "value")
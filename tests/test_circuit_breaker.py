@@ -0,0 +1,240 @@
+"""
+Tests for app/circuit_breaker.py
+
+Covers:
+- CircuitBreaker: opening after consecutive failures, success resets,
+  half-open trials after the reset timeout, neutral releases, stats
+- CircuitBreakers: one breaker per platform
+- stream_service: open breakers fail fast on both endpoints without taking
+  a session with a generic "platform unavailable" answer, only platform
+  failures count (per-URL plugin errors never open the breaker)
+"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from streamlink.exceptions import NoPluginError, PluginError
+
+from app.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakers
+from app.exceptions import PlatformUnavailableException
+from app.models import StreamStatus
+
+TWITCH_URL = "https://www.twitch.tv/testchannel"
+
+
+def _failure(error="Plugin error: boom"):
+    return StreamStatus(
+        url=TWITCH_URL,
+        status="error",
+        error=error,
+        platform="twitch",
+        error_details={"type": "plugin_error", "message": "boom"},
+    )
+
+
+class TestCircuitBreaker:
+    """Tests for a single platform's breaker."""
+
+    def test_opens_after_threshold(self):
+        """Consecutive failures up to the threshold must open the breaker."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        for _ in range(2):
+            breaker.record_failure(_failure())
+        assert breaker.allow() is True
+
+        breaker.record_failure(_failure())
+
+        assert breaker.state == OPEN
+        assert breaker.allow() is False
+        assert breaker.get_stats()["rejected"] == 1
+
+    def test_success_resets_failure_count(self):
+        """A success in between must restart the count."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure(_failure())
+        breaker.record_success()
+        breaker.record_failure(_failure())
+        assert breaker.state == CLOSED
+
+    def test_half_open_lets_one_trial_through(self):
+        """After the reset timeout exactly one request must be let through."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure(_failure())
+        time.sleep(0.02)
+
+        assert breaker.allow() is True
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow() is False
+
+    def test_trial_success_closes(self):
+        """A successful trial must close the breaker."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure(_failure())
+        time.sleep(0.02)
+        breaker.allow()
+
+        breaker.record_success()
+
+        assert breaker.state == CLOSED
+        assert breaker.allow() is True
+
+    def test_trial_failure_reopens(self):
+        """A failed trial must open the breaker for another reset timeout."""
+        breaker = CircuitBreaker(failure_threshold=5, reset_timeout=0.01)
+        for _ in range(5):
+            breaker.record_failure(_failure())
+        time.sleep(0.02)
+        breaker.allow()
+
+        breaker.record_failure(_failure("Plugin error: again"))
+
+        assert breaker.state == OPEN
+        assert breaker.get_stats()["opened"] == 2
+        assert breaker.get_stats()["last_error"] == "Plugin error: again"
+
+    def test_release_allows_another_trial(self):
+        """A trial that ends without a verdict must not block later trials."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure(_failure())
+        time.sleep(0.02)
+        breaker.allow()
+
+        breaker.release()
+
+        assert breaker.allow() is True
+
+    def test_breakers_are_per_platform(self):
+        """Each platform must get its own breaker."""
+        breakers = CircuitBreakers(failure_threshold=1)
+        breakers.get("kick").record_failure(_failure())
+
+        assert breakers.get("kick").state == OPEN
+        assert breakers.get("twitch").state == CLOSED
+        assert breakers.get("kick") is breakers.get("kick")
+
+
+class TestStreamServiceBreakers:
+    """Tests for the breakers around stream_service resolutions."""
+
+    @pytest.fixture()
+    def open_breakers(self, circuit_breakers):
+        circuit_breakers.failure_threshold = 1
+        circuit_breakers.reset_timeout = 60
+        circuit_breakers.get("twitch").record_failure(_failure())
+        return circuit_breakers
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_status_fast(self, open_breakers):
+        """An open breaker must answer status checks without a session."""
+        from app.services import stream_service
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool") as pool,
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            result = await stream_service.check_single_stream(TWITCH_URL + "2")
+
+        assert result.url == TWITCH_URL + "2"
+        assert result.error == "Twitch is temporarily unavailable"
+        assert "boom" not in result.error
+        assert result.error_details["type"] == "platform_unavailable"
+        assert result.error_details["circuit"] == "open"
+        assert result.error_details["retry_after"] > 0
+        pool.get_session_async.assert_not_called()
+        mock_cache.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_resolve_fast(self, open_breakers):
+        """An open breaker must raise a 503 with Retry-After on /resolve."""
+        from app.services import stream_service
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool") as pool,
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            with pytest.raises(PlatformUnavailableException) as exc_info:
+                await stream_service.resolve_stream(TWITCH_URL)
+
+        assert exc_info.value.status_code == 503
+        assert int(exc_info.value.headers["Retry-After"]) > 0
+        assert exc_info.value.detail["url"] == TWITCH_URL
+        pool.get_session_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_platform_failures_open_the_breaker(self, circuit_breakers):
+        """Repeated connection failures from status checks must open the breaker."""
+        from app.services import stream_service
+
+        circuit_breakers.failure_threshold = 2
+        session = MagicMock()
+        session.resolve_url.side_effect = PluginError(
+            "Unable to open URL: https://gql.twitch.tv/gql "
+            "(HTTPSConnectionPool(host='gql.twitch.tv', port=443): "
+            "Max retries exceeded)"
+        )
+        pool = MagicMock()
+        pool.get_session_async = AsyncMock(return_value=session)
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool", pool),
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            for channel in ("a", "b"):
+                await stream_service.check_single_stream(
+                    f"https://www.twitch.tv/{channel}"
+                )
+
+        assert circuit_breakers.get("twitch").state == OPEN
+
+    @pytest.mark.asyncio
+    async def test_url_errors_do_not_count(self, circuit_breakers):
+        """No-plugin errors are the URL's fault and must not open the breaker."""
+        from app.services import stream_service
+
+        circuit_breakers.failure_threshold = 1
+        session = MagicMock()
+        session.resolve_url.side_effect = NoPluginError()
+        pool = MagicMock()
+        pool.get_session_async = AsyncMock(return_value=session)
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool", pool),
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            await stream_service.check_single_stream(TWITCH_URL)
+
+        assert circuit_breakers.get("twitch").state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_per_url_plugin_errors_do_not_count(self, circuit_breakers):
+        """Repeated per-URL plugin errors must leave the breaker closed."""
+        from app.services import stream_service
+
+        circuit_breakers.failure_threshold = 2
+        session = MagicMock()
+        session.resolve_url.side_effect = PluginError("This video is private")
+        pool = MagicMock()
+        pool.get_session_async = AsyncMock(return_value=session)
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool", pool),
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            for channel in ("a", "b", "c"):
+                result = await stream_service.check_single_stream(
+                    f"https://www.twitch.tv/{channel}"
+                )
+
+        assert result.error_details["type"] == "plugin_error"
+        assert circuit_breakers.get("twitch").state == CLOSED
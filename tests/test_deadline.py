@@ -0,0 +1,53 @@
+"""
+Tests for app/deadline.py
+
+Covers:
+- Deadline.for_request(): per-endpoint defaults, per-platform overrides
+- remaining() / http_timeout(): countdown and the HTTP timeout floor
+"""
+
+import time
+from unittest.mock import patch
+
+from app.deadline import MIN_HTTP_TIMEOUT, Deadline
+
+
+class TestDeadlineForRequest:
+    """Tests for building a request's budget from config."""
+
+    def test_endpoint_defaults(self):
+        """Each endpoint must use its own default budget."""
+        with patch("app.deadline.config") as mock_config:
+            mock_config.STATUS_DEADLINE = 10
+            mock_config.RESOLVE_DEADLINE = 20
+            mock_config.STATUS_DEADLINES = {}
+            mock_config.RESOLVE_DEADLINES = {}
+
+            assert Deadline.for_request("status", "twitch").seconds == 10
+            assert Deadline.for_request("resolve", "twitch").seconds == 20
+
+    def test_platform_override(self):
+        """A per-platform override must replace the endpoint default."""
+        with patch("app.deadline.config") as mock_config:
+            mock_config.STATUS_DEADLINE = 10
+            mock_config.STATUS_DEADLINES = {"youtube": "4", "kick": "soon"}
+
+            assert Deadline.for_request("status", "youtube").seconds == 4.0
+            assert Deadline.for_request("status", "kick").seconds == 10
+            assert Deadline.for_request("status", "twitch").seconds == 10
+
+
+class TestDeadlineCountdown:
+    """Tests for the remaining budget."""
+
+    def test_remaining_counts_down_to_zero(self):
+        """remaining() must shrink over time and never go negative."""
+        deadline = Deadline(0.05)
+        assert 0 < deadline.remaining() <= 0.05
+        time.sleep(0.06)
+        assert deadline.remaining() == 0.0
+
+    def test_http_timeout_has_a_floor(self):
+        """An exhausted budget must still give Streamlink a usable timeout."""
+        assert Deadline(0).http_timeout() == MIN_HTTP_TIMEOUT
+        assert Deadline(5).http_timeout() > 4
@@ -0,0 +1,75 @@
+"""
+Tests for app/executor.py
+
+Covers:
+- ResolutionExecutor.run(): results, exceptions, dedicated worker threads
+- Queue depth, active workers and wait-time stats under saturation
+- shutdown() and lazy re-creation
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.executor import ResolutionExecutor
+
+
+class TestResolutionExecutor:
+    """Tests for running callables on the resolver pool."""
+
+    @pytest.mark.asyncio
+    async def test_returns_result(self):
+        """run() must return the callable's result."""
+        executor = ResolutionExecutor(max_workers=2)
+        assert await executor.run(lambda a, b=0: a + b, 1, b=2) == 3
+        assert executor.get_stats()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_propagates_exceptions(self):
+        """Exceptions from the callable must be raised to the awaiting caller."""
+        executor = ResolutionExecutor(max_workers=1)
+
+        def boom():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await executor.run(boom)
+        assert executor.get_stats()["active_workers"] == 0
+
+    @pytest.mark.asyncio
+    async def test_runs_on_dedicated_threads(self):
+        """Work must run on the resolver pool, not the loop's default executor."""
+        executor = ResolutionExecutor(max_workers=1)
+        name = await executor.run(lambda: threading.current_thread().name)
+        assert name.startswith("resolver")
+
+    @pytest.mark.asyncio
+    async def test_reports_queue_depth_when_saturated(self):
+        """Calls beyond max_workers must be counted as queued."""
+        executor = ResolutionExecutor(max_workers=1)
+        release = threading.Event()
+
+        tasks = [asyncio.ensure_future(executor.run(release.wait, 2)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        stats = executor.get_stats()
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert stats["active_workers"] == 1
+        assert stats["queue_depth"] == 2
+        assert stats["saturated"] is True
+        final = executor.get_stats()
+        assert final["queue_depth"] == 0
+        assert final["peak_queue_depth"] >= 2
+        assert final["max_wait_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_shutdown_recreates_pool_lazily(self):
+        """After shutdown(), the next run() must get a fresh pool."""
+        executor = ResolutionExecutor(max_workers=1)
+        await executor.run(lambda: None)
+
+        executor.shutdown()
+
+        assert await executor.run(lambda: "ok") == "ok"
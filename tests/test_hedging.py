@@ -0,0 +1,162 @@
+"""
+Tests for app/hedging.py
+
+Covers:
+- Hedger: pass-through when disabled or without enough samples, hedging
+  after the observed percentile, first success wins, failures, budget
+- stream_service: a hung status check is hedged onto another session
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.hedging import Hedger
+
+
+def _warm(hedger: Hedger, key: str = "status:twitch", seconds: float = 0.01):
+    """Give the hedger enough samples for a hedge delay of ``seconds``."""
+    for _ in range(hedger.min_samples):
+        hedger._record(key, seconds)
+
+
+def _attempts(*behaviours):
+    """An attempt function whose n-th call sleeps, then returns or raises."""
+    calls = []
+
+    async def attempt():
+        delay, outcome = behaviours[len(calls)]
+        calls.append(delay)
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return attempt, calls
+
+
+class TestHedger:
+    """Tests for hedging decisions."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_runs_once(self):
+        """A disabled hedger must just await the attempt."""
+        hedger = Hedger(enabled=False, budget=1)
+        attempt, calls = _attempts((0.05, "primary"), (0, "hedge"))
+
+        assert await hedger.run("status", "twitch", attempt) == "primary"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_samples(self):
+        """Without enough latency samples there must be no hedge delay."""
+        hedger = Hedger(enabled=True, budget=1, min_samples=5)
+        attempt, calls = _attempts((0.05, "primary"), (0, "hedge"))
+
+        assert await hedger.run("status", "twitch", attempt) == "primary"
+        assert len(calls) == 1
+        assert hedger.delay("status:twitch") is None
+
+    @pytest.mark.asyncio
+    async def test_slow_attempt_is_hedged(self):
+        """An attempt running past the percentile must get a hedge that wins."""
+        hedger = Hedger(enabled=True, budget=1, min_samples=5)
+        _warm(hedger)
+        attempt, calls = _attempts((1, "primary"), (0, "hedge"))
+
+        started = time.monotonic()
+        assert await hedger.run("status", "twitch", attempt) == "hedge"
+
+        assert time.monotonic() - started < 0.5
+        assert len(calls) == 2
+        stats = hedger.get_stats()["endpoints"]["status:twitch"]
+        assert stats["hedged"] == 1
+        assert stats["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fast_attempt_is_not_hedged(self):
+        """An attempt finishing within the percentile must run alone."""
+        hedger = Hedger(enabled=True, budget=1, min_samples=5)
+        _warm(hedger, seconds=0.5)
+        attempt, calls = _attempts((0, "primary"), (0, "hedge"))
+
+        assert await hedger.run("status", "twitch", attempt) == "primary"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_falls_back_to_primary(self):
+        """A hedge that fails must not beat a primary that succeeds later."""
+        hedger = Hedger(enabled=True, budget=1, min_samples=5)
+        _warm(hedger)
+        attempt, _ = _attempts((0.1, "primary"), (0, RuntimeError("no session")))
+
+        assert await hedger.run("status", "twitch", attempt) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_all_attempts_failing_raises_primary_error(self):
+        """If both attempts fail, the primary's exception must be raised."""
+        hedger = Hedger(enabled=True, budget=1, min_samples=5)
+        _warm(hedger)
+        attempt, _ = _attempts((0.1, ValueError("primary")), (0, RuntimeError("hedge")))
+
+        with pytest.raises(ValueError, match="primary"):
+            await hedger.run("status", "twitch", attempt)
+
+    @pytest.mark.asyncio
+    async def test_budget_limits_hedges(self):
+        """Hedges must stay within the budget's share of requests."""
+        hedger = Hedger(enabled=True, budget=0.5, min_samples=40)
+        _warm(hedger)
+        hedged = 0
+        for _ in range(4):
+            attempt, calls = _attempts((0.1, "primary"), (0, "hedge"))
+            await hedger.run("status", "twitch", attempt)
+            hedged += len(calls) - 1
+
+        assert hedged == 2
+        assert hedger.get_stats()["over_budget"] == 2
+
+
+class TestStreamServiceHedging:
+    """Tests for hedged status checks in stream_service."""
+
+    @pytest.mark.asyncio
+    async def test_hung_check_is_hedged_on_another_session(self):
+        """A status check stuck on one session must be answered by a second."""
+        from app.services import stream_service
+
+        hedger = Hedger(enabled=True, budget=1, min_samples=5)
+        _warm(hedger, seconds=0.05)
+
+        def slow_resolve(url):
+            time.sleep(0.5)
+            return ("twitch", MagicMock(), url)
+
+        slow, fast = MagicMock(), MagicMock()
+        slow.resolve_url.side_effect = slow_resolve
+        fast.resolve_url.return_value = ("twitch", MagicMock(), "u")
+        pool = MagicMock()
+        pool.get_session_async = AsyncMock(side_effect=[slow, fast])
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool", pool),
+            patch.object(stream_service, "hedger", hedger),
+            patch.object(
+                stream_service,
+                "get_stream_types_from_streams",
+                return_value=["live"],
+            ),
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            started = time.monotonic()
+            result = await stream_service.check_single_stream(
+                "https://www.twitch.tv/foo"
+            )
+
+        assert time.monotonic() - started < 0.4
+        assert result.url == "https://www.twitch.tv/foo"
+        assert pool.get_session_async.await_count == 2
@@ -0,0 +1,108 @@
+"""
+Tests for app/http_pool.py
+
+Covers:
+- SharedHTTPAdapter: keep-alive socket options, pool bounds
+- Connection sharing between Streamlink sessions, reuse vs new connection
+  counters, close() leaving shared connections alone, reset()
+"""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from streamlink.session import Streamlink
+
+from app.http_pool import SharedHTTPAdapter
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server_url():
+    """A local keep-alive HTTP server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def _session(adapter):
+    session = Streamlink()
+    adapter.mount_on(session.http)
+    return session
+
+
+class TestSharedHTTPAdapter:
+    """Tests for the adapter's configuration."""
+
+    def test_enables_tcp_keepalive(self):
+        """Pooled connections must be opened with SO_KEEPALIVE."""
+        adapter = SharedHTTPAdapter(keepalive_idle=30)
+        options = adapter.poolmanager.connection_pool_kw["socket_options"]
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+
+    def test_pool_bounds_are_configurable(self):
+        """pool_connections/pool_maxsize/pool_block must reach the PoolManager."""
+        adapter = SharedHTTPAdapter(pool_connections=5, pool_maxsize=7, pool_block=True)
+        stats = adapter.get_stats()
+        assert stats["pool_connections"] == 5
+        assert stats["pool_maxsize"] == 7
+        assert stats["pool_block"] is True
+        assert adapter.poolmanager.connection_pool_kw["maxsize"] == 7
+
+
+class TestConnectionSharing:
+    """Tests for connection reuse across sessions."""
+
+    def test_sessions_reuse_each_others_connections(self, server_url):
+        """A second session must reuse the connection the first one opened."""
+        adapter = SharedHTTPAdapter()
+
+        _session(adapter).http.get(server_url)
+        _session(adapter).http.get(server_url)
+
+        stats = adapter.get_stats()
+        assert stats["requests"] == 2
+        assert stats["new_connections"] == 1
+        assert stats["reused_connections"] == 1
+        assert stats["hosts"] == 1
+
+    def test_closing_a_session_keeps_shared_connections(self, server_url):
+        """Closing one session's HTTP client must not drop the shared pool."""
+        adapter = SharedHTTPAdapter()
+        first = _session(adapter)
+        first.http.get(server_url)
+
+        first.http.close()
+        _session(adapter).http.get(server_url)
+
+        assert adapter.get_stats()["new_connections"] == 1
+
+    def test_reset_drops_connections_but_keeps_counters(self, server_url):
+        """reset() must force new connections without losing the totals."""
+        adapter = SharedHTTPAdapter()
+        session = _session(adapter)
+        session.http.get(server_url)
+
+        adapter.reset()
+        session.http.get(server_url)
+
+        stats = adapter.get_stats()
+        assert stats["new_connections"] == 2
+        assert stats["requests"] == 2
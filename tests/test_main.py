@@ -167,20 +167,24 @@ class TestSessionStatsEndpoint:
     def test_returns_200(self, client):
         """GET /session/stats must return HTTP 200."""
         with patch("app.session_pool.session_pool") as mock_pool:
-            mock_pool.size.return_value = 3
-            mock_pool.pool_size = 3
-            mock_pool.created_at = 0.0
-            mock_pool.refresh_interval = 3600
+            mock_pool.get_stats.return_value = {
+                "available_sessions": 3,
+                "pool_size": 3,
+                "created_at": 0.0,
+                "refresh_interval": 3600,
+            }
             response = client.get("/session/stats")
         assert response.status_code == 200
 
     def test_returns_session_pool_key(self, client):
         """GET /session/stats must include a 'session_pool' key."""
         with patch("app.session_pool.session_pool") as mock_pool:
-            mock_pool.size.return_value = 3
-            mock_pool.pool_size = 3
-            mock_pool.created_at = 0.0
-            mock_pool.refresh_interval = 3600
+            mock_pool.get_stats.return_value = {
+                "available_sessions": 3,
+                "pool_size": 3,
+                "created_at": 0.0,
+                "refresh_interval": 3600,
+            }
             response = client.get("/session/stats")
         data = response.json()
         assert "session_pool" in data
@@ -188,10 +192,12 @@ class TestSessionStatsEndpoint:
     def test_session_pool_includes_available_sessions(self, client):
         """The session_pool dict must include available_sessions."""
         with patch("app.session_pool.session_pool") as mock_pool:
-            mock_pool.size.return_value = 2
-            mock_pool.pool_size = 3
-            mock_pool.created_at = 0.0
-            mock_pool.refresh_interval = 3600
+            mock_pool.get_stats.return_value = {
+                "available_sessions": 2,
+                "pool_size": 3,
+                "created_at": 0.0,
+                "refresh_interval": 3600,
+            }
             response = client.get("/session/stats")
         data = response.json()["session_pool"]
         assert "available_sessions" in data
@@ -200,20 +206,75 @@ class TestSessionStatsEndpoint:
     def test_returns_service_name(self, client):
         """GET /session/stats must include the service name."""
         with patch("app.session_pool.session_pool") as mock_pool:
-            mock_pool.size.return_value = 3
-            mock_pool.pool_size = 3
-            mock_pool.created_at = 0.0
-            mock_pool.refresh_interval = 3600
+            mock_pool.get_stats.return_value = {
+                "available_sessions": 3,
+                "pool_size": 3,
+                "created_at": 0.0,
+                "refresh_interval": 3600,
+            }
             response = client.get("/session/stats")
         assert response.json()["service"] == "streamlink-api"
 
+    def test_returns_http_pool_stats(self, client):
+        """GET /session/stats must report shared connection reuse."""
+        response = client.get("/session/stats")
+        data = response.json()["http_pool"]
+        assert "reused_connections" in data
+        assert "new_connections" in data
+
+    def test_returns_resolver_executor_stats(self, client):
+        """GET /session/stats must report resolver queue depth and workers."""
+        response = client.get("/session/stats")
+        data = response.json()["resolver_executor"]
+        assert "queue_depth" in data
+        assert "active_workers" in data
+
+    def test_returns_circuit_breaker_state(self, client):
+        """GET /session/stats must report each platform's breaker state."""
+        from app.circuit_breaker import CircuitBreakers
+        from app.models import StreamStatus
+
+        breakers = CircuitBreakers(failure_threshold=1)
+        breakers.get("kick").record_failure(
+            StreamStatus(url="https://kick.com/a", status="error", error="blocked")
+        )
+        with patch("app.circuit_breaker.circuit_breakers", breakers):
+            response = client.get("/session/stats")
+
+        data = response.json()["circuit_breakers"]
+        assert data["kick"]["state"] == "open"
+        assert data["kick"]["last_error"] == "blocked"
+
+    def test_returns_bulkhead_state(self, client):
+        """GET /session/stats must report each platform's bulkhead."""
+        from app.bulkhead import Bulkheads
+
+        heads = Bulkheads(limits={"youtube": "3"})
+        heads.get("youtube")
+        with patch("app.bulkhead.bulkheads", heads):
+            response = client.get("/session/stats")
+
+        data = response.json()["bulkheads"]
+        assert data["youtube"]["limit"] == 3
+        assert data["youtube"]["rejected"] == 0
+
+    def test_returns_hedging_state(self, client):
+        """GET /session/stats must report hedging settings and counters."""
+        response = client.get("/session/stats")
+
+        data = response.json()["hedging"]
+        assert "enabled" in data
+        assert "over_budget" in data
+
     def test_does_not_require_api_key(self, client):
         """GET /session/stats must be accessible without an API key."""
         with patch("app.session_pool.session_pool") as mock_pool:
-            mock_pool.size.return_value = 3
-            mock_pool.pool_size = 3
-            mock_pool.created_at = 0.0
-            mock_pool.refresh_interval = 3600
+            mock_pool.get_stats.return_value = {
+                "available_sessions": 3,
+                "pool_size": 3,
+                "created_at": 0.0,
+                "refresh_interval": 3600,
+            }
             response = client.get("/session/stats")
         assert response.status_code == 200
 
@@ -0,0 +1,123 @@
+"""
+Tests for app/plugin_index.py
+
+Covers:
+- PluginIndex.resolve_url(): fallback to session.resolve_url on unknown
+  hosts, indexed fast path without a full matcher scan, fallback when the
+  indexed plugin doesn't match, only real plugins are indexed
+- Persistence: save/load round-trip, unreadable index file
+- preload(): loads the plugin into a session, get_stats()
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from streamlink.session import Streamlink
+
+from app.plugin_index import PluginIndex
+
+TWITCH_URL = "https://www.twitch.tv/testchannel"
+
+
+@pytest.fixture()
+def session():
+    """A real (offline) Streamlink session with lazily loaded plugins."""
+    return Streamlink()
+
+
+class TestPluginIndexResolve:
+    """Tests for PluginIndex.resolve_url()."""
+
+    def test_unknown_host_falls_back_and_is_indexed(self, session):
+        """The first URL for a host must use session.resolve_url and be recorded."""
+        index = PluginIndex()
+
+        name, plugin_class, url = index.resolve_url(session, TWITCH_URL)
+
+        assert name == "twitch"
+        assert url == TWITCH_URL
+        assert index.lookup(TWITCH_URL) == "twitch"
+        assert index.get_stats()["misses"] == 1
+
+    def test_indexed_host_skips_full_matcher_scan(self, session):
+        """Once indexed, a host must resolve without scanning every plugin."""
+        index = PluginIndex()
+        index.record(TWITCH_URL, "twitch")
+
+        with patch.object(
+            session.plugins, "match_url", side_effect=AssertionError("scanned")
+        ):
+            name, plugin_class, _ = index.resolve_url(
+                session, "https://twitch.tv/otherchannel"
+            )
+
+        assert name == "twitch"
+        assert plugin_class is session.plugins["twitch"]
+        assert index.get_stats()["hits"] == 1
+
+    def test_adds_missing_scheme(self, session):
+        """URLs without a scheme must be resolved as https."""
+        index = PluginIndex()
+        index.record(TWITCH_URL, "twitch")
+
+        _, _, url = index.resolve_url(session, "twitch.tv/testchannel")
+
+        assert url == "https://twitch.tv/testchannel"
+
+    def test_mismatching_indexed_plugin_falls_back(self, session):
+        """If the indexed plugin doesn't match the URL, the full lookup must run."""
+        index = PluginIndex()
+        index.record(TWITCH_URL, "youtube")
+
+        name, _, _ = index.resolve_url(session, TWITCH_URL)
+
+        assert name == "twitch"
+        assert index.lookup(TWITCH_URL) == "twitch"
+
+    def test_mock_plugins_are_not_indexed(self):
+        """Only real Plugin subclasses may be written to the index."""
+        index = PluginIndex()
+        mock_session = MagicMock()
+        mock_session.resolve_url.return_value = ("twitch", MagicMock(), TWITCH_URL)
+
+        index.resolve_url(mock_session, TWITCH_URL)
+
+        assert index.lookup(TWITCH_URL) is None
+
+
+class TestPluginIndexPersistence:
+    """Tests for saving and loading the index file."""
+
+    def test_round_trip_through_disk(self, tmp_path, session):
+        """Hosts learned by one index must be visible to a new one on the same path."""
+        path = str(tmp_path / "index.json")
+        PluginIndex(path).resolve_url(session, TWITCH_URL)
+
+        assert PluginIndex(path).lookup(TWITCH_URL) == "twitch"
+
+    def test_unreadable_file_is_ignored(self, tmp_path):
+        """A corrupt index file must be ignored rather than crash startup."""
+        path = tmp_path / "index.json"
+        path.write_text("{not json")
+
+        index = PluginIndex(str(path))
+
+        assert index.get_stats()["hosts"] == 0
+
+
+class TestPluginIndexPreload:
+    """Tests for PluginIndex.preload()."""
+
+    def test_preload_loads_plugin_into_session(self, session):
+        """preload() must leave the URL's plugin loaded in the session."""
+        index = PluginIndex()
+
+        assert index.preload(session, TWITCH_URL) is True
+
+        assert "twitch" in session.plugins
+        assert index.lookup(TWITCH_URL) == "twitch"
+
+    def test_preload_unknown_url_returns_false(self, session):
+        """preload() must report URLs no plugin can handle."""
+        index = PluginIndex()
+        assert index.preload(session, "https://example.invalid/nothing") is False
@@ -0,0 +1,282 @@
+"""
+Tests for app/services/probes.py
+
+Covers:
+- probe_twitch(): GQL online/offline, unsupported URLs, unknown users
+- probe_youtube(): live, offline/upcoming, VODs left to Streamlink
+- probe_kick(): livestream JSON online/offline
+- LivenessProber: unknown platforms, disabled mode, error cooldown after
+  repeated probe errors (not 404s or timeouts), stats
+- _resolve_stream_sync(): probe answers skip stream enumeration, fallback
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import requests
+from streamlink.exceptions import PluginError
+
+from app.models import StreamStatus
+from app.services.probes import (
+    LivenessProber,
+    probe_kick,
+    probe_twitch,
+    probe_youtube,
+)
+
+TWITCH_URL = "https://www.twitch.tv/testchannel"
+YOUTUBE_URL = "https://www.youtube.com/watch?v=abcdefghijk"
+KICK_URL = "https://kick.com/testchannel"
+
+
+def _http(json_data=None, text=""):
+    """Return a mock HTTP session whose responses carry the given body."""
+    response = MagicMock()
+    response.json.return_value = json_data
+    response.text = text
+    http = MagicMock()
+    http.get.return_value = response
+    http.post.return_value = response
+    return http
+
+
+def _watch_page(player_response):
+    return (
+        "<script>var ytInitialPlayerResponse = "
+        + json.dumps(player_response)
+        + ";var meta = {};</script>"
+    )
+
+
+class TestTwitchProbe:
+    """Tests for the Twitch GQL probe."""
+
+    def test_live_channel_is_online(self):
+        """A user with a stream must be reported online with its metadata."""
+        http = _http(
+            {
+                "data": {
+                    "user": {
+                        "login": "testchannel",
+                        "displayName": "TestChannel",
+                        "stream": {
+                            "id": "123",
+                            "title": "Hello",
+                            "game": {"name": "Chess"},
+                        },
+                    }
+                }
+            }
+        )
+
+        status = probe_twitch(http, TWITCH_URL, 5)
+
+        assert status.status == "online"
+        assert status.author == "TestChannel"
+        assert status.category == "Chess"
+        assert status.stream_id == "123"
+        assert http.post.call_args[1]["json"]["variables"] == {"login": "testchannel"}
+
+    def test_no_stream_is_offline(self):
+        """A user without a stream must be reported offline."""
+        http = _http({"data": {"user": {"login": "testchannel", "stream": None}}})
+        assert probe_twitch(http, TWITCH_URL, 5).status == "offline"
+
+    def test_unknown_user_is_left_to_streamlink(self):
+        """A missing user must not be decided by the probe."""
+        assert probe_twitch(_http({"data": {"user": None}}), TWITCH_URL, 5) is None
+
+    def test_non_channel_urls_are_not_probed(self):
+        """VOD URLs must go straight to Streamlink."""
+        http = _http()
+        assert probe_twitch(http, "https://www.twitch.tv/videos/12345", 5) is None
+        http.post.assert_not_called()
+
+
+class TestYouTubeProbe:
+    """Tests for the YouTube watch-page probe."""
+
+    def test_live_video_is_online(self):
+        """isLive in the player response must be reported online."""
+        page = _watch_page(
+            {
+                "videoDetails": {
+                    "videoId": "abcdefghijk",
+                    "title": "Live now",
+                    "author": "Someone",
+                    "isLive": True,
+                }
+            }
+        )
+
+        status = probe_youtube(_http(text=page), YOUTUBE_URL, 5)
+
+        assert status.status == "online"
+        assert status.title == "Live now"
+        assert status.stream_id == "abcdefghijk"
+
+    def test_ended_live_stream_is_offline(self):
+        """LIVE_STREAM_OFFLINE playability must be reported offline."""
+        page = _watch_page(
+            {
+                "videoDetails": {"videoId": "abcdefghijk"},
+                "playabilityStatus": {"status": "LIVE_STREAM_OFFLINE"},
+            }
+        )
+        assert probe_youtube(_http(text=page), YOUTUBE_URL, 5).status == "offline"
+
+    def test_vod_is_left_to_streamlink(self):
+        """Regular videos must be decided by the full resolution."""
+        page = _watch_page({"videoDetails": {"videoId": "abcdefghijk"}})
+        assert probe_youtube(_http(text=page), YOUTUBE_URL, 5) is None
+
+    def test_page_without_player_response_is_left_to_streamlink(self):
+        """Consent or error pages must fall back."""
+        assert probe_youtube(_http(text="<html></html>"), YOUTUBE_URL, 5) is None
+
+
+class TestKickProbe:
+    """Tests for the Kick livestream JSON probe."""
+
+    def test_livestream_is_online(self):
+        """A livestream object must be reported online."""
+        http = _http(
+            {
+                "data": {
+                    "id": 42,
+                    "session_title": "Kick stream",
+                    "category": {"name": "Just Chatting"},
+                }
+            }
+        )
+
+        status = probe_kick(http, KICK_URL, 5)
+
+        assert status.status == "online"
+        assert status.title == "Kick stream"
+        assert status.stream_id == "42"
+
+    def test_null_livestream_is_offline(self):
+        """A null livestream must be reported offline."""
+        assert probe_kick(_http({"data": None}), KICK_URL, 5).status == "offline"
+
+
+class TestLivenessProber:
+    """Tests for probe dispatch, fallback and cooldown."""
+
+    def test_unknown_platform_falls_back(self):
+        """Platforms without a probe must return None without any request."""
+        session = MagicMock()
+        prober = LivenessProber(enabled=True)
+        assert prober.probe(session, "https://vimeo.com/123") is None
+        session.http.get.assert_not_called()
+
+    def test_disabled_prober_never_probes(self):
+        """With probes disabled, every URL must fall back."""
+        session = MagicMock()
+        prober = LivenessProber(enabled=False)
+        assert prober.probe(session, TWITCH_URL) is None
+        session.http.post.assert_not_called()
+
+    def test_failing_platform_cools_down(self):
+        """After repeated probe errors the platform must be skipped until the cooldown ends."""
+        session = MagicMock()
+        session.http.get.side_effect = RuntimeError("403 Forbidden")
+        prober = LivenessProber(enabled=True, cooldown=60, error_threshold=2)
+
+        assert prober.probe(session, KICK_URL) is None
+        assert prober.get_stats()["cooling_down"] == []
+        assert prober.probe(session, KICK_URL) is None
+        assert prober.probe(session, KICK_URL) is None
+
+        assert session.http.get.call_count == 2
+        stats = prober.get_stats()
+        assert stats["errors"] == {"kick": 2}
+        assert stats["fallbacks"] == {"kick": 1}
+        assert stats["cooling_down"] == ["kick"]
+
+    def test_missing_channel_and_timeouts_do_not_cool_down(self):
+        """404s and timed-out requests must fall back without disabling the probe."""
+        not_found = requests.HTTPError(response=MagicMock(status_code=404))
+        wrapped = PluginError("Unable to open URL")
+        wrapped.err = not_found
+        session = MagicMock()
+        session.http.get.side_effect = [
+            wrapped,
+            not_found,
+            requests.ReadTimeout("read timed out"),
+        ]
+        prober = LivenessProber(enabled=True, cooldown=60, error_threshold=1)
+
+        for _ in range(3):
+            assert prober.probe(session, KICK_URL) is None
+
+        stats = prober.get_stats()
+        assert stats["errors"] == {}
+        assert stats["fallbacks"] == {"kick": 3}
+        assert stats["cooling_down"] == []
+
+    def test_success_resets_error_count(self):
+        """Errors must only trip the cooldown when they come in a row."""
+        session = MagicMock()
+        session.http.get.side_effect = [
+            RuntimeError("schema"),
+            _http({"data": None}).get.return_value,
+            RuntimeError("schema"),
+        ]
+        prober = LivenessProber(enabled=True, cooldown=60, error_threshold=2)
+
+        for _ in range(3):
+            prober.probe(session, KICK_URL)
+
+        assert prober.get_stats()["cooling_down"] == []
+
+    def test_answered_probes_are_counted(self):
+        """Decided probes must be counted per platform."""
+        session = MagicMock()
+        session.http = _http({"data": None})
+        prober = LivenessProber(enabled=True)
+
+        prober.probe(session, KICK_URL)
+
+        assert prober.get_stats()["answered"] == {"kick": 1}
+
+
+class TestStatusCheckUsesProbes:
+    """Tests for the probe layer inside _resolve_stream_sync()."""
+
+    def test_probe_answer_skips_stream_enumeration(self, liveness_prober):
+        """A decided probe must be returned without resolving a plugin."""
+        from app.services.stream_service import _resolve_stream_sync
+
+        probed = StreamStatus(url=TWITCH_URL, status="offline", platform="twitch")
+        session = MagicMock()
+        with (
+            patch.object(liveness_prober, "probe", return_value=probed),
+            patch("app.services.stream_service.session_pool"),
+        ):
+            result = _resolve_stream_sync(TWITCH_URL, session)
+
+        assert result is probed
+        session.resolve_url.assert_not_called()
+
+    def test_undecided_probe_falls_back_to_streamlink(self, liveness_prober):
+        """If the probe can't decide, the plugin's streams must be enumerated."""
+        from app.services.stream_service import _resolve_stream_sync
+
+        plugin = MagicMock()
+        plugin.streams.return_value = {}
+        session = MagicMock()
+        session.resolve_url.return_value = (
+            "twitch",
+            MagicMock(return_value=plugin),
+            TWITCH_URL,
+        )
+        with (
+            patch.object(liveness_prober, "probe", return_value=None),
+            patch("app.services.stream_service.session_pool"),
+        ):
+            result = _resolve_stream_sync(TWITCH_URL, session)
+
+        assert result.status == "offline"
+        plugin.streams.assert_called_once()
@@ -0,0 +1,211 @@
+"""
+Tests for app/process_pool.py
+
+Covers:
+- Worker functions: plain-dict results, API errors sent back as fields
+- ResolverProcessPool: backend switch, error re-raising, restart after a
+  broken pool, stats
+- End-to-end resolution in a real spawned worker process
+- stream_service routing to the process backend, broken pools answered as
+  busy on both endpoints
+"""
+
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.exceptions import NoPluginException, StreamlinkAPIException
+from app.models import StreamStatus
+from app.process_pool import ResolverProcessPool, _check_status, _resolve_details
+
+
+class TestWorkerFunctions:
+    """Tests for the functions executed inside resolver processes."""
+
+    def test_check_status_returns_plain_dict(self):
+        """Status results must cross the process boundary as dicts."""
+        status = StreamStatus(url="https://twitch.tv/a", status="online")
+        with patch(
+            "app.services.stream_service._resolve_stream_sync", return_value=status
+        ):
+            result = _check_status("https://twitch.tv/a")
+
+        assert result == status.model_dump()
+
+    def test_resolve_details_wraps_result(self):
+        """Successful resolutions must be returned under 'result'."""
+        details = {"status": "online", "platform": "twitch"}
+        with patch(
+            "app.services.stream_service._resolve_details_sync", return_value=details
+        ):
+            assert _resolve_details("https://twitch.tv/a") == {"result": details}
+
+    def test_resolve_details_returns_api_error_fields(self):
+        """API exceptions must come back as status_code/detail/headers."""
+        with patch(
+            "app.services.stream_service._resolve_details_sync",
+            side_effect=NoPluginException("https://example.com"),
+        ):
+            result = _resolve_details("https://example.com")
+
+        assert result["error"]["status_code"] == 400
+        assert "No plugin" in result["error"]["detail"]
+
+
+class TestResolverProcessPool:
+    """Tests for ResolverProcessPool in the API process."""
+
+    def test_disabled_for_thread_backend(self):
+        """The pool must only be enabled with RESOLVER_BACKEND=process."""
+        assert ResolverProcessPool(backend="thread").enabled is False
+        assert ResolverProcessPool(backend="process").enabled is True
+
+    @pytest.mark.asyncio
+    async def test_resolve_details_reraises_api_error(self):
+        """An error dict from a worker must be raised as a StreamlinkAPIException."""
+        pool = ResolverProcessPool(processes=1, backend="process")
+        error = {"status_code": 404, "detail": "No streams", "headers": None}
+        with patch.object(pool, "_run", AsyncMock(return_value={"error": error})):
+            with pytest.raises(StreamlinkAPIException) as exc_info:
+                await pool.resolve_details("https://twitch.tv/a")
+
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_reraised_error_keeps_its_class(self):
+        """The worker's error class must survive so the failure can be cached."""
+        pool = ResolverProcessPool(processes=1, backend="process")
+        with patch(
+            "app.services.stream_service._resolve_details_sync",
+            side_effect=NoPluginException("https://example.com"),
+        ):
+            response = _resolve_details("https://example.com")
+
+        with patch.object(pool, "_run", AsyncMock(return_value=response)):
+            with pytest.raises(StreamlinkAPIException) as exc_info:
+                await pool.resolve_details("https://example.com")
+
+        assert exc_info.value.error_type == "no_plugin"
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_is_rebuilt(self):
+        """After a worker dies, the next call must get a fresh executor."""
+        pool = ResolverProcessPool(processes=1, backend="process")
+        broken = pool._get_executor()
+
+        with patch.object(
+            asyncio.get_running_loop(),
+            "run_in_executor",
+            side_effect=BrokenProcessPool("worker died"),
+        ):
+            with pytest.raises(BrokenProcessPool):
+                await pool._run(_check_status, "https://twitch.tv/a")
+
+        assert pool._get_executor() is not broken
+        assert pool.get_stats()["restarts"] == 1
+        assert pool.get_stats()["failed"] == 1
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_resolves_in_real_worker_process(self):
+        """A spawned worker must resolve and report errors end to end."""
+        pool = ResolverProcessPool(processes=1, backend="process")
+        try:
+            status = await pool.check_status("https://example.invalid/nothing")
+            with pytest.raises(StreamlinkAPIException) as exc_info:
+                await pool.resolve_details("https://example.invalid/nothing")
+        finally:
+            pool.shutdown()
+
+        assert status.status == "error"
+        assert exc_info.value.status_code == 400
+        assert pool.get_stats()["completed"] == 2
+
+
+class TestStreamServiceProcessBackend:
+    """Tests for stream_service routing to the process backend."""
+
+    @pytest.mark.asyncio
+    async def test_check_single_stream_uses_process_pool(self):
+        """check_single_stream() must skip the local session pool."""
+        from app.services import stream_service
+
+        status = StreamStatus(url="https://twitch.tv/a", status="offline")
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool") as mock_pool,
+            patch.object(stream_service, "resolver_processes") as mock_processes,
+        ):
+            mock_cache.get_entry.return_value = (None, False)
+            mock_processes.enabled = True
+            mock_processes.check_status = AsyncMock(return_value=status)
+
+            result = await stream_service.check_single_stream("https://twitch.tv/a")
+
+        assert result is status
+        mock_pool.get_session_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resolve_stream_caches_process_result(self):
+        """resolve_stream() must cache what the worker process returned."""
+        from app.services import stream_service
+
+        details = {"status": "online", "platform": "twitch"}
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "resolver_processes") as mock_processes,
+        ):
+            mock_cache.get_entry.return_value = (None, False)
+            mock_processes.enabled = True
+            mock_processes.resolve_details = AsyncMock(return_value=details)
+
+            result = await stream_service.resolve_stream("https://www.twitch.tv/a")
+
+        assert result == details
+        resolve_call = mock_cache.set.call_args_list[0]
+        assert resolve_call[0][:2] == ("resolve:https://www.twitch.tv/a", details)
+        assert resolve_call[1]["ttl"] == 300
+
+    @pytest.mark.asyncio
+    async def test_broken_process_pool_maps_to_service_busy(self):
+        """A dead worker pool must surface as a 503 on /resolve."""
+        from app.exceptions import ServiceBusyException
+        from app.services import stream_service
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "resolver_processes") as mock_processes,
+        ):
+            mock_cache.get_entry.return_value = (None, False)
+            mock_processes.enabled = True
+            mock_processes.resolve_details = AsyncMock(
+                side_effect=BrokenProcessPool("worker died")
+            )
+
+            with pytest.raises(ServiceBusyException):
+                await stream_service.resolve_stream("https://www.twitch.tv/a")
+
+    @pytest.mark.asyncio
+    async def test_broken_process_pool_status_is_busy(self, circuit_breakers):
+        """A dead worker pool must answer status checks as service_busy."""
+        from app.services import stream_service
+
+        circuit_breakers.failure_threshold = 1
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "resolver_processes") as mock_processes,
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+            mock_processes.enabled = True
+            mock_processes.check_status = AsyncMock(
+                side_effect=BrokenProcessPool("worker died")
+            )
+
+            result = await stream_service.check_single_stream("https://www.twitch.tv/a")
+
+        assert result.error_details["type"] == "service_busy"
+        assert circuit_breakers.get("twitch").allow()
+        mock_cache.set.assert_not_called()
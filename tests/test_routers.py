@@ -4,11 +4,21 @@ Tests for app/routers/streams.py
 Covers:
 - GET /api/resolve  — valid URL, invalid URL, cache bypass, auth guard
 - POST /api/status-batch — multiple URLs, concurrent processing,
+  per-URL error handling, stale flag in the JSON body, auth guard
+- POST /api/status-batch/stream — NDJSON and SSE, completion order,
   per-URL error handling, auth guard
+- /api/status-jobs — submit, limits, polling partial results, unknown
+  jobs, NDJSON result stream, auth guard
+- WS /api/status-subscriptions — subscribe and status updates, equivalent
+  URLs subscribed once, malformed messages, URL limit, header and
+  query-parameter API keys
 """
 
+import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
 
 from tests.conftest import TEST_API_KEY
 
@@ -50,8 +60,8 @@ class TestResolveEndpoint:
         """A valid, supported URL must return stream details from the service."""
         with (
             patch(
-                "app.routers.streams.stream_service.resolve_stream_details",
-                return_value=ONLINE_RESULT,
+                "app.routers.streams.stream_service.resolve_stream",
+                new=AsyncMock(return_value=ONLINE_RESULT),
             ),
             patch(
                 "app.routers.streams.validate_url",
@@ -96,12 +106,12 @@ class TestResolveEndpoint:
         assert response.status_code == 401
 
     def test_cache_bypass_deletes_cache_entry(self, client):
-        """When bypass_cache=true the cache entry for the URL must be deleted."""
+        """bypass_cache=true must delete the URL's resolve, status and failure entries."""
         with (
             patch("app.routers.streams.cache") as mock_cache,
             patch(
-                "app.routers.streams.stream_service.resolve_stream_details",
-                return_value=ONLINE_RESULT,
+                "app.routers.streams.stream_service.resolve_stream",
+                new=AsyncMock(return_value=ONLINE_RESULT),
             ),
             patch(
                 "app.routers.streams.validate_url",
@@ -119,17 +129,17 @@ class TestResolveEndpoint:
             )
 
         assert response.status_code == 200
-        mock_cache.delete.assert_called_once_with(
-            "resolve:https://www.twitch.tv/testchannel"
-        )
+        mock_cache.delete.assert_any_call("resolve:https://www.twitch.tv/testchannel")
+        mock_cache.delete.assert_any_call("status:https://www.twitch.tv/testchannel")
+        mock_cache.delete.assert_any_call("failure:https://www.twitch.tv/testchannel")
 
     def test_service_exception_returns_error(self, client):
         """Unhandled service exceptions must surface as 500 responses."""
 
         with (
             patch(
-                "app.routers.streams.stream_service.resolve_stream_details",
-                side_effect=Exception("boom"),
+                "app.routers.streams.stream_service.resolve_stream",
+                new=AsyncMock(side_effect=Exception("boom")),
             ),
             patch(
                 "app.routers.streams.validate_url",
@@ -150,8 +160,10 @@ class TestResolveEndpoint:
 
         with (
             patch(
-                "app.routers.streams.stream_service.resolve_stream_details",
-                side_effect=NoPluginException("https://www.twitch.tv/testchannel"),
+                "app.routers.streams.stream_service.resolve_stream",
+                new=AsyncMock(
+                    side_effect=NoPluginException("https://www.twitch.tv/testchannel")
+                ),
             ),
             patch(
                 "app.routers.streams.validate_url",
@@ -212,6 +224,38 @@ class TestStatusBatchEndpoint:
         assert len(data["results"]) == 1
         assert data["results"][0]["status"] == "online"
 
+    def test_stale_hit_is_flagged_in_json(self, client):
+        """A status served past its TTL must say so in the response body."""
+        import time
+
+        from app.cache import SimpleCache
+        from app.models import StreamStatus
+
+        url = "https://www.twitch.tv/testchannel"
+        backend = SimpleCache()
+        backend.set(
+            f"status:{url}",
+            StreamStatus(url=url, status="online", platform="twitch"),
+            ttl=0.01,
+            stale_ttl=60,
+        )
+        time.sleep(0.05)
+
+        with (
+            patch("app.services.stream_service.cache", backend),
+            patch(
+                "app.services.stream_service._check_and_cache",
+                new=AsyncMock(return_value=StreamStatus(url=url, status="online")),
+            ),
+        ):
+            response = client.post(
+                "/api/status-batch", json={"urls": [url]}, headers=AUTH
+            )
+
+        assert response.status_code == 200
+        assert response.json()["results"][0]["stale"] is True
+        assert backend.get_entry(f"status:{url}")[0].stale is False
+
     def test_multiple_urls_processed_concurrently(self, client):
         """All URLs in the batch must appear in the response."""
         from app.models import StreamStatus
@@ -228,7 +272,7 @@ class TestStatusBatchEndpoint:
         with (
             patch(
                 "app.routers.streams.stream_service.check_single_stream",
-                new=AsyncMock(side_effect=lambda u: _make_status(u)),
+                new=AsyncMock(side_effect=lambda u, *_: _make_status(u)),
             ),
             patch(
                 "app.routers.streams.validate_batch_request",
@@ -256,7 +300,7 @@ class TestStatusBatchEndpoint:
 
         call_count = 0
 
-        async def _side_effect(url):
+        async def _side_effect(url, bypass_cache=False):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -321,7 +365,7 @@ class TestStatusBatchEndpoint:
         assert response.status_code == 400
 
     def test_cache_bypass_deletes_cache_entries(self, client):
-        """bypass_cache=true must delete the cache entry for every URL."""
+        """bypass_cache=true must delete the status and failure entries for every URL."""
         from app.models import StreamStatus
 
         urls = [
@@ -349,9 +393,320 @@ class TestStatusBatchEndpoint:
                 headers=AUTH,
             )
 
-        assert mock_cache.delete.call_count == len(urls)
+        for url in urls:
+            mock_cache.delete.assert_any_call(f"status:{url}")
+            mock_cache.delete.assert_any_call(f"failure:{url}")
 
     def test_missing_body_returns_422(self, client):
         """Sending no JSON body must return 422 (validation error)."""
         response = client.post("/api/status-batch", headers=AUTH)
         assert response.status_code == 422
+
+
+# ===========================================================================
+# /api/status-batch/stream
+# ===========================================================================
+
+
+class TestStreamingStatusBatchEndpoint:
+    """Tests for POST /api/status-batch/stream."""
+
+    URLS = ["https://www.twitch.tv/slow", "https://www.twitch.tv/cached"]
+
+    @staticmethod
+    async def _check(url, bypass_cache=False):
+        from app.models import StreamStatus
+
+        if url.endswith("slow"):
+            await asyncio.sleep(0.05)
+        return StreamStatus(url=url, status="online", platform="twitch")
+
+    def _post(self, client, **kwargs):
+        with (
+            patch(
+                "app.routers.streams.stream_service.check_single_stream",
+                new=self._check,
+            ),
+            patch(
+                "app.routers.streams.validate_batch_request",
+                return_value=self.URLS,
+            ),
+        ):
+            return client.post(
+                "/api/status-batch/stream",
+                json={"urls": self.URLS},
+                **kwargs,
+            )
+
+    def test_ndjson_in_completion_order(self, client):
+        """Each status must be one JSON line, fastest first."""
+        response = self._post(client, headers=AUTH)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["url"] for line in lines] == list(reversed(self.URLS))
+
+    def test_server_sent_events(self, client):
+        """Clients accepting text/event-stream must get SSE status events."""
+        response = self._post(client, headers={**AUTH, "Accept": "text/event-stream"})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = response.text.strip().split("\n\n")
+        assert events[-1] == "event: done\ndata: {}"
+        first = events[0].split("\n")
+        assert first[0] == "event: status"
+        assert json.loads(first[1].removeprefix("data: "))["url"] == self.URLS[1]
+
+    def test_exception_becomes_error_line(self, client):
+        """A check that raises must be streamed as status=error for its URL."""
+        with (
+            patch(
+                "app.routers.streams.stream_service.check_single_stream",
+                new=AsyncMock(side_effect=RuntimeError("network failure")),
+            ),
+            patch(
+                "app.routers.streams.validate_batch_request",
+                return_value=self.URLS[:1],
+            ),
+        ):
+            response = client.post(
+                "/api/status-batch/stream",
+                json={"urls": self.URLS[:1]},
+                headers=AUTH,
+            )
+
+        line = json.loads(response.text)
+        assert line["url"] == self.URLS[0]
+        assert line["status"] == "error"
+        assert line["error"] == "network failure"
+
+    def test_missing_api_key_returns_401(self, client):
+        """Streaming batch requests without X-API-Key must be rejected."""
+        response = client.post(
+            "/api/status-batch/stream",
+            json={"urls": ["https://www.twitch.tv/testchannel"]},
+        )
+        assert response.status_code == 401
+
+
+# ===========================================================================
+# /api/status-jobs
+# ===========================================================================
+
+
+class TestStatusJobEndpoints:
+    """Tests for the bulk status job endpoints."""
+
+    JOB = {
+        "job_id": "abc",
+        "state": "running",
+        "total": 3,
+        "completed": 2,
+        "chunk_size": 2,
+        "chunks_done": 1,
+    }
+
+    def test_submit_returns_202_with_job(self, client):
+        """Submitting URLs must start a job and return its id and progress."""
+        urls = [f"https://www.twitch.tv/chan{i}" for i in range(50)]
+        with patch(
+            "app.routers.streams.status_jobs.submit",
+            return_value={**self.JOB, "total": 50},
+        ) as submit:
+            response = client.post(
+                "/api/status-jobs",
+                json={"urls": urls + ["https://example.com/unsupported"]},
+                headers=AUTH,
+            )
+
+        assert response.status_code == 202
+        assert response.json()["job_id"] == "abc"
+        assert response.json()["skipped"] == 1
+        assert len(submit.call_args[0][0]) == 50
+
+    def test_submit_over_limit_returns_400(self, client):
+        """More URLs than STATUS_JOB_MAX_URLS must be rejected."""
+        with patch("app.routers.streams.config.STATUS_JOB_MAX_URLS", 2):
+            response = client.post(
+                "/api/status-jobs",
+                json={"urls": [f"https://www.twitch.tv/c{i}" for i in range(3)]},
+                headers=AUTH,
+            )
+        assert response.status_code == 400
+
+    def test_submit_beyond_running_cap_returns_503(self, client):
+        """A worker already running its maximum of jobs must answer busy."""
+        from app.services import status_jobs
+
+        with patch(
+            "app.routers.streams.status_jobs.submit",
+            side_effect=status_jobs.TooManyJobs("4 status jobs already running"),
+        ):
+            response = client.post(
+                "/api/status-jobs",
+                json={"urls": ["https://www.twitch.tv/chan"]},
+                headers=AUTH,
+            )
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "30"
+
+    def test_poll_returns_partial_results(self, client):
+        """Polling must return progress and the results past the offset."""
+        with (
+            patch("app.routers.streams.status_jobs.get_job", return_value=self.JOB),
+            patch(
+                "app.routers.streams.status_jobs.get_results",
+                return_value=[{"url": "b", "status": "online"}],
+            ) as get_results,
+        ):
+            response = client.get("/api/status-jobs/abc?offset=1", headers=AUTH)
+
+        data = response.json()
+        assert data["state"] == "running"
+        assert data["results"] == [{"url": "b", "status": "online"}]
+        assert data["next_offset"] == 2
+        get_results.assert_called_once_with(self.JOB, 1)
+
+    def test_unknown_job_returns_404(self, client):
+        """Polling an unknown or expired job must return 404."""
+        with patch("app.routers.streams.status_jobs.get_job", return_value=None):
+            response = client.get("/api/status-jobs/missing", headers=AUTH)
+        assert response.status_code == 404
+
+    def test_stream_follows_job_until_done(self, client):
+        """The NDJSON stream must emit new results until the job ends."""
+        done = {**self.JOB, "state": "done", "completed": 3, "chunks_done": 2}
+        chunks = {
+            0: [{"url": "a"}, {"url": "b"}],
+            1: [{"url": "c"}],
+        }
+
+        def get_results(job, offset):
+            rows = [row for c in range(job["chunks_done"]) for row in chunks[c]]
+            return rows[offset:]
+
+        with (
+            patch(
+                "app.routers.streams.status_jobs.get_job",
+                side_effect=[self.JOB, done],
+            ),
+            patch(
+                "app.routers.streams.status_jobs.get_results",
+                side_effect=get_results,
+            ),
+            patch("app.routers.streams.config.STATUS_JOB_POLL_INTERVAL", 0),
+        ):
+            response = client.get("/api/status-jobs/abc/stream", headers=AUTH)
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["url"] for line in lines] == ["a", "b", "c"]
+
+    def test_missing_api_key_returns_401(self, client):
+        """Job requests without X-API-Key must be rejected."""
+        response = client.get("/api/status-jobs/abc")
+        assert response.status_code == 401
+
+
+# ===========================================================================
+# /api/status-subscriptions (WebSocket)
+# ===========================================================================
+
+
+class TestStatusSubscriptionSocket:
+    """Tests for the WebSocket status subscription endpoint."""
+
+    URL = "https://www.twitch.tv/testchannel"
+
+    @pytest.fixture()
+    def subscriptions(self):
+        from app.services.subscriptions import StatusSubscriptions
+
+        subs = StatusSubscriptions(interval=60)
+        with patch("app.routers.streams.status_subscriptions", subs):
+            yield subs
+
+    def _check(self):
+        from app.models import StreamStatus
+
+        return patch(
+            "app.services.subscriptions.stream_service.check_single_stream",
+            new=AsyncMock(
+                side_effect=lambda url: StreamStatus(url=url, status="online")
+            ),
+        )
+
+    def test_subscribe_receives_current_status(self, client, subscriptions):
+        """Subscribing must confirm the URLs and then send their status."""
+        with (
+            self._check(),
+            client.websocket_connect("/api/status-subscriptions", headers=AUTH) as ws,
+        ):
+            ws.send_json(
+                {"action": "subscribe", "urls": [self.URL, "not a url at all"]}
+            )
+            confirmed = ws.receive_json()
+            update = ws.receive_json()
+
+        assert confirmed == {"type": "subscribed", "urls": [self.URL], "skipped": 1}
+        assert update["type"] == "status"
+        assert update["status"]["url"] == self.URL
+        assert update["status"]["status"] == "online"
+        assert subscriptions.get_stats()["watched_urls"] == 0
+
+    def test_equivalent_urls_subscribe_once(self, client, subscriptions):
+        """Spellings of one stream must count as a single subscription."""
+        variant = "https://m.twitch.tv/TestChannel"
+        with (
+            self._check(),
+            client.websocket_connect("/api/status-subscriptions", headers=AUTH) as ws,
+        ):
+            ws.send_json({"action": "subscribe", "urls": [variant, self.URL]})
+            confirmed = ws.receive_json()
+            update = ws.receive_json()
+            stats = subscriptions.get_stats()
+
+        assert confirmed == {"type": "subscribed", "urls": [variant], "skipped": 1}
+        assert update["status"]["url"] == variant
+        assert stats["subscriptions"] == 1
+
+    def test_api_key_as_query_parameter(self, client, subscriptions):
+        """Clients that can't set headers must be able to pass api_key."""
+        with (
+            self._check(),
+            client.websocket_connect(
+                f"/api/status-subscriptions?api_key={TEST_API_KEY}"
+            ) as ws,
+        ):
+            ws.send_json({"action": "subscribe", "urls": [self.URL]})
+            assert ws.receive_json()["type"] == "subscribed"
+
+    def test_malformed_message_returns_error(self, client, subscriptions):
+        """Messages without action and urls must get an error reply."""
+        with client.websocket_connect("/api/status-subscriptions", headers=AUTH) as ws:
+            ws.send_text("hello")
+            assert ws.receive_json()["type"] == "error"
+            ws.send_json({"action": "watch", "urls": []})
+            assert ws.receive_json()["detail"] == "Unknown action: watch"
+
+    def test_too_many_urls_returns_error(self, client, subscriptions):
+        """Subscribing past SUBSCRIPTION_MAX_URLS must be refused."""
+        with (
+            patch("app.routers.streams.config.SUBSCRIPTION_MAX_URLS", 1),
+            client.websocket_connect("/api/status-subscriptions", headers=AUTH) as ws,
+        ):
+            ws.send_json({"action": "subscribe", "urls": [self.URL, self.URL + "2"]})
+            assert ws.receive_json()["type"] == "error"
+        assert subscriptions.get_stats()["subscriptions"] == 0
+
+    def test_missing_api_key_is_rejected(self, client, subscriptions):
+        """Connections without a valid API key must be closed."""
+        from starlette.websockets import WebSocketDisconnect
+
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect(
+                "/api/status-subscriptions", headers={"X-API-Key": "wrong"}
+            ) as ws:
+                ws.receive_json()
+        assert exc_info.value.code == 1008
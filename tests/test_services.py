@@ -4,14 +4,30 @@ Tests for app/services/stream_service.py
 Covers:
 - resolve_stream_details(): online stream, offline stream, cache hit,
   NoPluginError, NoStreamsError, PluginError (browser), generic exception
+- resolve_stream(): cache hit, pooled session hand-off, pool exhaustion
 - check_single_stream(): returns StreamStatus, cache hit, exception handling,
-  result caching
+  result caching, canonical cache keys with the caller's URL in the result
+- Cache cross-population: resolve results write a derived status entry, a
+  fresh offline status short-circuits resolve_stream() with a 404
+- Negative caching: failures cached by error class (long for no plugin and
+  browser required, short otherwise), platform-wide browser failures,
+  cached failures answering both endpoints
+- Stale-while-revalidate: stale hits served immediately with one background
+  refresh, refresh failures keep the stale entry
+- Single-flight: concurrent status checks and resolutions of one URL share
+  a single resolution
+- Deadlines: slow status checks return a timeout result, slow resolutions
+  raise a 504, abandoned sessions are returned once their thread finishes,
+  the budget is applied as the session's http-timeout
 - _resolve_stream_sync(): platform detection, session pool interaction
-- _set_cached_flag(): dict and Pydantic model variants
+- _set_cached_flag(): dict and Pydantic model variants, staleness as a
+  field on a copy
 """
 
 import asyncio
-from unittest.mock import MagicMock, patch
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from streamlink.exceptions import NoPluginError, NoStreamsError, PluginError
@@ -65,6 +81,13 @@ def _make_session(plugin_instance, url=TWITCH_URL, plugin_name="twitch"):
     return session
 
 
+def _async_pool(session=None):
+    """Return a mock session pool whose get_session_async() hands out a session."""
+    pool = MagicMock()
+    pool.get_session_async = AsyncMock(return_value=session or MagicMock())
+    return pool
+
+
 # ===========================================================================
 # resolve_stream_details
 # ===========================================================================
@@ -250,28 +273,100 @@ class TestResolveStreamDetails:
 
             resolve_stream_details(TWITCH_URL)
 
-        mock_cache.set.assert_called_once()
-        cache_key = mock_cache.set.call_args[0][0]
-        assert cache_key == f"resolve:{TWITCH_URL}"
+        cache_keys = [c[0][0] for c in mock_cache.set.call_args_list]
+        assert cache_keys[0] == f"resolve:{TWITCH_URL}"
 
-    def test_twitch_session_options_applied(self):
-        """Twitch URLs must trigger Twitch-specific session configuration."""
+    def test_platform_plugin_options_passed_to_plugin(self):
+        """Twitch URLs must use the partition's pre-built plugin options, not set_option."""
         plugin = _make_plugin_instance()
         session = _make_session(plugin, url=TWITCH_URL, plugin_name="twitch")
+        plugin_class = session.resolve_url.return_value[1]
 
         with (
             patch("app.services.stream_service.session_pool") as pool,
             patch("app.services.stream_service.cache") as mock_cache,
         ):
             pool.get_session.return_value = session
+            pool.plugin_options.return_value = {"low-latency": True}
             mock_cache.get.return_value = None
 
             from app.services.stream_service import resolve_stream_details
 
             resolve_stream_details(TWITCH_URL)
 
-        # set_option must have been called at least once for Twitch options
-        assert session.set_option.called
+        pool.get_session.assert_called_once_with("twitch")
+        pool.plugin_options.assert_called_once_with("twitch")
+        assert plugin_class.call_args[0][2] == {"low-latency": True}
+        session.set_option.assert_not_called()
+
+
+# ===========================================================================
+# resolve_stream
+# ===========================================================================
+
+
+class TestResolveStream:
+    """Tests for the async resolve_stream() entry point."""
+
+    def test_uses_session_from_async_acquire(self):
+        """resolve_stream must resolve with the session from get_session_async()."""
+        plugin = _make_plugin_instance()
+        session = _make_session(plugin)
+
+        with (
+            patch("app.services.stream_service.session_pool") as pool,
+            patch("app.services.stream_service.cache") as mock_cache,
+        ):
+            pool.get_session_async = AsyncMock(return_value=session)
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+
+            from app.services.stream_service import resolve_stream
+
+            result = asyncio.get_event_loop().run_until_complete(
+                resolve_stream(TWITCH_URL)
+            )
+
+        assert result["status"] == "online"
+        pool.get_session.assert_not_called()
+        session.resolve_url.assert_called_once()
+
+    def test_cache_hit_skips_session_acquire(self):
+        """A cache hit must be served without waiting for a session."""
+        cached = {"status": "online", "platform": "twitch"}
+
+        with (
+            patch("app.services.stream_service.session_pool") as pool,
+            patch("app.services.stream_service.cache") as mock_cache,
+        ):
+            mock_cache.get_entry.return_value = (cached, False)
+
+            from app.services.stream_service import resolve_stream
+
+            result = asyncio.get_event_loop().run_until_complete(
+                resolve_stream(TWITCH_URL)
+            )
+
+        pool.get_session_async.assert_not_called()
+        assert result["_cached"] is True
+
+    def test_pool_timeout_raises_service_busy(self):
+        """An exhausted pool must surface as a 503 ServiceBusyException."""
+        from app.exceptions import ServiceBusyException
+        from app.session_pool import SessionPoolTimeout
+
+        with (
+            patch("app.services.stream_service.session_pool") as pool,
+            patch("app.services.stream_service.cache") as mock_cache,
+        ):
+            pool.get_session_async = AsyncMock(side_effect=SessionPoolTimeout())
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+
+            from app.services.stream_service import resolve_stream
+
+            with pytest.raises(ServiceBusyException):
+                asyncio.get_event_loop().run_until_complete(resolve_stream(TWITCH_URL))
 
 
 # ===========================================================================
@@ -291,8 +386,9 @@ class TestCheckSingleStream:
             patch("app.services.stream_service.session_pool") as pool,
             patch("app.services.stream_service.cache") as mock_cache,
         ):
-            pool.get_session.return_value = session
+            pool.get_session_async = AsyncMock(return_value=session)
             mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
 
             from app.services.stream_service import check_single_stream
 
@@ -311,7 +407,7 @@ class TestCheckSingleStream:
             patch("app.services.stream_service.cache") as mock_cache,
             patch("app.services.stream_service.session_pool") as pool,
         ):
-            mock_cache.get.return_value = cached_status
+            mock_cache.get_entry.return_value = (cached_status, False)
 
             from app.services.stream_service import check_single_stream
 
@@ -320,6 +416,7 @@ class TestCheckSingleStream:
             )
 
         pool.get_session.assert_not_called()
+        pool.get_session_async.assert_not_called()
         assert result.status == "online"
 
     def test_exception_returns_error_status(self):
@@ -332,6 +429,7 @@ class TestCheckSingleStream:
             patch("app.services.stream_service.cache") as mock_cache,
         ):
             mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
 
             from app.services.stream_service import check_single_stream
 
@@ -351,16 +449,16 @@ class TestCheckSingleStream:
             patch("app.services.stream_service.session_pool") as pool,
             patch("app.services.stream_service.cache") as mock_cache,
         ):
-            pool.get_session.return_value = session
+            pool.get_session_async = AsyncMock(return_value=session)
             mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
 
             from app.services.stream_service import check_single_stream
 
             asyncio.get_event_loop().run_until_complete(check_single_stream(TWITCH_URL))
 
-        mock_cache.set.assert_called_once()
-        cache_key = mock_cache.set.call_args[0][0]
-        assert cache_key == f"status:{TWITCH_URL}"
+        keys = [call[0][0] for call in mock_cache.set.call_args_list]
+        assert keys.count(f"status:{TWITCH_URL}") == 1
 
     def test_error_result_is_cached_with_short_ttl(self):
         """Errors must be cached with a shorter TTL (30 s) than successes."""
@@ -372,6 +470,7 @@ class TestCheckSingleStream:
             patch("app.services.stream_service.cache") as mock_cache,
         ):
             mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
 
             from app.services.stream_service import check_single_stream
 
@@ -386,6 +485,646 @@ class TestCheckSingleStream:
         ttl = call_args[1].get("ttl") or call_args[0][2]
         assert ttl == 30
 
+    @pytest.mark.asyncio
+    async def test_equivalent_urls_share_canonical_entry(self):
+        """Variants of a URL must share one cache entry but keep their own URL."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        plugin = _make_plugin_instance()
+        session = _make_session(plugin)
+        backend = SimpleCache()
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "session_pool", _async_pool(session)),
+        ):
+            first = await stream_service.check_single_stream("https://twitch.tv/Foo")
+            second = await stream_service.check_single_stream(
+                "https://m.twitch.tv/foo?ref=x"
+            )
+
+        assert first.url == "https://twitch.tv/Foo"
+        assert second.url == "https://m.twitch.tv/foo?ref=x"
+        assert second.__dict__["_cached"] is True
+        assert backend.get("status:https://www.twitch.tv/foo").status == "online"
+        assert session.resolve_url.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_scheme_less_url_resolves_as_https(self):
+        """A raw stored URL without a scheme must be resolved as an https URL."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        plugin = _make_plugin_instance()
+        session = _make_session(plugin)
+
+        with (
+            patch.object(stream_service, "cache", SimpleCache()),
+            patch.object(stream_service, "session_pool", _async_pool(session)),
+        ):
+            result = await stream_service.check_single_stream("twitch.tv/Foo")
+
+        assert result.status == "online"
+        assert result.url == "twitch.tv/Foo"
+        session.resolve_url.assert_called_once_with("https://www.twitch.tv/foo")
+
+
+# ===========================================================================
+# Status/resolve cache cross-population
+# ===========================================================================
+
+
+class TestCacheCrossPopulation:
+    """Tests for sharing results between the status and resolve caches."""
+
+    def test_resolution_writes_derived_status(self):
+        """A resolve must leave a matching status entry for status checks."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        plugin = _make_plugin_instance()
+        session = _make_session(plugin)
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "session_pool") as pool,
+        ):
+            pool.get_session.return_value = session
+            stream_service.resolve_stream_details(TWITCH_URL)
+
+            status = asyncio.get_event_loop().run_until_complete(
+                stream_service.check_single_stream(TWITCH_URL)
+            )
+
+        assert status.status == "online"
+        assert status.title == "Test Stream"
+        assert status.platform == "twitch"
+        assert status.__dict__["_cached"] is True
+        assert session.resolve_url.call_count == 1
+
+    def test_offline_resolution_writes_offline_status(self):
+        """An offline resolve must be cached as an offline status too."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        session = _make_session(_make_plugin_instance(streams={}))
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "session_pool") as pool,
+        ):
+            pool.get_session.return_value = session
+            stream_service.resolve_stream_details(TWITCH_URL)
+
+        assert backend.get(f"status:{TWITCH_URL}").status == "offline"
+
+    def test_fresh_offline_status_short_circuits_resolve(self):
+        """resolve_stream() must answer 404 from a fresh offline status."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        backend.set(
+            f"status:{TWITCH_URL}",
+            StreamStatus(url=TWITCH_URL, status="offline"),
+            ttl=60,
+        )
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "session_pool") as pool,
+        ):
+            with pytest.raises(NoStreamsException):
+                asyncio.get_event_loop().run_until_complete(
+                    stream_service.resolve_stream(TWITCH_URL)
+                )
+
+        pool.get_session_async.assert_not_called()
+
+    def test_stale_offline_status_does_not_short_circuit(self):
+        """Only a fresh offline status may skip the resolution."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        backend.set(
+            f"status:{TWITCH_URL}",
+            StreamStatus(url=TWITCH_URL, status="offline"),
+            ttl=0.01,
+            stale_ttl=60,
+        )
+        time.sleep(0.05)
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(
+                stream_service,
+                "resolve_stream_details",
+                return_value={"status": "online"},
+            ),
+            patch.object(stream_service, "session_pool", _async_pool()),
+        ):
+            result = asyncio.get_event_loop().run_until_complete(
+                stream_service.resolve_stream(TWITCH_URL)
+            )
+
+        assert result["status"] == "online"
+
+
+# ===========================================================================
+# Negative caching
+# ===========================================================================
+
+
+class TestNegativeCaching:
+    """Tests for caching failures by error class."""
+
+    def test_no_plugin_is_cached_long_and_answers_resolve(self):
+        """A no-plugin status must be cached for long and answer /resolve with a 400."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        session = MagicMock()
+        session.resolve_url.side_effect = NoPluginError()
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "session_pool", _async_pool(session)),
+            patch.object(stream_service.config, "NEGATIVE_CACHE_PERMANENT_TTL", 3600),
+            patch.object(backend, "set", wraps=backend.set) as cache_set,
+        ):
+            status = asyncio.get_event_loop().run_until_complete(
+                stream_service.check_single_stream(TWITCH_URL)
+            )
+            with pytest.raises(NoPluginException):
+                asyncio.get_event_loop().run_until_complete(
+                    stream_service.resolve_stream(TWITCH_URL)
+                )
+
+        assert status.error_details == {"type": "no_plugin"}
+        cache_set.assert_called_once_with(f"failure:{TWITCH_URL}", status, ttl=3600)
+        assert session.resolve_url.call_count == 1
+
+    def test_browser_required_on_kick_covers_the_platform(self):
+        """A browser-required Kick failure must answer every Kick URL."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        session = MagicMock()
+        session.resolve_url.side_effect = PluginError("Cloudflare challenge")
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "session_pool") as pool,
+        ):
+            pool.get_session.return_value = session
+            with pytest.raises(BrowserRequiredException):
+                stream_service.resolve_stream_details("https://kick.com/first")
+
+            status = asyncio.get_event_loop().run_until_complete(
+                stream_service.check_single_stream("https://kick.com/second")
+            )
+
+        assert status.url == "https://kick.com/second"
+        assert status.error_details["type"] == "browser_required"
+        assert status.__dict__["_cached"] is True
+        assert session.resolve_url.call_count == 1
+
+    def test_browser_required_elsewhere_is_per_url(self):
+        """Browser-required failures on other platforms must stay URL-scoped."""
+        from app.services import stream_service
+
+        with patch.object(stream_service, "cache") as mock_cache:
+            stream_service._cache_failure(
+                TWITCH_URL,
+                stream_service._browser_required_status(TWITCH_URL, "twitch"),
+            )
+
+        assert mock_cache.set.call_args[0][0] == f"failure:{TWITCH_URL}"
+
+    def test_plugin_error_is_cached_briefly_for_both_endpoints(self):
+        """A /resolve plugin error must be cached short and served to status checks."""
+        from app.services import stream_service
+
+        session = MagicMock()
+        session.resolve_url.side_effect = PluginError("channel path malformed")
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool") as pool,
+            patch.object(stream_service.config, "NEGATIVE_CACHE_TRANSIENT_TTL", 30),
+        ):
+            mock_cache.get.return_value = None
+            pool.get_session.return_value = session
+            with pytest.raises(PluginException):
+                stream_service.resolve_stream_details(TWITCH_URL)
+
+        key, failure = mock_cache.set.call_args[0]
+        assert key == f"failure:{TWITCH_URL}"
+        assert failure.error == "Plugin error: channel path malformed"
+        assert mock_cache.set.call_args[1]["ttl"] == 30
+
+    def test_status_timeouts_do_not_answer_resolve(self):
+        """A status check's timeout must not fail a later /resolve."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        timed_out = stream_service._error_status(
+            TWITCH_URL, "twitch", "timeout", "Timed out after 10s"
+        )
+        backend.set(f"failure:{TWITCH_URL}", timed_out, ttl=30)
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(
+                stream_service,
+                "resolve_stream_details",
+                return_value={"status": "online"},
+            ),
+            patch.object(stream_service, "session_pool", _async_pool()),
+        ):
+            result = asyncio.get_event_loop().run_until_complete(
+                stream_service.resolve_stream(TWITCH_URL)
+            )
+
+        assert result["status"] == "online"
+
+    def test_no_streams_on_resolve_caches_offline_status(self):
+        """A NoStreamsError on /resolve must be remembered as an offline status."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        session = MagicMock()
+        session.resolve_url.side_effect = NoStreamsError()
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "session_pool") as pool,
+        ):
+            pool.get_session.return_value = session
+            with pytest.raises(NoStreamsException):
+                stream_service.resolve_stream_details(TWITCH_URL)
+
+        assert backend.get(f"status:{TWITCH_URL}").status == "offline"
+
+    @pytest.mark.asyncio
+    async def test_service_busy_is_not_cached(self):
+        """Our own saturation must not be negative-cached for the URL."""
+        from app.bulkhead import BulkheadFull
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        session = MagicMock()
+        session.resolve_url.side_effect = NoPluginError()
+        bulkhead = MagicMock()
+        bulkhead.slot.side_effect = [
+            BulkheadFull("full"),
+            stream_service.bulkheads.get("twitch").slot(),
+        ]
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "session_pool", _async_pool(session)),
+            patch.object(stream_service.bulkheads, "get", return_value=bulkhead),
+        ):
+            busy = await stream_service.check_single_stream(TWITCH_URL)
+            retried = await stream_service.check_single_stream(TWITCH_URL)
+
+        assert busy.error_details["type"] == "service_busy"
+        assert retried.error_details["type"] == "no_plugin"
+        assert session.resolve_url.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_bypass_ignores_platform_wide_failure(self):
+        """bypass_cache must re-resolve despite a platform-wide failure."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        blocked = stream_service._browser_required_status("https://kick.com/a", "kick")
+        backend.set("failure:platform:kick", blocked, ttl=3600)
+        session = MagicMock()
+        session.resolve_url.side_effect = NoPluginError()
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "session_pool", _async_pool(session)),
+        ):
+            cached = await stream_service.check_single_stream("https://kick.com/b")
+            fresh = await stream_service.check_single_stream(
+                "https://kick.com/b", bypass_cache=True
+            )
+
+        assert cached.error_details["type"] == "browser_required"
+        assert fresh.error_details["type"] == "no_plugin"
+        assert session.resolve_url.call_count == 1
+        assert backend.get("failure:platform:kick") is blocked
+
+
+# ===========================================================================
+# Stale-while-revalidate
+# ===========================================================================
+
+
+class TestStaleWhileRevalidate:
+    """Tests for serving stale cache entries while refreshing them."""
+
+    def test_stale_status_served_and_refreshed_once(self):
+        """Stale hits must return immediately and trigger a single refresh."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        stale = StreamStatus(url=TWITCH_URL, status="offline")
+        backend.set(f"status:{TWITCH_URL}", stale, ttl=0.01, stale_ttl=60)
+        time.sleep(0.05)
+        calls = []
+
+        def resolve(url, session=None, timeout=None):
+            calls.append(url)
+            return StreamStatus(url=url, status="online")
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "session_pool", _async_pool()),
+            patch.object(stream_service, "_resolve_stream_sync", side_effect=resolve),
+        ):
+
+            async def scenario():
+                first = await stream_service.check_single_stream(TWITCH_URL)
+                second = await stream_service.check_single_stream(TWITCH_URL)
+                await asyncio.gather(*stream_service._revalidations)
+                return first, second
+
+            first, second = asyncio.get_event_loop().run_until_complete(scenario())
+
+        assert first.status == "offline"
+        assert first.stale is True
+        assert second.status == "offline"
+        assert len(calls) == 1
+        assert backend.get(f"status:{TWITCH_URL}").status == "online"
+
+    def test_failed_refresh_keeps_stale_resolution(self):
+        """If the background refresh fails, the stale resolution must stay cached."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        stale = {"status": "online", "best_quality": "https://cdn/old.m3u8"}
+        backend.set(f"resolve:{TWITCH_URL}", stale, ttl=0.01, stale_ttl=60)
+        time.sleep(0.05)
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "session_pool", _async_pool()),
+            patch.object(
+                stream_service,
+                "resolve_stream_details",
+                side_effect=PluginException(TWITCH_URL, "boom"),
+            ),
+        ):
+
+            async def scenario():
+                result = await stream_service.resolve_stream(TWITCH_URL)
+                await asyncio.gather(*stream_service._revalidations)
+                return result
+
+            result = asyncio.get_event_loop().run_until_complete(scenario())
+
+        assert result["_stale"] is True
+        assert backend.get_entry(f"resolve:{TWITCH_URL}")[0] is stale
+
+    @pytest.mark.asyncio
+    async def test_cached_failure_suppresses_refresh(self):
+        """A stale hit for a URL with a cached failure must not re-resolve."""
+        from app.cache import SimpleCache
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        backend.set(
+            f"status:{TWITCH_URL}",
+            StreamStatus(url=TWITCH_URL, status="online"),
+            ttl=0.01,
+            stale_ttl=60,
+        )
+        backend.set(
+            f"failure:{TWITCH_URL}",
+            stream_service._plugin_error_status(TWITCH_URL, "twitch", "boom"),
+            ttl=30,
+        )
+        time.sleep(0.05)
+
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "_check_and_cache") as check,
+        ):
+            result = await stream_service.check_single_stream(TWITCH_URL)
+
+        assert result.stale is True
+        check.assert_not_called()
+        assert not stream_service._revalidations
+
+
+# ===========================================================================
+# Single-flight coalescing
+# ===========================================================================
+
+
+class TestRequestCoalescing:
+    """Tests for coalescing concurrent work for the same URL."""
+
+    def test_duplicate_status_checks_resolve_once(self):
+        """Concurrent checks of one URL (e.g. duplicates in a batch) must share work."""
+        calls = []
+
+        def slow_resolve(url, session=None, timeout=None):
+            calls.append(url)
+            time.sleep(0.05)
+            return StreamStatus(url=url, status="online")
+
+        with (
+            patch(
+                "app.services.stream_service._resolve_stream_sync",
+                side_effect=slow_resolve,
+            ),
+            patch("app.services.stream_service.cache") as mock_cache,
+            patch("app.services.stream_service.session_pool", _async_pool()),
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+
+            from app.services.stream_service import check_single_stream
+
+            async def scenario():
+                return await asyncio.gather(
+                    *(check_single_stream(TWITCH_URL) for _ in range(3))
+                )
+
+            results = asyncio.get_event_loop().run_until_complete(scenario())
+
+        assert len(calls) == 1
+        assert all(r.status == "online" for r in results)
+        keys = [call[0][0] for call in mock_cache.set.call_args_list]
+        assert keys.count(f"status:{TWITCH_URL}") == 1
+
+    def test_concurrent_resolves_share_one_resolution(self):
+        """Concurrent /resolve calls for one URL must run Streamlink once."""
+        calls = []
+
+        def slow_details(url, session=None, timeout=None):
+            calls.append(url)
+            time.sleep(0.05)
+            return {"status": "online"}
+
+        with (
+            patch(
+                "app.services.stream_service.resolve_stream_details",
+                side_effect=slow_details,
+            ),
+            patch("app.services.stream_service.cache") as mock_cache,
+            patch("app.services.stream_service.session_pool", _async_pool()),
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+
+            from app.services.stream_service import resolve_stream
+
+            async def scenario():
+                return await asyncio.gather(
+                    resolve_stream(TWITCH_URL), resolve_stream(TWITCH_URL)
+                )
+
+            results = asyncio.get_event_loop().run_until_complete(scenario())
+
+        assert len(calls) == 1
+        assert results == [{"status": "online"}, {"status": "online"}]
+
+
+# ===========================================================================
+# Deadlines
+# ===========================================================================
+
+
+class TestDeadlines:
+    """Tests for abandoning work that outlives the request deadline."""
+
+    def test_slow_status_check_returns_timeout_result(self):
+        """A check past its deadline must return a structured timeout error."""
+        from app.deadline import Deadline
+        from app.services import stream_service
+
+        release = threading.Event()
+        session = MagicMock()
+        pool = _async_pool(session)
+
+        def hung(url, session=None, timeout=None):
+            release.wait(5)
+            return StreamStatus(url=url, status="online")
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool", pool),
+            patch.object(stream_service, "_resolve_stream_sync", side_effect=hung),
+            patch.object(Deadline, "for_request", return_value=Deadline(0.05)),
+        ):
+            mock_cache.get_entry.return_value = (None, False)
+
+            result = asyncio.get_event_loop().run_until_complete(
+                stream_service.check_single_stream(TWITCH_URL)
+            )
+
+            # The hung thread still holds the session
+            pool.return_session.assert_not_called()
+            release.set()
+            asyncio.get_event_loop().run_until_complete(asyncio.sleep(0.1))
+
+        assert result.status == "error"
+        assert result.error_details == {"type": "timeout", "deadline_seconds": 0.05}
+        assert mock_cache.set.call_args[1]["ttl"] == 30
+        pool.return_session.assert_called_once_with(session)
+
+    def test_slow_resolution_raises_gateway_timeout(self):
+        """A resolution past its deadline must raise a 504."""
+        from app.deadline import Deadline
+        from app.exceptions import ResolutionTimeoutException
+        from app.services import stream_service
+
+        def slow(url, session=None, timeout=None):
+            time.sleep(0.2)
+            return {"status": "online"}
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool", _async_pool()),
+            patch.object(stream_service, "resolve_stream_details", side_effect=slow),
+            patch.object(Deadline, "for_request", return_value=Deadline(0.05)),
+        ):
+            mock_cache.get.return_value = None
+            mock_cache.get_entry.return_value = (None, False)
+
+            with pytest.raises(ResolutionTimeoutException) as exc_info:
+                asyncio.get_event_loop().run_until_complete(
+                    stream_service.resolve_stream(TWITCH_URL)
+                )
+
+        assert exc_info.value.status_code == 504
+        assert exc_info.value.detail["deadline_seconds"] == 0.05
+
+    def test_remaining_budget_is_passed_to_the_resolver(self):
+        """The resolver thread must receive the remaining budget as its timeout."""
+        from app.deadline import Deadline
+        from app.services import stream_service
+
+        seen = []
+
+        def resolve(url, session=None, timeout=None):
+            seen.append(timeout)
+            return StreamStatus(url=url, status="offline")
+
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "session_pool", _async_pool()),
+            patch.object(stream_service, "_resolve_stream_sync", side_effect=resolve),
+            patch.object(Deadline, "for_request", return_value=Deadline(8)),
+        ):
+            mock_cache.get_entry.return_value = (None, False)
+            asyncio.get_event_loop().run_until_complete(
+                stream_service.check_single_stream(TWITCH_URL)
+            )
+
+        assert 7 < seen[0] <= 8
+
+    def test_timeout_is_applied_to_session_and_restored(self):
+        """_resolve_stream_sync() must set http/stream timeouts only for the call."""
+        from app.services.stream_service import _resolve_stream_sync
+
+        plugin = _make_plugin_instance()
+        session = _make_session(plugin)
+        options = {"http-timeout": 20.0, "stream-timeout": 60.0}
+        applied = {}
+
+        def set_option(name, value):
+            if not plugin.streams.called:
+                applied[name] = value
+            options[name] = value
+
+        session.get_option.side_effect = options.get
+        session.set_option.side_effect = set_option
+
+        with patch("app.services.stream_service.session_pool"):
+            _resolve_stream_sync(TWITCH_URL, session, timeout=3.0)
+
+        assert applied == {"http-timeout": 3.0, "stream-timeout": 3.0}
+        assert options == {"http-timeout": 20.0, "stream-timeout": 60.0}
+
 
 # ===========================================================================
 # _set_cached_flag
@@ -409,3 +1148,14 @@ class TestSetCachedFlag:
         model = StreamStatus(url=TWITCH_URL, status="online")
         result = _set_cached_flag(model)
         assert result.__dict__.get("_cached") is True
+
+    def test_stale_flag_is_a_field_on_a_copy(self):
+        """Staleness must be a serialized field set on a copy of the cached model."""
+        from app.services.stream_service import _set_cached_flag
+
+        model = StreamStatus(url=TWITCH_URL, status="online")
+        result = _set_cached_flag(model, stale=True)
+
+        assert result is not model
+        assert model.stale is False
+        assert result.model_dump()["stale"] is True
@@ -0,0 +1,500 @@
+"""
+Tests for app/session_pool.py
+
+Covers:
+- StreamlinkSessionPool: initial fill to min_size, checkout/return,
+  background growth while callers wait, hard max_size cap, acquire timeout,
+  idle shrink down to min_size, get_stats
+- acquire() / get_session_async(): event-loop waiting, handoff from worker
+  threads, timeout and cancellation
+- refresh_stale(): rolling replacement by age or use count, one at a time
+- Session health: record_result() counters, recycling of sessions that keep
+  failing or hoard cookies, per-session stats
+- PartitionedSessionPool: per-platform routing, bounds, plugin options,
+  return to the owning partition, aggregated stats
+- Pre-fork support: plugin pre-loading on session build, after_fork() reset
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+def _make_partitioned_pool(sizes):
+    """Return a partitioned pool whose sessions are cheap MagicMocks."""
+    from app.session_pool import PartitionedSessionPool, StreamlinkSessionPool
+
+    with patch.object(
+        StreamlinkSessionPool,
+        "_create_session",
+        side_effect=lambda: MagicMock(),
+    ):
+        pool = PartitionedSessionPool(sizes)
+    for sub_pool in pool.pools.values():
+        sub_pool._create_session = lambda: MagicMock()
+    return pool
+
+
+def _make_pool(**kwargs):
+    """Return a pool whose sessions are cheap MagicMocks."""
+    from app.session_pool import StreamlinkSessionPool
+
+    with patch.object(
+        StreamlinkSessionPool,
+        "_create_session",
+        side_effect=lambda: MagicMock(),
+    ):
+        pool = StreamlinkSessionPool(**kwargs)
+    # Keep session creation mocked for background growth too
+    pool._create_session = lambda: MagicMock()
+    return pool
+
+
+# ===========================================================================
+# StreamlinkSessionPool
+# ===========================================================================
+
+
+class TestElasticSessionPool:
+    """Tests for the elastic StreamlinkSessionPool."""
+
+    def test_initial_fill_creates_min_size_sessions(self):
+        """The pool must start with exactly min_size idle sessions."""
+        pool = _make_pool(min_size=2, max_size=4)
+        assert pool.size() == 2
+        assert pool.pool_size == 2
+
+    def test_max_size_never_below_min_size(self):
+        """max_size must be raised to min_size when configured lower."""
+        pool = _make_pool(min_size=3, max_size=1)
+        assert pool.max_size == 3
+
+    def test_returned_session_is_reused(self):
+        """A returned session must be handed out again instead of a new one."""
+        pool = _make_pool(min_size=1, max_size=1)
+        session = pool.get_session()
+        pool.return_session(session)
+        assert pool.get_session() is session
+
+    def test_grows_in_background_while_callers_wait(self):
+        """An empty pool below max_size must build a session for a waiting caller."""
+        pool = _make_pool(min_size=0, max_size=2)
+        session = pool.get_session(timeout=2)
+        assert session is not None
+        assert pool.pool_size == 1
+
+    def test_hard_cap_queues_instead_of_creating(self):
+        """At max_size, callers must wait for a returned session."""
+        pool = _make_pool(min_size=1, max_size=1)
+        held = pool.get_session()
+
+        threading.Timer(0.05, pool.return_session, args=(held,)).start()
+        session = pool.get_session(timeout=2)
+
+        assert session is held
+        assert pool.pool_size == 1
+
+    def test_acquire_timeout_raises(self):
+        """If no session is returned in time, SessionPoolTimeout must be raised."""
+        from app.session_pool import SessionPoolTimeout
+
+        pool = _make_pool(min_size=1, max_size=1)
+        pool.get_session()
+
+        with pytest.raises(SessionPoolTimeout):
+            pool.get_session(timeout=0.05)
+
+        assert pool.get_stats()["waiting"] == 0
+        assert pool.get_stats()["acquire_timeouts"] == 1
+
+    def test_foreign_session_is_ignored_on_return(self):
+        """Returning a session the pool never handed out must not grow the pool."""
+        pool = _make_pool(min_size=1, max_size=1)
+        pool.return_session(MagicMock())
+        assert pool.size() == 1
+
+    def test_shrink_idle_closes_sessions_down_to_min_size(self):
+        """shrink_idle() must retire long-idle sessions but keep min_size."""
+        pool = _make_pool(min_size=1, max_size=3, idle_timeout=0.01)
+        sessions = [pool.get_session(timeout=2) for _ in range(3)]
+        for s in sessions:
+            pool.return_session(s)
+        time.sleep(0.05)
+
+        retired = pool.shrink_idle()
+
+        assert retired == 2
+        assert pool.pool_size == 1
+        assert pool.size() == 1
+
+    def test_shrink_idle_keeps_recently_used_sessions(self):
+        """Sessions used within idle_timeout must survive shrink_idle()."""
+        pool = _make_pool(min_size=0, max_size=2, idle_timeout=60)
+        pool.return_session(pool.get_session(timeout=2))
+        assert pool.shrink_idle() == 0
+        assert pool.pool_size == 1
+
+    def test_get_stats_reports_bounds_and_usage(self):
+        """get_stats() must expose min/max bounds and current usage."""
+        pool = _make_pool(min_size=1, max_size=4)
+        pool.get_session()
+        stats = pool.get_stats()
+        assert stats["min_size"] == 1
+        assert stats["max_size"] == 4
+        assert stats["in_use"] == 1
+        assert stats["available_sessions"] == 0
+
+
+# ===========================================================================
+# Async acquisition
+# ===========================================================================
+
+
+class TestAsyncAcquire:
+    """Tests for the asyncio-native acquire() API."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_yields_and_returns_session(self):
+        """acquire() must yield a pooled session and return it on exit."""
+        pool = _make_pool(min_size=1, max_size=1)
+        async with pool.acquire() as session:
+            assert pool.size() == 0
+        assert pool.size() == 1
+        assert pool.get_session() is session
+
+    @pytest.mark.asyncio
+    async def test_waiter_is_woken_by_return_from_thread(self):
+        """A session returned from a worker thread must wake an async waiter."""
+        pool = _make_pool(min_size=1, max_size=1)
+        held = pool.get_session()
+
+        threading.Timer(0.05, pool.return_session, args=(held,)).start()
+        session = await pool.get_session_async(timeout=2)
+
+        assert session is held
+
+    @pytest.mark.asyncio
+    async def test_many_waiters_do_not_use_threads(self):
+        """Queued acquirers must be served in turn without extra threads."""
+        pool = _make_pool(min_size=1, max_size=1)
+        seen = []
+
+        async def _use():
+            async with pool.acquire(timeout=2) as session:
+                seen.append(session)
+                await asyncio.sleep(0)
+
+        threads_before = threading.active_count()
+        await asyncio.gather(*[_use() for _ in range(50)])
+
+        assert len(seen) == 50
+        assert len({id(s) for s in seen}) == 1
+        assert threading.active_count() <= threads_before
+
+    @pytest.mark.asyncio
+    async def test_async_timeout_raises_and_dequeues(self):
+        """Timing out must raise SessionPoolTimeout and leave no waiter behind."""
+        from app.session_pool import SessionPoolTimeout
+
+        pool = _make_pool(min_size=1, max_size=1)
+        pool.get_session()
+
+        with pytest.raises(SessionPoolTimeout):
+            await pool.get_session_async(timeout=0.05)
+
+        assert pool.get_stats()["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_session(self):
+        """Cancelling a queued acquire must not swallow the next returned session."""
+        pool = _make_pool(min_size=1, max_size=1)
+        held = pool.get_session()
+
+        task = asyncio.create_task(pool.get_session_async(timeout=2))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        pool.return_session(held)
+        assert pool.size() == 1
+
+
+# ===========================================================================
+# Rolling refresh
+# ===========================================================================
+
+
+class TestRollingRefresh:
+    """Tests for the background refresh_stale() job."""
+
+    def test_no_refresh_when_sessions_are_fresh(self):
+        """refresh_stale() must leave young, lightly used sessions alone."""
+        pool = _make_pool(min_size=2, max_size=2)
+        assert pool.refresh_stale() is False
+
+    def test_replaces_one_aged_session_per_call(self):
+        """Only one session older than refresh_interval is replaced per call."""
+        pool = _make_pool(min_size=2, max_size=2, refresh_interval=0.01)
+        old = set(map(id, (e.session for e in pool._idle)))
+        time.sleep(0.05)
+
+        assert pool.refresh_stale() is True
+
+        current = set(map(id, (e.session for e in pool._idle)))
+        assert len(current - old) == 1
+        assert pool.pool_size == 2
+        assert pool.get_stats()["refreshed_sessions"] == 1
+
+    def test_replaces_session_after_max_uses(self):
+        """A session handed out max_uses times must be picked for refresh."""
+        pool = _make_pool(min_size=1, max_size=1, max_uses=2)
+        session = pool.get_session()
+        pool.return_session(session)
+        pool.return_session(pool.get_session())
+
+        assert pool.refresh_stale() is True
+        assert pool.get_session() is not session
+
+    def test_get_session_never_triggers_refresh(self):
+        """Acquiring a session must not rebuild sessions on the request path."""
+        pool = _make_pool(min_size=1, max_size=1, refresh_interval=0)
+        pool._create_session = MagicMock(side_effect=AssertionError("rebuilt"))
+        session = pool.get_session()
+        assert session is not None
+
+    def test_checked_out_sessions_are_not_refreshed(self):
+        """Sessions in use must keep serving; only idle ones are replaced."""
+        pool = _make_pool(min_size=1, max_size=1, refresh_interval=0)
+        held = pool.get_session()
+        assert pool.refresh_stale() is False
+        pool.return_session(held)
+        assert pool.size() == 1
+
+    def test_failed_rebuild_keeps_old_session(self):
+        """If building the replacement fails, the old session goes back into rotation."""
+        pool = _make_pool(min_size=1, max_size=1, refresh_interval=0)
+        pool._create_session = MagicMock(side_effect=RuntimeError("boom"))
+
+        assert pool.refresh_stale() is False
+        assert pool.size() == 1
+        assert pool.pool_size == 1
+
+
+# ===========================================================================
+# Session health
+# ===========================================================================
+
+
+class TestSessionHealth:
+    """Tests for failure tracking and poisoned-session recycling."""
+
+    def test_record_result_counts_consecutive_failures(self):
+        """Failures must accumulate and a success must reset the streak."""
+        pool = _make_pool(min_size=1, max_size=1)
+        session = pool.get_session()
+
+        pool.record_result(session, RuntimeError("boom"))
+        pool.record_result(session, RuntimeError("boom"))
+        pool.record_result(session)
+
+        entry = pool._in_use[id(session)]
+        assert entry.failures == 2
+        assert entry.consecutive_failures == 0
+        assert entry.last_error == "RuntimeError"
+
+    def test_session_recycled_after_max_failures(self):
+        """A session failing max_failures times in a row must not be reused."""
+        pool = _make_pool(min_size=1, max_size=1)
+        pool.max_failures = 2
+        session = pool.get_session()
+        pool.record_result(session, RuntimeError("boom"))
+        pool.record_result(session, RuntimeError("boom"))
+
+        pool.return_session(session)
+
+        session.http.close.assert_called_once()
+        assert pool.get_session(timeout=2) is not session
+        assert pool.get_stats()["recycled_sessions"] == 1
+        assert pool.pool_size == 1
+
+    def test_occasional_failures_keep_session(self):
+        """Failures separated by successes must not recycle the session."""
+        pool = _make_pool(min_size=1, max_size=1)
+        pool.max_failures = 2
+        session = pool.get_session()
+        pool.record_result(session, RuntimeError("boom"))
+        pool.record_result(session)
+
+        pool.return_session(session)
+
+        assert pool.get_session() is session
+
+    def test_session_recycled_when_cookie_jar_too_large(self):
+        """A session whose cookie jar exceeds max_cookie_bytes must be recycled."""
+        pool = _make_pool(min_size=1, max_size=1)
+        pool.max_cookie_bytes = 10
+        session = pool.get_session()
+        cookie = MagicMock(value="x" * 100, domain="twitch.tv")
+        cookie.name = "session"
+        session.http.cookies = [cookie]
+
+        pool.return_session(session)
+
+        assert pool.get_stats()["recycled_sessions"] == 1
+        assert pool.get_session(timeout=2) is not session
+
+    def test_record_result_ignores_foreign_session(self):
+        """Recording a result for a session the pool didn't hand out is a no-op."""
+        pool = _make_pool(min_size=1, max_size=1)
+        pool.record_result(MagicMock(), RuntimeError("boom"))
+        assert pool.get_stats()["recycled_sessions"] == 0
+
+    def test_get_stats_lists_per_session_health(self):
+        """get_stats() must report age, uses and failures of every session."""
+        pool = _make_pool(min_size=2, max_size=2)
+        session = pool.get_session()
+        pool.record_result(session, RuntimeError("boom"))
+
+        sessions = pool.get_stats()["sessions"]
+
+        assert len(sessions) == 2
+        in_use = [s for s in sessions if s["state"] == "in_use"]
+        assert in_use[0]["requests_served"] == 1
+        assert in_use[0]["failures"] == 1
+        assert in_use[0]["last_error"] == "RuntimeError"
+
+    def test_partitioned_record_result_goes_to_owning_partition(self):
+        """PartitionedSessionPool must record results on the owning partition."""
+        pool = _make_partitioned_pool({"twitch": "1:1"})
+        session = pool.get_session("twitch")
+
+        pool.record_result(session, RuntimeError("boom"))
+
+        entry = pool.pools["twitch"]._in_use[id(session)]
+        assert entry.failures == 1
+
+
+# ===========================================================================
+# PartitionedSessionPool
+# ===========================================================================
+
+
+class TestPartitionedSessionPool:
+    """Tests for the per-platform PartitionedSessionPool."""
+
+    def test_configured_platforms_get_own_partition(self):
+        """Each configured platform must get a sub-pool with its own bounds."""
+        pool = _make_partitioned_pool({"twitch": "1:5", "youtube": "3"})
+        assert pool.pool_for("twitch").min_size == 1
+        assert pool.pool_for("twitch").max_size == 5
+        assert pool.pool_for("youtube").min_size == 0
+        assert pool.pool_for("youtube").max_size == 3
+
+    def test_unlisted_platforms_share_default_partition(self):
+        """Platforms without their own partition must use the default one."""
+        from app.session_pool import DEFAULT_PARTITION
+
+        pool = _make_partitioned_pool({"twitch": "1:2"})
+        assert pool.pool_for("vimeo") is pool.pools[DEFAULT_PARTITION]
+
+    def test_twitch_plugin_options_are_prebuilt(self):
+        """The twitch partition must carry its plugin options from creation."""
+        pool = _make_partitioned_pool({"twitch": "1:2"})
+        options = pool.plugin_options("twitch")
+        assert options["low-latency"] is True
+        assert "av1" in options["supported-codecs"]
+        assert pool.plugin_options("youtube") == {}
+
+    def test_sessions_are_not_reconfigured_on_checkout(self):
+        """Checking out a session must not call set_option on it."""
+        pool = _make_partitioned_pool({"twitch": "1:2"})
+        session = pool.get_session("twitch")
+        session.set_option.assert_not_called()
+
+    def test_return_goes_to_owning_partition(self):
+        """A returned session must go back to the partition it came from."""
+        pool = _make_partitioned_pool({"twitch": "1:1", "kick": "1:1"})
+        session = pool.get_session("kick")
+        pool.return_session(session)
+        assert pool.pool_for("kick").size() == 1
+        assert pool.pool_for("twitch").size() == 1
+
+    def test_exhausted_platform_does_not_block_others(self):
+        """A platform at its cap must not prevent other platforms from acquiring."""
+        from app.session_pool import SessionPoolTimeout
+
+        pool = _make_partitioned_pool({"twitch": "1:1", "youtube": "1:1"})
+        pool.get_session("youtube")
+
+        with pytest.raises(SessionPoolTimeout):
+            pool.get_session("youtube", timeout=0.01)
+        assert pool.get_session("twitch", timeout=0.01) is not None
+
+    @pytest.mark.asyncio
+    async def test_async_acquire_uses_platform_partition(self):
+        """acquire(platform) must borrow from that platform's partition."""
+        pool = _make_partitioned_pool({"twitch": "1:1"})
+        async with pool.acquire("twitch"):
+            assert pool.pool_for("twitch").size() == 0
+        assert pool.pool_for("twitch").size() == 1
+
+    def test_get_stats_aggregates_partitions(self):
+        """get_stats() must sum partitions and list each one."""
+        pool = _make_partitioned_pool({"twitch": "2:4"})
+        stats = pool.get_stats()
+        assert "twitch" in stats["partitions"]
+        assert stats["available_sessions"] == pool.size()
+
+
+# ===========================================================================
+# Pre-fork warm start
+# ===========================================================================
+
+
+class TestPreforkWarmStart:
+    """Tests for plugin pre-loading and post-fork re-initialisation."""
+
+    def test_session_build_preloads_partition_plugin(self):
+        """Building a twitch session must load the twitch plugin up front."""
+        from app.session_pool import PLATFORM_WARMUP_URLS, StreamlinkSessionPool
+
+        with (
+            patch.object(StreamlinkSessionPool, "_create_sessions"),
+            patch("app.session_pool.Streamlink") as streamlink_cls,
+            patch("app.session_pool.plugin_index") as index,
+        ):
+            pool = StreamlinkSessionPool(platform="twitch")
+            session = pool._create_session()
+
+        assert session is streamlink_cls.return_value
+        index.preload.assert_called_once_with(session, PLATFORM_WARMUP_URLS["twitch"])
+
+    def test_default_partition_skips_plugin_preload(self):
+        """The shared default partition must not pre-load any plugin."""
+        from app.session_pool import StreamlinkSessionPool
+
+        with (
+            patch.object(StreamlinkSessionPool, "_create_sessions"),
+            patch("app.session_pool.Streamlink"),
+            patch("app.session_pool.plugin_index") as index,
+        ):
+            StreamlinkSessionPool()._create_session()
+
+        index.preload.assert_not_called()
+
+    def test_after_fork_resets_lock_and_drops_inherited_connections(self):
+        """after_fork() must give the worker a new lock and close inherited sockets."""
+        pool = _make_partitioned_pool({"twitch": "1:2"})
+        sub_pool = pool.pool_for("twitch")
+        old_lock = sub_pool.lock
+        session = sub_pool._idle[0].session
+
+        pool.after_fork()
+
+        assert sub_pool.lock is not old_lock
+        session.http.close.assert_called_once()
+        assert pool.get_session("twitch") is session
@@ -0,0 +1,191 @@
+"""
+Tests for app/single_flight.py
+
+Covers:
+- In-process coalescing: one call per key for concurrent callers, separate
+  keys, shared exceptions, cancellation of one caller, key reuse after
+  completion
+- Distributed mode: lock taken and released, waiting for another worker's
+  cached result or published outcome (uncached results and API errors),
+  fallback when the lock holder leaves no result
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.cache import SimpleCache
+from app.exceptions import NoStreamsException, StreamlinkAPIException
+from app.single_flight import SingleFlight
+
+
+class _Counter:
+    """Async work that counts calls and waits a little to overlap callers."""
+
+    def __init__(self, result="ok", error=None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class TestInProcessCoalescing:
+    """Tests for coalescing within one event loop."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """Concurrent callers for the same key must trigger the work once."""
+        flight = SingleFlight(distributed=False)
+        work = _Counter()
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+        assert results == ["ok"] * 5
+        assert work.calls == 1
+        stats = flight.get_stats()
+        assert stats["leaders"] == 1
+        assert stats["coalesced"] == 4
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Different keys must not be coalesced."""
+        flight = SingleFlight(distributed=False)
+        work = _Counter()
+
+        await asyncio.gather(flight.do("a", work), flight.do("b", work))
+        assert work.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared(self):
+        """Every coalesced caller must see the leader's exception."""
+        flight = SingleFlight(distributed=False)
+        work = _Counter(error=RuntimeError("boom"))
+
+        results = await asyncio.gather(
+            flight.do("k", work), flight.do("k", work), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert work.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Cancelling one caller must leave the shared work running."""
+        flight = SingleFlight(distributed=False)
+        work = _Counter()
+
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "ok"
+        assert work.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_key_is_released_after_completion(self):
+        """Sequential calls must each do their own work."""
+        flight = SingleFlight(distributed=False)
+        work = _Counter()
+
+        await flight.do("k", work)
+        await flight.do("k", work)
+
+        assert work.calls == 2
+
+
+class TestDistributedCoalescing:
+    """Tests for the cross-worker lock in the cache backend."""
+
+    @pytest.fixture()
+    def shared_cache(self):
+        backend = SimpleCache()
+        with patch("app.single_flight.cache", backend):
+            yield backend
+
+    @pytest.mark.asyncio
+    async def test_leader_takes_and_releases_lock(self, shared_cache):
+        """The leader must hold lock:<key> while working and drop it after."""
+        flight = SingleFlight(distributed=True, lock_ttl=5)
+        seen = {}
+
+        async def work():
+            seen["lock"] = shared_cache.get("lock:status:x")
+            return "ok"
+
+        assert await flight.do("status:x", work) == "ok"
+        assert seen["lock"] is not None
+        assert shared_cache.get("lock:status:x") is None
+
+    @pytest.mark.asyncio
+    async def test_waits_for_other_workers_result(self, shared_cache):
+        """If another worker holds the lock, its cached result must be used."""
+        flight = SingleFlight(distributed=True, lock_ttl=5, poll_interval=0.01)
+        work = _Counter()
+        shared_cache.add("lock:status:x", 1, ttl=5)
+
+        async def other_worker():
+            await asyncio.sleep(0.03)
+            shared_cache.set("status:x", "remote")
+
+        asyncio.ensure_future(other_worker())
+        assert await flight.do("status:x", work) == "remote"
+        assert work.calls == 0
+        assert flight.get_stats()["remote_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_resolves_locally_when_lock_released_without_result(
+        self, shared_cache
+    ):
+        """If the lock holder gives up without caching, the work must run here."""
+        flight = SingleFlight(distributed=True, lock_ttl=5, poll_interval=0.01)
+        work = _Counter()
+        shared_cache.add("lock:status:x", 1, ttl=5)
+
+        async def other_worker():
+            await asyncio.sleep(0.03)
+            shared_cache.delete("lock:status:x")
+
+        asyncio.ensure_future(other_worker())
+        assert await flight.do("status:x", work) == "ok"
+        assert work.calls == 1
+        assert shared_cache.get("lock:status:x") is None
+
+    @pytest.mark.asyncio
+    async def test_uncached_result_reaches_other_workers(self, shared_cache):
+        """A result the leader didn't cache must still be shared via its outcome."""
+        leader = SingleFlight(distributed=True, lock_ttl=5, poll_interval=0.01)
+        follower = SingleFlight(distributed=True, lock_ttl=5, poll_interval=0.01)
+        leader_work, follower_work = _Counter("fresh"), _Counter()
+
+        first = asyncio.ensure_future(leader.do("resolve:x", leader_work))
+        await asyncio.sleep(0)
+        assert await follower.do("resolve:x", follower_work) == "fresh"
+        assert await first == "fresh"
+        assert follower_work.calls == 0
+        assert follower.get_stats()["remote_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_leader_error_reaches_other_workers(self, shared_cache):
+        """An API error raised by the leader must be raised by waiting workers too."""
+        leader = SingleFlight(distributed=True, lock_ttl=5, poll_interval=0.01)
+        follower = SingleFlight(distributed=True, lock_ttl=5, poll_interval=0.01)
+        follower_work = _Counter()
+        error = NoStreamsException("https://www.twitch.tv/foo")
+
+        first = asyncio.ensure_future(leader.do("resolve:x", _Counter(error=error)))
+        await asyncio.sleep(0)
+        with pytest.raises(StreamlinkAPIException) as exc_info:
+            await follower.do("resolve:x", follower_work)
+        with pytest.raises(NoStreamsException):
+            await first
+        raised = exc_info.value
+        assert raised.status_code == 404
+        assert raised.detail == error.detail
+        assert raised.error_type == "no_streams"
+        assert follower_work.calls == 0
@@ -0,0 +1,196 @@
+"""
+Tests for app/services/status_jobs.py
+
+Covers:
+- submit(): initial progress stored in the cache, background execution,
+  cap on running jobs
+- _run_job(): chunked checks, per-chunk progress and results, exceptions
+  as error statuses, failed jobs, lease renewed during slow chunks
+- get_job() / get_results(): unknown jobs, jobs whose lease lapsed marked
+  failed, partial results from an offset
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.cache import SimpleCache
+from app.models import StreamStatus
+from app.services import status_jobs
+
+URLS = [f"https://www.twitch.tv/chan{i}" for i in range(5)]
+
+
+async def _online(url):
+    return StreamStatus(url=url, status="online", platform="twitch")
+
+
+@pytest.fixture()
+def backend():
+    """A fresh in-memory cache backend and a chunk size of 2."""
+    backend = SimpleCache()
+    with (
+        patch.object(status_jobs, "cache", backend),
+        patch.object(status_jobs.config, "STATUS_JOB_CHUNK_SIZE", 2),
+    ):
+        yield backend
+
+
+async def _finish(job_id):
+    while status_jobs.get_job(job_id)["state"] == "running":
+        await asyncio.sleep(0)
+
+
+class TestSubmit:
+    """Tests for starting a job."""
+
+    @pytest.mark.asyncio
+    async def test_submit_stores_progress_and_runs(self, backend):
+        """A job must be visible right away and complete in the background."""
+        with patch.object(
+            status_jobs.stream_service, "check_single_stream", new=_online
+        ):
+            job = status_jobs.submit(URLS)
+            assert status_jobs.get_job(job["job_id"])["state"] == "running"
+            await _finish(job["job_id"])
+            job_id = job["job_id"]
+
+        job = status_jobs.get_job(job_id)
+        assert job["state"] == "done"
+        assert job["total"] == 5
+        assert job["completed"] == 5
+        assert job["chunks_done"] == 3
+        assert [r["url"] for r in status_jobs.get_results(job)] == URLS
+
+    def test_unknown_job(self, backend):
+        """An unknown or expired job id must return None."""
+        assert status_jobs.get_job("missing") is None
+
+    def test_running_jobs_are_capped(self, backend):
+        """Past STATUS_JOB_MAX_RUNNING, new jobs must be rejected."""
+        with (
+            patch.object(status_jobs.config, "STATUS_JOB_MAX_RUNNING", 1),
+            patch.object(status_jobs, "_jobs", {object()}),
+        ):
+            with pytest.raises(status_jobs.TooManyJobs):
+                status_jobs.submit(URLS)
+
+    def test_job_with_lapsed_lease_is_failed(self, backend):
+        """A running job whose worker stopped renewing it must read as failed."""
+        backend.set(
+            "job:abc",
+            {
+                "job_id": "abc",
+                "state": "running",
+                "chunk_size": 2,
+                "chunks_done": 1,
+                "lease_expires_at": time.time() - 1,
+            },
+        )
+
+        job = status_jobs.get_job("abc")
+
+        assert job["state"] == "failed"
+        assert job["chunks_done"] == 1
+        assert backend.get("job:abc")["state"] == "failed"
+
+
+class TestRunJob:
+    """Tests for chunked job execution."""
+
+    def _job(self):
+        return {"job_id": "abc", "state": "running", "total": 5, "completed": 0}
+
+    @pytest.mark.asyncio
+    async def test_chunks_run_one_after_another(self, backend):
+        """URLs must be checked in chunks, each chunk concurrently."""
+        in_flight, peak = 0, 0
+
+        async def check(url):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return await _online(url)
+
+        job = {**self._job(), "chunk_size": 2, "chunks_done": 0}
+        with patch.object(status_jobs.stream_service, "check_single_stream", new=check):
+            await status_jobs._run_job(job, URLS)
+
+        assert peak == 2
+        assert backend.get("job:abc:chunk:2")[0]["url"] == URLS[4]
+
+    @pytest.mark.asyncio
+    async def test_exceptions_become_error_statuses(self, backend):
+        """A check that raises must be recorded as status=error for its URL."""
+        job = {**self._job(), "chunk_size": 2, "chunks_done": 0}
+        with patch.object(
+            status_jobs.stream_service,
+            "check_single_stream",
+            new=AsyncMock(side_effect=RuntimeError("boom")),
+        ):
+            await status_jobs._run_job(job, URLS[:1])
+
+        result = status_jobs.get_results(status_jobs.get_job("abc"))[0]
+        assert result["status"] == "error"
+        assert result["error"] == "boom"
+
+    @pytest.mark.asyncio
+    async def test_lease_is_renewed_during_slow_chunks(self, backend):
+        """A job stuck on one chunk must keep its lease while it works."""
+
+        async def slow(url):
+            await asyncio.sleep(0.1)
+            return await _online(url)
+
+        job = {**self._job(), "chunk_size": 2, "chunks_done": 0}
+        backend.set("job:abc", {**job, "lease_expires_at": time.time() + 0.03})
+        with (
+            patch.object(status_jobs.config, "STATUS_JOB_LEASE", 0.03),
+            patch.object(status_jobs.stream_service, "check_single_stream", new=slow),
+        ):
+            task = asyncio.ensure_future(status_jobs._run_job(job, URLS[:1]))
+            await asyncio.sleep(0.07)
+            state = status_jobs.get_job("abc")["state"]
+            await task
+            assert state == "running"
+
+        assert status_jobs.get_job("abc")["state"] == "done"
+
+    @pytest.mark.asyncio
+    async def test_failure_marks_job_failed(self, backend):
+        """A job that can't continue must end as failed, keeping its progress."""
+        job = {**self._job(), "chunk_size": 2, "chunks_done": 0}
+        with (
+            patch.object(
+                status_jobs.stream_service, "check_single_stream", new=_online
+            ),
+            patch.object(
+                status_jobs,
+                "_chunk_key",
+                side_effect=["job:abc:chunk:0", RuntimeError("cache down")],
+            ),
+        ):
+            await status_jobs._run_job(job, URLS)
+
+        stored = status_jobs.get_job("abc")
+        assert stored["state"] == "failed"
+        assert stored["completed"] == 2
+        assert stored["error"] == "cache down"
+
+
+class TestGetResults:
+    """Tests for reading partial results."""
+
+    def test_results_from_offset(self, backend):
+        """Results must start at the offset, across chunk boundaries."""
+        job = {"job_id": "abc", "chunk_size": 2, "chunks_done": 2}
+        backend.set("job:abc:chunk:0", [{"url": "a"}, {"url": "b"}])
+        backend.set("job:abc:chunk:1", [{"url": "c"}, {"url": "d"}])
+
+        assert [r["url"] for r in status_jobs.get_results(job, 1)] == ["b", "c", "d"]
+        assert [r["url"] for r in status_jobs.get_results(job, 3)] == ["d"]
+        assert status_jobs.get_results(job, 4) == []
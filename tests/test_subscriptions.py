@@ -0,0 +1,173 @@
+"""
+Tests for app/services/subscriptions.py
+
+Covers:
+- StatusSubscriptions: one shared watcher per URL, transitions only,
+  current status for late subscribers, check errors, watcher shutdown
+  with the last subscriber, stats, equivalent URLs sharing a watcher with
+  statuses delivered under each subscriber's URL
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.models import StreamStatus
+from app.services.subscriptions import StatusSubscriptions
+
+URL = "https://www.twitch.tv/foo"
+
+
+def _checker(*statuses):
+    """A check_single_stream stand-in returning the given statuses in turn."""
+    calls = []
+
+    async def check(url):
+        calls.append(url)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        if isinstance(status, Exception):
+            raise status
+        return StreamStatus(url=url, status=status)
+
+    return check, calls
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait().status)
+    return items
+
+
+async def _ticks(n=5):
+    for _ in range(n):
+        await asyncio.sleep(0)
+
+
+class TestStatusSubscriptions:
+    """Tests for the shared per-URL watchers."""
+
+    @pytest.mark.asyncio
+    async def test_only_transitions_are_published(self):
+        """Re-confirmed statuses must not be sent again."""
+        subs = StatusSubscriptions(interval=0)
+        check, calls = _checker("offline", "offline", "online", "online")
+
+        with patch(
+            "app.services.subscriptions.stream_service.check_single_stream",
+            new=check,
+        ):
+            queue = asyncio.Queue()
+            subs.subscribe(URL, queue)
+            await _ticks(10)
+            subs.unsubscribe(URL, queue)
+
+        assert len(calls) > 3
+        assert _drain(queue) == ["offline", "online"]
+
+    @pytest.mark.asyncio
+    async def test_one_watcher_per_url(self):
+        """Many subscribers of one URL must share a single check schedule."""
+        subs = StatusSubscriptions(interval=60)
+        check, calls = _checker("online")
+
+        with patch(
+            "app.services.subscriptions.stream_service.check_single_stream",
+            new=check,
+        ):
+            queues = [asyncio.Queue() for _ in range(3)]
+            for queue in queues:
+                subs.subscribe(URL, queue)
+            await _ticks()
+            stats = subs.get_stats()
+            for queue in queues:
+                subs.unsubscribe(URL, queue)
+
+        assert len(calls) == 1
+        assert [_drain(queue) for queue in queues] == [["online"]] * 3
+        assert stats["watched_urls"] == 1
+        assert stats["subscriptions"] == 3
+
+    @pytest.mark.asyncio
+    async def test_late_subscriber_gets_current_status(self):
+        """A new subscriber must get the last known status right away."""
+        subs = StatusSubscriptions(interval=60)
+        check, calls = _checker("online")
+
+        with patch(
+            "app.services.subscriptions.stream_service.check_single_stream",
+            new=check,
+        ):
+            first, late = asyncio.Queue(), asyncio.Queue()
+            subs.subscribe(URL, first)
+            await _ticks()
+            subs.subscribe(URL, late)
+            current = _drain(late)
+            subs.unsubscribe(URL, first)
+            subs.unsubscribe(URL, late)
+            assert current == ["online"]
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_check_errors_become_error_status(self):
+        """A check that raises must be published as status=error."""
+        subs = StatusSubscriptions(interval=60)
+        check, _ = _checker(RuntimeError("boom"))
+
+        with patch(
+            "app.services.subscriptions.stream_service.check_single_stream",
+            new=check,
+        ):
+            queue = asyncio.Queue()
+            subs.subscribe(URL, queue)
+            await _ticks()
+            subs.unsubscribe(URL, queue)
+            status = queue.get_nowait()
+
+        assert status.status == "error"
+        assert status.error == "boom"
+
+    @pytest.mark.asyncio
+    async def test_last_unsubscribe_stops_watcher(self):
+        """The watcher must stop once its URL has no subscribers left."""
+        subs = StatusSubscriptions(interval=60)
+        check, _ = _checker("online")
+
+        with patch(
+            "app.services.subscriptions.stream_service.check_single_stream",
+            new=check,
+        ):
+            queue = asyncio.Queue()
+            subs.subscribe(URL, queue)
+            await _ticks()
+            watcher = subs._watchers[URL]
+            subs.unsubscribe(URL, queue)
+            await _ticks()
+
+        assert watcher.cancelled()
+        assert subs.get_stats()["watched_urls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_equivalent_urls_share_a_watcher(self):
+        """Spellings of one stream must share a watcher but keep their own URL."""
+        subs = StatusSubscriptions(interval=60)
+        check, calls = _checker("online")
+
+        with patch(
+            "app.services.subscriptions.stream_service.check_single_stream",
+            new=check,
+        ):
+            first, second = asyncio.Queue(), asyncio.Queue()
+            subs.subscribe("https://m.twitch.tv/Foo", first)
+            subs.subscribe(URL + "?ref=x", second)
+            await _ticks()
+            stats = subs.get_stats()
+            subs.unsubscribe("https://m.twitch.tv/Foo", first)
+            subs.unsubscribe(URL + "?ref=x", second)
+
+        assert calls == [URL]
+        assert stats["watched_urls"] == 1
+        assert first.get_nowait().url == "https://m.twitch.tv/Foo"
+        assert second.get_nowait().url == URL + "?ref=x"
+        assert subs.get_stats()["watched_urls"] == 0
@@ -0,0 +1,296 @@
+"""
+Tests for app/ttl.py
+
+Covers:
+- url_expiry(): YouTube path/query expiries, Twitch usher token JSON,
+  URLs without an expiry, implausible values
+- playback_ttl(): earliest expiry wins, safety margin, cap, stale window
+  clipped to the expiry, URLs too close to expiry
+- _cache_resolution(): resolve entries cached by playback TTL, including
+  the expiry of the multivariant playlist behind Twitch variant URLs
+- record_status() / status_ttl(): transition history, flip-rate and
+  recency weighting, min/max bounds, default TTL as the floor for channels
+  that have not flipped yet
+- _cache_status(): default TTL for unseen channels, adaptive afterwards
+"""
+
+import json
+import time
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+import pytest
+from streamlink import Streamlink
+from streamlink.plugins.twitch import TwitchHLSStream
+from streamlink.stream.hls import M3U8
+
+from app.ttl import playback_ttl, record_status, status_ttl, url_expiry
+
+NOW = 1_700_000_000
+
+
+def _twitch_usher(expires):
+    token = json.dumps({"channel": "foo", "expires": expires})
+    return "https://usher.ttvnw.net/api/channel/hls/foo.m3u8?" + urlencode(
+        {"sig": "abc", "token": token}
+    )
+
+
+@pytest.fixture()
+def ttl_config():
+    """Pin the TTL settings the expectations below are computed from."""
+    with patch("app.ttl.config") as mock_config:
+        mock_config.RESOLVE_TTL = 300
+        mock_config.RESOLVE_STALE_TTL = 120
+        mock_config.RESOLVE_MAX_TTL = 3600
+        mock_config.PLAYBACK_EXPIRY_MARGIN = 60
+        mock_config.STATUS_TTL = 120
+        mock_config.STATUS_TTL_MIN = 30
+        mock_config.STATUS_TTL_MAX = 600
+        mock_config.STATUS_TTL_SCALE = 0.05
+        yield mock_config
+
+
+class TestUrlExpiry:
+    """Tests for reading expiries out of signed playback URLs."""
+
+    def test_youtube_path_expiry(self):
+        """Google manifest URLs carry the expiry as a path segment."""
+        url = (
+            "https://manifest.googlevideo.com/api/manifest/hls_variant"
+            f"/expire/{NOW + 21600}/ei/xyz/file/index.m3u8"
+        )
+        assert url_expiry(url) == NOW + 21600
+
+    def test_query_expiry(self):
+        """expire=/expires= query parameters must be read."""
+        url = f"https://cdn.example.com/live.m3u8?expires={NOW + 600}&sig=x"
+        assert url_expiry(url) == NOW + 600
+
+    def test_twitch_usher_token(self):
+        """The expiry inside a Twitch access token must be read."""
+        assert url_expiry(_twitch_usher(NOW + 1200)) == NOW + 1200
+
+    def test_no_expiry(self):
+        """Unsigned URLs have no expiry."""
+        assert url_expiry("https://cdn.example.com/live.m3u8?foo=1") is None
+
+    def test_implausible_values_are_ignored(self):
+        """Durations and garbage must not be taken for timestamps."""
+        assert url_expiry("https://cdn.example.com/a.m3u8?exp=3600") is None
+        assert url_expiry("https://cdn.example.com/a.m3u8?expire=soon") is None
+
+
+class TestPlaybackTtl:
+    """Tests for turning playback URL expiries into cache TTLs."""
+
+    def test_default_without_expiry(self, ttl_config):
+        """URLs without expiries must use the default TTL and stale window."""
+        assert playback_ttl(["https://cdn.example.com/a.m3u8"], now=NOW) == (300, 120)
+
+    def test_earliest_expiry_minus_margin(self, ttl_config):
+        """The shortest-lived URL must bound the TTL, with no stale window."""
+        urls = [
+            f"https://cdn.example.com/a.m3u8?expires={NOW + 900}",
+            _twitch_usher(NOW + 400),
+        ]
+        assert playback_ttl(urls, now=NOW) == (340, 0)
+
+    def test_long_lived_urls_are_capped(self, ttl_config):
+        """Hours-long signatures must be cached up to the cap, then stale."""
+        url = f"https://cdn.example.com/a.m3u8?expires={NOW + 21600}"
+        assert playback_ttl([url], now=NOW) == (3600, 120)
+
+    def test_stale_window_ends_before_expiry(self, ttl_config):
+        """A stale entry must never outlive its URLs' expiry margin."""
+        url = f"https://cdn.example.com/a.m3u8?expires={NOW + 3700}"
+        assert playback_ttl([url], now=NOW) == (3600, 40)
+
+    def test_nearly_expired_urls_are_not_cached(self, ttl_config):
+        """URLs inside the safety margin must not be cached."""
+        url = f"https://cdn.example.com/a.m3u8?expires={NOW + 30}"
+        assert playback_ttl([url], now=NOW) == (0, 0)
+
+
+class TestResolutionCaching:
+    """Tests for playback TTLs in stream_service._cache_resolution()."""
+
+    def test_online_resolution_uses_playback_ttl(self):
+        """An online resolve entry must be cached by its URLs' expiry."""
+        from app.services import stream_service
+
+        result = {"status": "online", "all_qualities": {"best": "https://a"}}
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "playback_ttl", return_value=(500, 0)),
+        ):
+            stream_service._cache_resolution("https://www.twitch.tv/foo", result)
+
+        resolve_call = mock_cache.set.call_args_list[0]
+        assert resolve_call[0][0] == "resolve:https://www.twitch.tv/foo"
+        assert resolve_call[1] == {"ttl": 500, "stale_ttl": 0}
+
+    def test_expiring_resolution_is_not_cached(self):
+        """A resolution whose URLs are about to expire must not be cached."""
+        from app.services import stream_service
+
+        result = {"status": "online", "all_qualities": {"best": "https://a"}}
+        with (
+            patch.object(stream_service, "cache") as mock_cache,
+            patch.object(stream_service, "playback_ttl", return_value=(0, 0)),
+        ):
+            stream_service._cache_resolution("https://www.twitch.tv/foo", result)
+
+        keys = [call[0][0] for call in mock_cache.set.call_args_list]
+        assert "resolve:https://www.twitch.tv/foo" not in keys
+        assert "status:https://www.twitch.tv/foo" in keys
+
+    def test_twitch_usher_token_bounds_resolution(self):
+        """Twitch variant URLs must be cached by their usher playlist's token."""
+        from app.services import stream_service
+        from app.utils import get_manifest_urls_from_streams
+
+        expires = int(time.time()) + 600
+        session = Streamlink()
+        # As parsed by HLSStream.parse_variant_playlist() from the usher URL
+        multivariant = M3U8(_twitch_usher(expires))
+        multivariant.is_master = True
+        variants = {
+            name: f"https://video-weaver.fra05.hls.ttvnw.net/v1/playlist/{name}.m3u8"
+            for name in ("720p", "best")
+        }
+        streams = {
+            name: TwitchHLSStream(session, url, multivariant=multivariant)
+            for name, url in variants.items()
+        }
+        result = {
+            "status": "online",
+            "all_qualities": variants,
+            "_manifest_urls": get_manifest_urls_from_streams(streams),
+        }
+        with patch.object(stream_service, "cache") as mock_cache:
+            stream_service._cache_resolution("https://www.twitch.tv/foo", result)
+
+        resolve_call = mock_cache.set.call_args_list[0]
+        assert resolve_call[0][0] == "resolve:https://www.twitch.tv/foo"
+        lifetime = 600 - stream_service.config.PLAYBACK_EXPIRY_MARGIN
+        assert lifetime - 10 <= resolve_call[1]["ttl"] <= lifetime
+        assert "_manifest_urls" not in resolve_call[0][1]
+
+
+class TestStatusHistory:
+    """Tests for per-channel transition history."""
+
+    def test_first_observation_starts_history(self):
+        """An unseen channel must start a history in its current state."""
+        history = record_status(None, "offline", NOW)
+        assert history == {
+            "state": "offline",
+            "since": NOW,
+            "first_seen": NOW,
+            "avg_interval": None,
+        }
+
+    def test_same_state_keeps_history(self):
+        """Re-confirming the state must not touch the history."""
+        history = record_status(None, "offline", NOW)
+        assert record_status(history, "offline", NOW + 60) is history
+
+    def test_transitions_average_intervals(self):
+        """Flips must feed a weighted average of time spent per state."""
+        history = record_status(None, "offline", NOW)
+        history = record_status(history, "online", NOW + 1000)
+        assert history["avg_interval"] == 1000
+        history = record_status(history, "offline", NOW + 3000)
+        assert history["avg_interval"] == 0.7 * 1000 + 0.3 * 2000
+        assert history["since"] == NOW + 3000
+
+
+class TestStatusTtl:
+    """Tests for choosing a status TTL from a channel's history."""
+
+    def test_stable_channel_gets_max_ttl(self, ttl_config):
+        """A channel that hasn't flipped in a day must get the maximum TTL."""
+        history = record_status(None, "online", NOW)
+        assert status_ttl(history, NOW + 86400) == 600
+
+    def test_frequently_flipping_channel_gets_short_ttl(self, ttl_config):
+        """A channel flipping every ten minutes must be checked often."""
+        history = {
+            "state": "online",
+            "since": NOW - 3600,
+            "first_seen": NOW - 86400,
+            "avg_interval": 600,
+        }
+        assert status_ttl(history, NOW) == 30
+
+    def test_recent_change_shortens_ttl(self, ttl_config):
+        """A state entered minutes ago must not get a long TTL."""
+        history = {
+            "state": "online",
+            "since": NOW - 1200,
+            "first_seen": NOW - 30 * 86400,
+            "avg_interval": 86400,
+        }
+        assert status_ttl(history, NOW) == 60
+
+    def test_new_channel_never_below_default_ttl(self, ttl_config):
+        """A channel seen only briefly must not get less than STATUS_TTL."""
+        history = record_status(None, "online", NOW)
+        for elapsed in (1, 120, 600, 2399):
+            history = record_status(history, "online", NOW + elapsed)
+            assert status_ttl(history, NOW + elapsed) == 120
+
+    def test_flipped_channel_may_go_below_default_ttl(self, ttl_config):
+        """Once a channel has flipped, its own history decides the TTL."""
+        history = record_status(None, "offline", NOW)
+        history = record_status(history, "online", NOW + 600)
+        assert status_ttl(history, NOW + 1200) == 30
+
+
+class TestStatusCaching:
+    """Tests for adaptive TTLs in stream_service._cache_status()."""
+
+    def test_unseen_channel_uses_default_ttl(self):
+        """Without history the status must be cached for STATUS_TTL."""
+        from app.cache import SimpleCache
+        from app.models import StreamStatus
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        status = StreamStatus(url="https://www.twitch.tv/foo", status="online")
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(backend, "set", wraps=backend.set) as cache_set,
+        ):
+            stream_service._cache_status("status:https://www.twitch.tv/foo", status)
+
+        cache_set.assert_any_call(
+            "status:https://www.twitch.tv/foo",
+            status,
+            ttl=stream_service.config.STATUS_TTL,
+            stale_ttl=stream_service.config.STATUS_STALE_TTL,
+        )
+        assert backend.get("history:https://www.twitch.tv/foo")["state"] == "online"
+
+    def test_known_channel_uses_adaptive_ttl(self):
+        """With history the status TTL must come from status_ttl()."""
+        from app.cache import SimpleCache
+        from app.models import StreamStatus
+        from app.services import stream_service
+
+        backend = SimpleCache()
+        backend.set(
+            "history:https://www.twitch.tv/foo",
+            record_status(None, "online", NOW),
+            ttl=60,
+        )
+        status = StreamStatus(url="https://www.twitch.tv/foo", status="online")
+        with (
+            patch.object(stream_service, "cache", backend),
+            patch.object(stream_service, "status_ttl", return_value=450),
+            patch.object(backend, "set", wraps=backend.set) as cache_set,
+        ):
+            stream_service._cache_status("status:https://www.twitch.tv/foo", status)
+
+        assert cache_set.call_args[1]["ttl"] == 450
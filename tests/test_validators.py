@@ -5,12 +5,15 @@ Covers:
 - validate_url(): valid URLs, missing protocol auto-fix, empty/blank input,
   unsupported domains, malicious/edge-case URLs
 - validate_batch_request(): valid batch, empty list, over-limit list,
-  mixed valid/invalid URLs, all-invalid URLs
+  custom limits, mixed valid/invalid URLs, all-invalid URLs
+- canonical_url(): host/case/tracking-parameter folding per platform, paths
+  left alone where they may be case-sensitive
 """
 
 import pytest
 from fastapi import HTTPException
 
+from app.utils import canonical_url
 from app.validators import validate_url, validate_batch_request
 
 
@@ -175,6 +178,13 @@ class TestValidateBatchRequest:
         result = validate_batch_request(urls)
         assert len(result) == 20
 
+    def test_custom_limit(self):
+        """Callers like the job API must be able to raise the URL limit."""
+        urls = [f"https://www.twitch.tv/chan{i}" for i in range(50)]
+        assert len(validate_batch_request(urls, max_urls=50)) == 50
+        with pytest.raises(HTTPException, match="Maximum 49 URLs"):
+            validate_batch_request(urls, max_urls=49)
+
     def test_invalid_urls_are_skipped_not_raised(self):
         """Invalid URLs in a batch must be skipped rather than raising an exception."""
         urls = [
@@ -219,3 +229,68 @@ class TestValidateBatchRequest:
         """Parametrised check that common valid batches are accepted."""
         result = validate_batch_request(urls)
         assert len(result) > 0
+
+
+# ===========================================================================
+# canonical_url
+# ===========================================================================
+
+
+class TestCanonicalUrl:
+    """Tests for folding equivalent URLs into one cache key."""
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "twitch.tv/Foo",
+            "https://www.twitch.tv/foo/",
+            "http://m.twitch.tv/foo?ref=x",
+            "https://TWITCH.tv/foo#chat",
+        ],
+    )
+    def test_twitch_channel_variants_share_one_form(self, url):
+        """Host, case, trailing slash and tracking variants must collapse."""
+        assert canonical_url(validate_url(url)) == "https://www.twitch.tv/foo"
+
+    @pytest.mark.parametrize(
+        "url", ["twitch.tv/Foo", "www.twitch.tv/foo/", "//m.twitch.tv/foo"]
+    )
+    def test_scheme_less_urls_get_https(self, url):
+        """Raw stored URLs without a scheme must still canonicalize to https."""
+        assert canonical_url(url) == "https://www.twitch.tv/foo"
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://youtu.be/dQw4w9WgXcQ?si=abc",
+            "https://m.youtube.com/watch?v=dQw4w9WgXcQ&t=42s&list=PLxxx",
+            "https://www.youtube.com/live/dQw4w9WgXcQ?feature=share",
+            "youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+        ],
+    )
+    def test_youtube_video_variants_share_one_form(self, url):
+        """Short links, mobile hosts and /live/ID must map to watch?v=ID."""
+        assert canonical_url(validate_url(url)) == (
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        )
+
+    def test_kick_channel_is_lowercased(self):
+        """Kick channel slugs must be folded to lower case."""
+        assert canonical_url("https://www.Kick.com/TestChannel/") == (
+            "https://kick.com/testchannel"
+        )
+
+    def test_case_sensitive_paths_are_kept(self):
+        """Clip slugs and other platforms' paths must keep their case."""
+        assert canonical_url("https://clips.twitch.tv/SomeClip") == (
+            "https://clips.twitch.tv/SomeClip"
+        )
+        assert canonical_url("https://www.bilibili.com/video/BV1xx411c7mD") == (
+            "https://www.bilibili.com/video/BV1xx411c7mD"
+        )
+
+    def test_generic_urls_drop_tracking_and_sort_query(self):
+        """utm_* parameters must be dropped and the remaining query sorted."""
+        assert canonical_url("http://vimeo.com/123?utm_source=x&b=2&a=1#top") == (
+            "https://vimeo.com/123?a=1&b=2"
+        )